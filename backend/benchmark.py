@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+接口性能基准测试
+在进程内用 Flask 测试客户端对热点接口计时（不需要启动服务），数据由测试数据生成器
+按预设规模生成（见 utils/dataset.py），记录每个接口的 p50/p95 延迟、SQL 语句数和峰值内存。
+
+用法：
+    python backend/benchmark.py                         # 与基准文件比较，退步超过容差时退出码为 1
+    python backend/benchmark.py --update-baseline       # 运行并写入基准文件
+    python backend/benchmark.py --sizes small,medium,large --iterations 30
+    python backend/benchmark.py --login-scaling 100,1000,10000   # 登录耗时随用户数的变化
+
+基准文件默认为 backend/benchmark_baseline.json，首次运行时自动创建。延迟与机器相关，
+应在同一台机器上比较；SQL 语句数与机器无关。
+生成的数据库缓存在 BENCHMARK_DATA_DIR（默认系统临时目录），每个规模只生成一次，
+每次运行前复制一份，批量写入接口不会影响下次运行。
+响应缓存默认关闭（CACHE_BACKEND=none），测量的是实际查询和序列化开销。
+
+--login-scaling 在只有用户数据的数据库上分别按用户名、中文姓名和错误密码登录，检查登录的
+SQL 语句数和延迟不随用户表增长（语句数不同或延迟超过容差时退出码为 1），不读写基准文件。
+"""
+
+import argparse
+import gc
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+# 基准测试不需要请求日志和慢查询日志，响应缓存默认关闭（需在导入应用之前设置）
+os.environ.setdefault('REQUEST_LOG', 'off')
+os.environ.setdefault('CACHE_BACKEND', 'none')
+logging.getLogger('backend.timing').addHandler(logging.NullHandler())
+logging.getLogger('backend.timing').propagate = False
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from backend.models.database import db, Project, ProjectModule, User
+from backend.utils.dataset import DATASET_PRESETS, DEFAULT_PASSWORD, DEFAULT_SEED, generate_dataset
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DATA_DIR = os.environ.get('BENCHMARK_DATA_DIR') or os.path.join(tempfile.gettempdir(), 'project_management_benchmark')
+
+ADMIN_USERNAME = 'admin'
+ADMIN_PASSWORD = 'td123456'
+
+# 批量更新接口每次提交的模块数
+BATCH_UPDATE_SIZE = 50
+
+# 延迟比较的绝对容差（毫秒），避免亚毫秒级接口的抖动被判为退步
+LATENCY_SLACK_MS = 2.0
+
+
+def _endpoints(context):
+    """
+    被测接口：[(名称, 请求函数)]，请求函数接收测试客户端和迭代序号，返回响应
+
+    Args:
+        context: 当前数据集的项目ID、模块ID等
+    """
+    def batch_progress(client, iteration):
+        progress = (iteration * 7) % 101
+        updates = [{'module_id': module_id, 'progress': progress} for module_id in context['module_ids']]
+        return client.put('/api/modules/progress:batch', json={'updates': updates})
+
+    return [
+        ('login', lambda client, _: client.post(
+            '/api/auth/login', json={'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD}
+        )),
+        ('project_list', lambda client, _: client.get('/api/projects')),
+        ('project_list_page', lambda client, _: client.get('/api/projects?limit=50')),
+        ('department_overview', lambda client, _: client.get('/api/projects/overview')),
+        ('modules_overview', lambda client, _: client.get('/api/modules/overview')),
+        ('project_detail', lambda client, _: client.get(f"/api/projects/{context['project_id']}")),
+        ('user_list', lambda client, _: client.get('/api/users')),
+        ('batch_progress_update', batch_progress),
+    ]
+
+
+def _percentile(values, percent):
+    """最近秩百分位数"""
+    ordered = sorted(values)
+    index = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def _create_app(database_path):
+    """为指定数据库文件创建应用（配置在创建时从环境变量读取）"""
+    os.environ['DATABASE_PATH'] = database_path
+    from backend.app import create_app
+    return create_app()
+
+
+def _close_app(app):
+    """合并 WAL 并关闭连接，数据库文件可以直接复制"""
+    with app.app_context():
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+        db.engine.dispose()
+
+
+def ensure_dataset(preset, seed, anchor_date, scale=None):
+    """
+    获取指定规模的数据库文件，不存在时生成
+
+    Args:
+        preset: 预设规模名称（也用作缓存文件名）
+        scale: 数据规模，默认为 DATASET_PRESETS[preset]
+
+    Returns:
+        str: 数据库文件路径
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f'{preset}-{seed}-{anchor_date.isoformat()}.db')
+    if os.path.exists(path):
+        return path
+
+    building = path + '.building'
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(building + suffix):
+            os.remove(building + suffix)
+
+    print(f"🧪 生成 {preset} 数据集...")
+    started = time.perf_counter()
+    app = _create_app(building)
+    with app.app_context():
+        generate_dataset(seed=seed, anchor_date=anchor_date, **(scale or DATASET_PRESETS[preset]))
+    _close_app(app)
+    os.replace(building, path)
+    print(f"✅ {preset} 数据集生成完成，耗时 {time.perf_counter() - started:.1f}s")
+    return path
+
+
+def _time_requests(client, query_count, name, request, iterations, warmup, expected_status=200):
+    """
+    对一个请求函数计时
+
+    Returns:
+        tuple: (耗时列表（毫秒）, 最大SQL语句数, 下一个迭代序号)
+    """
+    iteration = 0
+    for _ in range(warmup):
+        request(client, iteration)
+        iteration += 1
+
+    durations = []
+    queries = 0
+    # 计时期间暂停垃圾回收，减少抖动
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            query_count[0] = 0
+            started = time.perf_counter()
+            response = request(client, iteration)
+            durations.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, query_count[0])
+            iteration += 1
+            if response.status_code != expected_status:
+                raise RuntimeError(
+                    f'{name} 返回 {response.status_code}: {response.get_data(as_text=True)[:200]}'
+                )
+    finally:
+        gc.enable()
+    return durations, queries, iteration
+
+
+def run_size(preset, seed, anchor_date, iterations, warmup):
+    """
+    在一个规模的数据集上运行所有接口
+
+    Returns:
+        dict: {接口名称: {p50_ms, p95_ms, queries, peak_memory_kb}}
+    """
+    source = ensure_dataset(preset, seed, anchor_date)
+    work_dir = tempfile.mkdtemp(prefix='benchmark-')
+    database_path = os.path.join(work_dir, 'benchmark.db')
+    shutil.copyfile(source, database_path)
+
+    app = _create_app(database_path)
+    query_count = [0]
+
+    try:
+        with app.app_context():
+            @event.listens_for(db.engine, 'before_cursor_execute')
+            def _count_query(*args):
+                query_count[0] += 1
+
+            project_ids = [row[0] for row in db.session.query(Project.id).order_by(Project.id).all()]
+            context = {
+                'project_id': project_ids[len(project_ids) // 2],
+                'module_ids': [
+                    row[0] for row in db.session.query(ProjectModule.id)
+                    .order_by(ProjectModule.id).limit(BATCH_UPDATE_SIZE).all()
+                ]
+            }
+            db.session.remove()
+
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD})
+        if response.status_code != 200:
+            raise RuntimeError(f'管理员登录失败: {response.status_code}')
+
+        results = {}
+        for name, request in _endpoints(context):
+            durations, queries, iteration = _time_requests(client, query_count, name, request, iterations, warmup)
+
+            # 峰值内存单独测一次（tracemalloc 会明显拖慢执行）
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            request(client, iteration)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results[name] = {
+                'p50_ms': round(_percentile(durations, 50), 2),
+                'p95_ms': round(_percentile(durations, 95), 2),
+                'queries': queries,
+                'peak_memory_kb': round(peak / 1024)
+            }
+            print(f"   {name:<24} p50 {results[name]['p50_ms']:>9.2f}ms  p95 {results[name]['p95_ms']:>9.2f}ms  "
+                  f"{queries:>4} 条SQL  峰值内存 {results[name]['peak_memory_kb']:>8}KB")
+        return results
+
+    finally:
+        _close_app(app)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_login_scaling(user_counts, seed, anchor_date, iterations, warmup):
+    """
+    在不同用户数的数据库上测量登录接口
+
+    Returns:
+        dict: {用户数: {登录方式: {p50_ms, p95_ms, queries}}}
+    """
+    results = {}
+    for user_count in user_counts:
+        print(f"\n⏱️  login-{user_count}: {user_count} 个用户")
+        source = ensure_dataset(f'login-{user_count}', seed, anchor_date, scale=dict(
+            users=user_count, projects=0, modules=0, work_records=0
+        ))
+        work_dir = tempfile.mkdtemp(prefix='benchmark-')
+        database_path = os.path.join(work_dir, 'benchmark.db')
+        shutil.copyfile(source, database_path)
+
+        app = _create_app(database_path)
+        query_count = [0]
+        try:
+            with app.app_context():
+                @event.listens_for(db.engine, 'before_cursor_execute')
+                def _count_query(*args):
+                    query_count[0] += 1
+
+                # 取排在最后的生成用户，按用户名和中文姓名登录
+                user = User.query.filter(User.username.like('user%')).order_by(User.id.desc()).first()
+                username, name = user.username, user.name
+                db.session.remove()
+
+            def login(account, password):
+                return lambda client, _: client.post(
+                    '/api/auth/login', json={'username': account, 'password': password}
+                )
+
+            client = app.test_client()
+            results[user_count] = {}
+            for method, request, status in (
+                ('username', login(username, DEFAULT_PASSWORD), 200),
+                ('name', login(name, DEFAULT_PASSWORD), 200),
+                ('wrong_password', login(username, DEFAULT_PASSWORD + 'x'), 401),
+            ):
+                durations, queries, _ = _time_requests(
+                    client, query_count, f'login/{method}', request, iterations, warmup, expected_status=status
+                )
+                results[user_count][method] = {
+                    'p50_ms': round(_percentile(durations, 50), 2),
+                    'p95_ms': round(_percentile(durations, 95), 2),
+                    'queries': queries
+                }
+                print(f"   login/{method:<20} p50 {results[user_count][method]['p50_ms']:>9.2f}ms  "
+                      f"p95 {results[user_count][method]['p95_ms']:>9.2f}ms  {queries:>4} 条SQL")
+        finally:
+            _close_app(app)
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def check_login_scaling(results, latency_tolerance):
+    """
+    检查登录开销是否随用户数增长：以用户数最少的一组为基准，SQL 语句数必须相同，p50 不超过容差
+
+    Returns:
+        list: 问题说明，为空表示登录开销与用户数无关
+    """
+    counts = sorted(results)
+    reference = results[counts[0]]
+    problems = []
+    for user_count in counts[1:]:
+        for method, current in results[user_count].items():
+            previous = reference[method]
+            if current['queries'] != previous['queries']:
+                problems.append(f"login/{method} queries: {counts[0]} 个用户 {previous['queries']} → "
+                                f"{user_count} 个用户 {current['queries']}")
+            limit = previous['p50_ms'] * (1 + latency_tolerance) + LATENCY_SLACK_MS
+            if current['p50_ms'] > limit:
+                problems.append(f"login/{method} p50_ms: {counts[0]} 个用户 {previous['p50_ms']} → "
+                                f"{user_count} 个用户 {current['p50_ms']}")
+    return problems
+
+
+def compare(baseline, results, latency_tolerance, query_tolerance, memory_tolerance):
+    """
+    与基准比较
+
+    Returns:
+        list: 退步说明，为空表示没有退步
+    """
+    regressions = []
+    for preset, endpoints in results.items():
+        for name, current in endpoints.items():
+            previous = baseline.get('results', {}).get(preset, {}).get(name)
+            if not previous:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                limit = previous[metric] * (1 + latency_tolerance) + LATENCY_SLACK_MS
+                if current[metric] > limit:
+                    regressions.append(f'{preset}/{name} {metric}: {previous[metric]} → {current[metric]}')
+            if current['queries'] > previous['queries'] + query_tolerance:
+                regressions.append(f"{preset}/{name} queries: {previous['queries']} → {current['queries']}")
+            if current['peak_memory_kb'] > previous['peak_memory_kb'] * (1 + memory_tolerance):
+                regressions.append(
+                    f"{preset}/{name} peak_memory_kb: {previous['peak_memory_kb']} → {current['peak_memory_kb']}"
+                )
+    return regressions
+
+
+def parse_args():
+    today = date.today()
+    parser = argparse.ArgumentParser(description='接口性能基准测试')
+    parser.add_argument('--sizes', default='small,medium', help='数据集规模，逗号分隔，默认 small,medium')
+    parser.add_argument('--login-scaling', metavar='COUNTS',
+                        help='只测登录接口随用户数的变化，用户数逗号分隔，如 100,1000,10000')
+    parser.add_argument('--iterations', type=int, default=20, help='每个接口的计时次数，默认 20')
+    parser.add_argument('--warmup', type=int, default=2, help='每个接口的预热次数，默认 2')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='数据集随机种子')
+    parser.add_argument('--anchor-date', type=date.fromisoformat, default=today - timedelta(days=today.weekday()),
+                        help='数据集基准日期 YYYY-MM-DD，默认本周一')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基准文件路径')
+    parser.add_argument('--update-baseline', action='store_true', help='用本次结果更新基准文件')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='延迟容差（比例），默认 0.3')
+    parser.add_argument('--query-tolerance', type=int, default=0, help='SQL 语句数容差（条），默认 0')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25, help='峰值内存容差（比例），默认 0.25')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    if args.login_scaling:
+        user_counts = sorted({int(count) for count in args.login_scaling.split(',') if count.strip()})
+        if len(user_counts) < 2:
+            print("❌ --login-scaling 至少需要两个不同的用户数")
+            sys.exit(2)
+        problems = check_login_scaling(
+            run_login_scaling(user_counts, args.seed, args.anchor_date, args.iterations, args.warmup),
+            args.tolerance
+        )
+        if problems:
+            print(f"\n❌ 登录开销随用户数增长（延迟容差 {args.tolerance:.0%}）：")
+            for item in problems:
+                print(f"   - {item}")
+            sys.exit(1)
+        print("\n✅ 登录的SQL语句数和延迟不随用户数增长")
+        sys.exit(0)
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in DATASET_PRESETS]
+    if unknown:
+        print(f"❌ 未知的数据集规模: {', '.join(unknown)}（可选 {', '.join(DATASET_PRESETS)}）")
+        sys.exit(2)
+
+    results = {}
+    for size in sizes:
+        print(f"\n⏱️  {size}: {DATASET_PRESETS[size]}")
+        results[size] = run_size(size, args.seed, args.anchor_date, args.iterations, args.warmup)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    exit_code = 0
+    if baseline and not args.update_baseline:
+        regressions = compare(baseline, results, args.tolerance, args.query_tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"\n❌ 发现 {len(regressions)} 项性能退步（延迟容差 {args.tolerance:.0%}，"
+                  f"SQL容差 {args.query_tolerance} 条，内存容差 {args.memory_tolerance:.0%}）：")
+            for item in regressions:
+                print(f"   - {item}")
+            exit_code = 1
+        else:
+            print("\n✅ 没有超过容差的性能退步")
+
+    if baseline is None or args.update_baseline:
+        merged = (baseline or {}).get('results', {})
+        merged.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'environment': {
+                    'python': platform.python_version(),
+                    'sqlite': sqlite3.sqlite_version,
+                    'machine': platform.machine(),
+                    'iterations': args.iterations,
+                    'seed': args.seed
+                },
+                'results': merged
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n📝 已写入基准文件: {args.baseline}")
+
+    sys.exit(exit_code)
@@ -9,6 +9,34 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-change-in-production'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # SQLite 连接参数（每个新连接建立时执行，可通过环境变量覆盖）
+    # WAL 模式下读不阻塞写、写不阻塞读；busy_timeout 让并发写入排队等待而不是立即报 database is locked
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # 毫秒
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -20000)),  # 负数表示KiB，约20MB
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),  # 256MB
+        'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+        'foreign_keys': os.environ.get('SQLITE_FOREIGN_KEYS', 'ON'),
+    }
+    
+    @staticmethod
+    def get_engine_options():
+        """获取数据库引擎参数：连接池大小与多线程服务匹配"""
+        busy_timeout_ms = Config.SQLITE_PRAGMAS['busy_timeout']
+        return {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'connect_args': {
+                # pysqlite 自身的锁等待时间（秒），与 busy_timeout 保持一致
+                'timeout': busy_timeout_ms / 1000,
+                # 连接由连接池在线程间复用
+                'check_same_thread': False,
+            },
+        }
+    
     # 数据库配置
     @staticmethod
     def get_database_uri():
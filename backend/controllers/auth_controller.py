@@ -1,12 +1,16 @@
 """
 认证控制器 - 处理用户登录、登出等认证相关操作
 """
+import logging
+
 from flask import Blueprint, request, jsonify, session
 from ..models.database import db, User
 from ..services.auth_service import AuthService
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+logger = logging.getLogger(__name__)
+
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """用户登录"""
@@ -23,18 +27,10 @@ def login():
         username = data['username']
         password = data['password']
         
-        # 调试日志
-        print(f"[DEBUG] 登录尝试 - 用户名: {username}")
-        
-        # 检查数据库中的用户
-        all_users = User.query.all()
-        print(f"[DEBUG] 数据库中共有 {len(all_users)} 个用户")
-        for u in all_users:
-            print(f"[DEBUG]   - {u.username} (姓名: {u.name})")
-        
-        # 验证用户凭证
+        # 验证用户凭证（调试日志不输出密码，开启 DEBUG 级别后可见）
+        logger.debug('登录尝试 - 用户名: %s', username)
         user = AuthService.authenticate_user(username, password)
-        print(f"[DEBUG] 认证结果: {'成功' if user else '失败'}")
+        logger.debug('认证结果: %s - 用户名: %s', '成功' if user else '失败', username)
         
         if not user:
             return jsonify({
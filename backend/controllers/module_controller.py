@@ -6,11 +6,15 @@
 from flask import Blueprint, request, jsonify
 from ..services.module_service import ModuleService
 from ..utils.decorators import login_required, permission_required
+from ..utils.pagination import parse_list_args
 from ..models.database import UserRole
 
 # 创建模块蓝图
 module_bp = Blueprint('module', __name__, url_prefix='/api/modules')
 
+# 批量更新模块进度的单次上限
+MAX_BATCH_PROGRESS_UPDATES = 500
+
 @module_bp.route('/projects/<int:project_id>', methods=['POST'])
 def create_module(project_id):
     """创建项目模块"""
@@ -168,6 +172,91 @@ def update_module_progress(module_id):
             'data': None
         }), 500
 
+@module_bp.route('/progress:batch', methods=['PUT'])
+@login_required
+def batch_update_module_progress():
+    """批量更新模块进度（每周集中更新时一次提交）"""
+    try:
+        current_user = request.current_user
+        from ..services.auth_service import AuthService
+        
+        data = request.get_json(silent=True) or {}
+        updates = data.get('updates')
+        if not isinstance(updates, list) or not updates:
+            return jsonify({
+                'success': False,
+                'message': 'updates 必须是非空列表',
+                'data': None
+            }), 400
+        
+        if len(updates) > MAX_BATCH_PROGRESS_UPDATES:
+            return jsonify({
+                'success': False,
+                'message': f'单次最多更新 {MAX_BATCH_PROGRESS_UPDATES} 个模块',
+                'data': None
+            }), 400
+        
+        # 验证每一项的模块ID和进度值
+        module_ids = set()
+        for item in updates:
+            module_id = item.get('module_id') if isinstance(item, dict) else None
+            progress = item.get('progress') if isinstance(item, dict) else None
+            if not isinstance(module_id, int) or isinstance(module_id, bool):
+                return jsonify({
+                    'success': False,
+                    'message': '模块ID必须是整数',
+                    'data': None
+                }), 400
+            if not isinstance(progress, int) or isinstance(progress, bool) or progress < 0 or progress > 100:
+                return jsonify({
+                    'success': False,
+                    'message': f'模块 {module_id} 的进度值必须是0-100之间的整数',
+                    'data': None
+                }), 400
+            if module_id in module_ids:
+                return jsonify({
+                    'success': False,
+                    'message': f'模块 {module_id} 重复出现',
+                    'data': None
+                }), 400
+            module_ids.add(module_id)
+        
+        # 先检查模块是否存在（一次查询），不存在的模块对所有角色返回相同的错误，
+        # 避免普通成员通过 403/400 的差异探测其他项目的模块ID
+        missing_ids = ModuleService.get_missing_module_ids([item['module_id'] for item in updates])
+        if missing_ids:
+            return jsonify({
+                'success': False,
+                'message': f'模块不存在: {", ".join(str(module_id) for module_id in missing_ids)}',
+                'data': None
+            }), 400
+        
+        # 权限检查（基于缓存的用户权限数据，不逐个查询数据库）
+        forbidden_ids = [
+            item['module_id'] for item in updates
+            if not AuthService.has_module_permission(current_user, item['module_id'], 'update_module')
+        ]
+        if forbidden_ids:
+            return jsonify({
+                'success': False,
+                'message': f'没有权限更新模块: {", ".join(str(module_id) for module_id in forbidden_ids)}',
+                'data': None
+            }), 403
+        
+        result = ModuleService.batch_update_module_progress(updates, current_user.id)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'批量更新模块进度时发生错误: {str(e)}',
+            'data': None
+        }), 500
+
 @module_bp.route('/<int:module_id>/assign', methods=['PUT'])
 def assign_module(module_id):
     """分配模块给用户"""
@@ -237,17 +326,28 @@ def get_user_modules(user_id):
 @module_bp.route('/overview', methods=['GET'])
 @login_required
 def get_modules_overview():
-    """获取所有项目的模块概览"""
+    """获取所有项目的模块概览（支持 limit/cursor 分页和 fields 字段裁剪）"""
     try:
+        try:
+            limit, cursor, fields = parse_list_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'data': []
+            }), 400
+        
         # 根据用户角色过滤数据
         current_user = request.current_user
         if current_user.role != UserRole.DEPARTMENT_MANAGER:
             # 非部门主管只能看到自己参与的项目的模块
             from ..services.auth_service import AuthService
             accessible_project_ids = AuthService.get_user_projects(current_user)
-            result = ModuleService.get_modules_overview_by_projects(accessible_project_ids)
+            result = ModuleService.get_modules_overview_by_projects(
+                accessible_project_ids, limit=limit, cursor=cursor, fields=fields
+            )
         else:
-            result = ModuleService.get_all_modules_overview()
+            result = ModuleService.get_all_modules_overview(limit=limit, cursor=cursor, fields=fields)
         
         return jsonify(result), 200
         
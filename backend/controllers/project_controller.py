@@ -7,6 +7,7 @@ from flask import Blueprint, request, jsonify
 from ..services.project_service import ProjectService
 from ..services.user_service import UserService
 from ..utils.decorators import login_required, permission_required
+from ..utils.pagination import parse_list_args
 from ..models.database import UserRole
 
 # 创建项目蓝图
@@ -44,8 +45,17 @@ def create_project():
 @project_bp.route('', methods=['GET'])
 @login_required
 def get_projects():
-    """获取项目列表"""
+    """获取项目列表（支持 limit/cursor 分页和 fields 字段裁剪）"""
     try:
+        try:
+            limit, cursor, fields = parse_list_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'data': []
+            }), 400
+        
         # 获取查询参数
         filters = {}
         
@@ -66,7 +76,7 @@ def get_projects():
             accessible_project_ids = AuthService.get_user_projects(current_user)
             filters['project_ids'] = accessible_project_ids
         
-        result = ProjectService.get_project_list(filters)
+        result = ProjectService.get_project_list(filters, limit=limit, cursor=cursor, fields=fields)
         
         return jsonify(result), 200
         
@@ -0,0 +1,68 @@
+"""
+报表控制器 - 处理报表导出相关的HTTP请求
+遵循DDD分层架构，作为表现层处理报表API请求
+"""
+
+from datetime import datetime
+from urllib.parse import quote
+from flask import Blueprint, Response, request, jsonify
+from ..services.report_service import ReportService
+from ..utils.decorators import login_required
+from ..models.database import UserRole
+
+# 创建报表蓝图
+report_bp = Blueprint('report', __name__, url_prefix='/api/reports')
+
+# 分块输出大小
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _stream_file(fileobj):
+    """分块读出临时文件，结束后关闭"""
+    try:
+        while True:
+            chunk = fileobj.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+@report_bp.route('/modules.xlsx', methods=['GET'])
+@login_required
+def export_modules_report():
+    """导出项目模块进度一览表（Excel）"""
+    try:
+        # 根据用户角色过滤数据
+        current_user = request.current_user
+        if current_user.role != UserRole.DEPARTMENT_MANAGER:
+            # 非部门主管只能导出自己参与的项目
+            from ..services.auth_service import AuthService
+            project_ids = AuthService.get_user_projects(current_user)
+        else:
+            project_ids = None
+        
+        output = ReportService.build_modules_report(project_ids)
+        output.seek(0, 2)
+        size = output.tell()
+        output.seek(0)
+        
+        timestamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+        filename = f'项目模块进度一览表_{timestamp}.xlsx'
+        
+        return Response(
+            _stream_file(output),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            headers={
+                'Content-Disposition': f"attachment; filename=\"modules_report_{timestamp}.xlsx\"; filename*=UTF-8''{quote(filename)}",
+                'Content-Length': str(size)
+            }
+        )
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'导出报表时发生错误: {str(e)}',
+            'data': None
+        }), 500
@@ -0,0 +1,87 @@
+"""
+搜索控制器 - 处理全文搜索相关的HTTP请求
+遵循DDD分层架构，作为表现层处理搜索API请求
+"""
+
+from flask import Blueprint, request, jsonify
+from ..services.search_service import SearchService
+from ..utils.decorators import login_required
+from ..models.database import UserRole
+
+# 创建搜索蓝图
+search_bp = Blueprint('search', __name__, url_prefix='/api/search')
+
+# 搜索文本最大长度
+MAX_QUERY_LENGTH = 100
+
+
+@search_bp.route('', methods=['GET'])
+@login_required
+def search():
+    """
+    全文搜索项目、模块和周工作记录
+
+    查询参数：
+        q      搜索文本，多个词用空格分隔
+        types  逗号分隔的类型过滤：project,module,work_record
+        limit  最大返回条数，默认20
+    """
+    try:
+        text = (request.args.get('q') or '').strip()
+        if not text:
+            return jsonify({
+                'success': False,
+                'message': '搜索内容不能为空',
+                'data': None
+            }), 400
+        if len(text) > MAX_QUERY_LENGTH:
+            return jsonify({
+                'success': False,
+                'message': f'搜索内容不能超过{MAX_QUERY_LENGTH}个字符',
+                'data': None
+            }), 400
+
+        entity_types = None
+        if request.args.get('types'):
+            entity_types = [item.strip() for item in request.args.get('types').split(',') if item.strip()]
+            invalid_types = [item for item in entity_types if item not in SearchService.ENTITY_TYPES]
+            if invalid_types:
+                return jsonify({
+                    'success': False,
+                    'message': f'无效的搜索类型: {", ".join(invalid_types)}',
+                    'data': None
+                }), 400
+
+        try:
+            limit = int(request.args.get('limit', 20))
+        except ValueError:
+            limit = 0
+        if limit <= 0:
+            return jsonify({
+                'success': False,
+                'message': 'limit 必须是正整数',
+                'data': None
+            }), 400
+
+        # 根据用户角色过滤数据
+        current_user = request.current_user
+        if current_user.role != UserRole.DEPARTMENT_MANAGER:
+            # 非部门主管只能搜索自己参与的项目
+            from ..services.auth_service import AuthService
+            project_ids = AuthService.get_user_projects(current_user)
+        else:
+            project_ids = None
+
+        result = SearchService.search(text, project_ids, entity_types, limit)
+
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 500
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'搜索时发生错误: {str(e)}',
+            'data': None
+        }), 500
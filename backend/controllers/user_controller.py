@@ -6,6 +6,7 @@
 from flask import Blueprint, request, jsonify
 from ..services.user_service import UserService
 from ..utils.decorators import login_required, permission_required
+from ..utils.pagination import parse_list_args
 
 # 创建用户蓝图
 user_bp = Blueprint('user', __name__, url_prefix='/api/users')
@@ -39,11 +40,47 @@ def create_user():
             'data': None
         }), 500
 
+@user_bp.route('/import', methods=['POST'])
+@permission_required('manage_users')
+def import_users():
+    """批量导入用户（上传 CSV 或 Excel 文件，表头：姓名、邮箱、职位、角色）"""
+    try:
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            return jsonify({
+                'success': False,
+                'message': '请上传CSV或Excel文件',
+                'data': None
+            }), 400
+        
+        result = UserService.import_users(upload.filename, upload.stream)
+        
+        if result['success']:
+            return jsonify(result), 201
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'批量导入用户时发生错误: {str(e)}',
+            'data': None
+        }), 500
+
 @user_bp.route('', methods=['GET'])
 @permission_required('view_users')
 def get_users():
-    """获取用户列表"""
+    """获取用户列表（支持 limit/cursor 分页和 fields 字段裁剪）"""
     try:
+        try:
+            limit, cursor, fields = parse_list_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'data': []
+            }), 400
+        
         # 获取查询参数
         filters = {}
         
@@ -53,7 +90,12 @@ def get_users():
         if request.args.get('search'):
             filters['search'] = request.args.get('search')
         
-        result = UserService.get_user_list(filters)
+        # include_stats=false 时跳过参与/负责项目统计（用于下拉选择）
+        include_stats = request.args.get('include_stats', 'true').lower() != 'false'
+        
+        result = UserService.get_user_list(
+            filters, include_stats=include_stats, limit=limit, cursor=cursor, fields=fields
+        )
         return jsonify(result), 200
         
     except Exception as e:
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+测试数据生成命令
+按预设规模或自定义数量生成确定性的模拟数据（见 utils/dataset.py），用于压力测试和性能回归
+
+用法：
+    python backend/generate_dataset.py --preset large --reset
+    python backend/generate_dataset.py --users 100 --projects 2000 --modules 20000 --work-records 200000
+    DATABASE_PATH=/tmp/large.db python backend/generate_dataset.py --preset large
+
+相同的规模、--seed 和 --anchor-date 生成完全相同的数据库。
+"""
+
+import argparse
+import sys
+import os
+import time
+from datetime import date
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.dataset import DATASET_PRESETS, DEFAULT_SEED, DEFAULT_PASSWORD, generate_dataset
+from backend.app import create_app
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='生成模拟数据')
+    parser.add_argument('--preset', choices=sorted(DATASET_PRESETS), default='small', help='预设规模，默认 small')
+    parser.add_argument('--users', type=int, help='普通成员数量')
+    parser.add_argument('--projects', type=int, help='项目数量')
+    parser.add_argument('--modules', type=int, help='模块总数')
+    parser.add_argument('--work-records', type=int, help='周工作记录总数')
+    parser.add_argument('--module-progress-records', type=int, help='模块进度历史记录总数')
+    parser.add_argument('--progress-records', type=int, help='项目进度历史记录总数')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'随机种子，默认 {DEFAULT_SEED}')
+    parser.add_argument('--anchor-date', type=date.fromisoformat, help='基准日期 YYYY-MM-DD，默认本周一')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help=f'生成用户的密码，默认 {DEFAULT_PASSWORD}')
+    parser.add_argument('--reset', action='store_true', help='先删除现有业务数据（保留部门主管账号）')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    scale = dict(DATASET_PRESETS[args.preset])
+    for name in scale:
+        value = getattr(args, name)
+        if value is not None:
+            scale[name] = value
+    
+    app = create_app()
+    
+    with app.app_context():
+        print(f"🧪 生成模拟数据（{args.preset}，seed={args.seed}）: "
+              + ', '.join(f'{name}={value}' for name, value in scale.items()))
+        started = time.perf_counter()
+        try:
+            counts = generate_dataset(
+                seed=args.seed, anchor_date=args.anchor_date, password=args.password, reset=args.reset, **scale
+            )
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            sys.exit(1)
+        
+        for table, count in counts.items():
+            print(f"   - {table}: {count}")
+        print(f"✅ 生成完成，耗时 {time.perf_counter() - started:.1f}s")
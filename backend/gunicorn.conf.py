@@ -0,0 +1,57 @@
+"""
+gunicorn 配置 - 多进程 + 多线程服务
+
+环境变量：
+    PORT                  监听端口，默认 5001
+    WEB_WORKERS           worker 进程数，默认 min(CPU核数 * 2 + 1, 4)
+    WEB_THREADS           每个 worker 的线程数，默认 4
+    WEB_TIMEOUT           请求超时（秒），默认 120
+    WEB_MAX_REQUESTS      worker 处理多少请求后平滑重启，默认 1000（0 表示不重启）
+    WEB_GRACEFUL_TIMEOUT  重启/停止时等待处理中请求的时间（秒），默认 30
+
+SQLite 同一时刻只允许一个写入者：多个 worker 并发写入依赖 WAL 和 busy_timeout
+排队等待，读请求不会被写入阻塞。
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5001)}"
+
+workers = int(os.environ.get('WEB_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# 定期平滑重启 worker，带随机抖动避免所有 worker 同时重启
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 1000))
+max_requests_jitter = max(max_requests // 10, 0)
+
+# 在主进程中创建应用（建表、初始化只执行一次），worker fork 后共享代码
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+
+# 多个 worker 需要共享响应缓存和数据表版本号，否则写入后其他 worker 会返回过期数据和错误的 304
+if workers > 1:
+    cache_backend = os.environ.setdefault('CACHE_BACKEND', 'sqlite')
+    if cache_backend != 'sqlite':
+        raise RuntimeError(
+            f'CACHE_BACKEND={cache_backend} 的表版本号不在进程间共享，'
+            f'{workers} 个 worker 时请使用 CACHE_BACKEND=sqlite 或设置 WEB_WORKERS=1'
+        )
+
+
+def post_fork(server, worker):
+    """fork 后丢弃从主进程继承的数据库连接，每个 worker 使用自己的连接池，并重新生成 ETag 进程标识"""
+    from backend.wsgi import app
+    from backend.models.database import db
+    from backend.utils.etag import reset_process_token
+
+    reset_process_token()
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+数据库迁移命令
+应用启动时会自动执行待执行的迁移（见 models/migrations.py），
+本脚本用于部署前手动执行迁移并查看迁移状态
+
+用法：
+    python backend/migrate.py                          # 执行待执行的迁移并查看状态
+    python backend/migrate.py --create-missing-indexes # 另外补建当前模型声明但数据库中缺少的索引
+"""
+
+import argparse
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.models.database import db
+from backend.models.migrations import MIGRATIONS, create_missing_indexes, get_migration_status
+from backend.app import create_app
+
+def show_status():
+    """打印迁移状态"""
+    applied, pending = get_migration_status(db.engine)
+    for version, name, _ in MIGRATIONS:
+        mark = '✅' if version in applied else '⏳'
+        print(f"{mark} v{version}: {name}")
+    
+    if pending:
+        print(f"❌ 还有 {len(pending)} 个迁移未执行")
+        return False
+    print("✅ 数据库结构已是最新")
+    return True
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='执行数据库迁移并查看迁移状态')
+    parser.add_argument('--create-missing-indexes', action='store_true',
+                        help='补建当前模型中声明但数据库中缺少的索引')
+    args = parser.parse_args()
+    
+    # 创建应用时执行待执行的迁移，失败时抛出异常
+    app = create_app()
+    
+    with app.app_context():
+        if args.create_missing_indexes:
+            with db.engine.begin() as connection:
+                created = create_missing_indexes(connection)
+            print(f"🔧 补建索引: {', '.join(created)}" if created else "✅ 没有缺少的索引")
+        
+        if not show_status():
+            sys.exit(1)
@@ -9,6 +9,13 @@ from enum import Enum
 
 db = SQLAlchemy()
 
+# 时间列的排序键格式：统一为毫秒精度文本
+SORT_KEY_DATETIME_FORMAT = "'%Y-%m-%d %H:%M:%f'"
+
+def datetime_sort_key(column):
+    """时间列的排序键表达式，与表达式索引保持一致才能走索引"""
+    return db.func.strftime(db.literal_column(SORT_KEY_DATETIME_FORMAT), column)
+
 class ProjectStatus(Enum):
     """项目状态枚举 - 业务流程状态"""
     # 横向项目状态
@@ -51,7 +58,7 @@ class User(db.Model):
     __tablename__ = 'users'
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    name = db.Column(db.String(50), nullable=False)
+    name = db.Column(db.String(50), nullable=False, index=True)
     username = db.Column(db.String(50), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=True)
@@ -64,6 +71,9 @@ class User(db.Model):
     project_memberships = db.relationship('ProjectMember', back_populates='user', cascade='all, delete-orphan')
     progress_records = db.relationship('ProgressRecord', back_populates='updated_by', cascade='all, delete-orphan')
     
+    # 列表游标分页按 (更新时间排序键, id) 倒序
+    __table_args__ = (db.Index('ix_users_updated_sort', datetime_sort_key(updated_at), id),)
+    
     def set_password(self, password):
         """设置密码（加密存储）"""
         from werkzeug.security import generate_password_hash
@@ -97,20 +107,26 @@ class Project(db.Model):
     start_date = db.Column(db.Date, nullable=True)
     end_date = db.Column(db.Date, nullable=True)
     actual_end_date = db.Column(db.Date, nullable=True)
-    status = db.Column(db.Enum(ProjectStatus), default=ProjectStatus.INITIAL_CONTACT)
+    status = db.Column(db.Enum(ProjectStatus), default=ProjectStatus.INITIAL_CONTACT, index=True)
     progress = db.Column(db.Integer, default=0)
+    module_count = db.Column(db.Integer, default=0)  # 模块数量（缓存，随模块写操作增量维护）
+    module_progress_sum = db.Column(db.Integer, default=0)  # 模块进度总和（缓存）
+    computed_progress = db.Column(db.Integer, nullable=True)  # 计算后的项目进度（缓存）
     project_source = db.Column(db.String(50), default='horizontal')  # 项目来源：horizontal/vertical/self_developed
     partner = db.Column(db.String(100), nullable=True)  # 合作方（仅横向项目）
     contract_amount = db.Column(db.Float, nullable=True)  # 合同金额（非必填）
     received_amount = db.Column(db.Float, nullable=True)  # 到账金额（非必填）
     created_at = db.Column(db.DateTime, default=datetime.now)
-    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
     
     # 关联关系
     members = db.relationship('ProjectMember', back_populates='project', cascade='all, delete-orphan')
     progress_records = db.relationship('ProgressRecord', back_populates='project', cascade='all, delete-orphan')
     modules = db.relationship('ProjectModule', back_populates='project', cascade='all, delete-orphan')
     
+    # 列表游标分页按 (更新时间排序键, id) 倒序
+    __table_args__ = (db.Index('ix_projects_updated_sort', datetime_sort_key(updated_at), id),)
+    
     def to_dict(self):
         """转换为字典格式"""
         return {
@@ -136,7 +152,7 @@ class ProjectMember(db.Model):
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     role = db.Column(db.Enum(ProjectMemberRole), default=ProjectMemberRole.MEMBER)
     joined_at = db.Column(db.DateTime, default=datetime.now)
     
@@ -144,7 +160,7 @@ class ProjectMember(db.Model):
     project = db.relationship('Project', back_populates='members')
     user = db.relationship('User', back_populates='project_memberships')
     
-    # 唯一约束：一个用户在一个项目中只能有一个角色
+    # 唯一约束：一个用户在一个项目中只能有一个角色（同时作为 project_id 的索引）
     __table_args__ = (db.UniqueConstraint('project_id', 'user_id', name='unique_project_user'),)
     
     def to_dict(self):
@@ -164,10 +180,10 @@ class ProjectModule(db.Model):
     __tablename__ = 'project_modules'
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
-    assigned_to_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    assigned_to_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     progress = db.Column(db.Integer, default=0)
     priority = db.Column(db.Integer, default=1)
     start_date = db.Column(db.Date, nullable=True)
@@ -205,10 +221,13 @@ class ModuleAssignment(db.Model):
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     module_id = db.Column(db.Integer, db.ForeignKey('project_modules.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     role = db.Column(db.String(50), default='member')
     assigned_at = db.Column(db.DateTime, default=datetime.now)
     
+    # 按模块查分配人员（同时作为 module_id 的索引）
+    __table_args__ = (db.Index('ix_module_assignments_module_user', 'module_id', 'user_id'),)
+    
     # 关联关系
     module = db.relationship('ProjectModule', backref='assignments')
     user = db.relationship('User', backref='module_assignments')
@@ -236,10 +255,13 @@ class ModuleWorkRecord(db.Model):
     achievements = db.Column(db.Text, nullable=True)
     issues = db.Column(db.Text, nullable=True)
     next_week_plan = db.Column(db.Text, nullable=True)
-    created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     
+    # 按模块取最近几周的工作记录
+    __table_args__ = (db.Index('ix_module_work_records_module_week', 'module_id', 'week_start'),)
+    
     # 关联关系
     module = db.relationship('ProjectModule', backref='work_records')
     created_by = db.relationship('User', backref='work_records')
@@ -270,13 +292,16 @@ class ModuleProgressRecord(db.Model):
     module_id = db.Column(db.Integer, db.ForeignKey('project_modules.id'), nullable=False)
     progress = db.Column(db.Integer, nullable=False)
     notes = db.Column(db.Text, nullable=True)
-    updated_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    updated_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.now)
     
     # 关联关系
     module = db.relationship('ProjectModule', back_populates='progress_records')
     updated_by = db.relationship('User', backref='module_progress_records')
     
+    # 按模块查进度历史（按时间倒序）
+    __table_args__ = (db.Index('ix_module_progress_records_module_updated', 'module_id', 'updated_at'),)
+    
     def to_dict(self):
         """转换为字典格式"""
         return {
@@ -298,13 +323,16 @@ class ProgressRecord(db.Model):
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
     progress = db.Column(db.Integer, nullable=False)
     notes = db.Column(db.Text, nullable=True)
-    updated_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    updated_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.now)
     
     # 关联关系
     project = db.relationship('Project', back_populates='progress_records')
     updated_by = db.relationship('User', back_populates='progress_records')
     
+    # 按项目查进度历史（按时间倒序）
+    __table_args__ = (db.Index('ix_progress_records_project_updated', 'project_id', 'updated_at'),)
+    
     def to_dict(self):
         """转换为字典格式"""
         return {
@@ -318,22 +346,52 @@ class ProgressRecord(db.Model):
             'project': self.project.to_dict() if self.project else None
         }
 
+def _register_sqlite_pragmas(engine, pragmas):
+    """为每个新建的SQLite连接设置PRAGMA"""
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+def _print_sqlite_pragmas(pragmas):
+    """打印实际生效的PRAGMA值"""
+    with db.engine.connect() as connection:
+        effective = {
+            name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+            for name in pragmas
+        }
+    print('🔧 SQLite PRAGMA: ' + ', '.join(f'{name}={value}' for name, value in effective.items()))
+
 def init_database(app):
     """初始化数据库"""
     db.init_app(app)
     
     with app.app_context():
-        # 创建所有表
+        # SQLite 连接参数（WAL、busy_timeout 等），需在首个连接建立前注册
+        pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+        if pragmas and db.engine.dialect.name == 'sqlite':
+            _register_sqlite_pragmas(db.engine, pragmas)
+            _print_sqlite_pragmas(pragmas)
+        
+        # 创建缺失的表
+        from sqlalchemy import inspect
+        is_new_database = not inspect(db.engine).has_table(User.__tablename__)
         db.create_all()
         
+        # 执行待执行的数据库迁移（已有表的字段、数据和索引变更），失败时中止启动
+        from .migrations import run_migrations, MIGRATIONS
+        applied = run_migrations(db.engine)
+        if not is_new_database:
+            for version, name in applied:
+                print(f"🗃️ 已执行数据库迁移 v{version}: {name}")
+        print(f"🗃️ 数据库结构版本: v{MIGRATIONS[-1][0]}")
+        
         # 创建默认管理员用户（如果不存在）
-        try:
-            admin_user = User.query.filter_by(role=UserRole.DEPARTMENT_MANAGER).first()
-        except:
-            # 如果查询失败，说明表结构可能有问题，重新创建表
-            db.drop_all()
-            db.create_all()
-            admin_user = None
+        admin_user = User.query.filter_by(role=UserRole.DEPARTMENT_MANAGER).first()
         
         if not admin_user:
             admin_user = User(
@@ -0,0 +1,390 @@
+"""
+数据库迁移 - 带版本号的有序迁移注册表
+
+每个迁移有唯一递增的版本号，执行后记录在 schema_migrations 表中。
+应用启动时（init_database）自动执行尚未执行的迁移：
+    - 无待执行迁移时只读一次版本表，不加锁
+    - 有待执行迁移时在 BEGIN IMMEDIATE 事务中依次执行，多个 worker 同时启动时串行执行，
+      任一迁移失败则整体回滚，应用启动失败
+
+迁移函数接收 SQLAlchemy Connection，必须可重复执行（先检查再修改），
+这样从未记录过版本号的旧数据库和 create_all 刚创建的新数据库都能从第一个迁移开始执行
+（新数据库上字段和数据迁移为空操作，触发器、全文索引等 create_all 不创建的对象照常创建）。
+新增迁移时在文件末尾追加，版本号加一，不要修改已发布的迁移。
+"""
+
+import time
+from datetime import datetime
+
+from .database import db
+
+MIGRATIONS_TABLE = 'schema_migrations'
+
+# [(版本号, 名称, 迁移函数)]，按版本号升序
+MIGRATIONS = []
+
+
+def migration(version, name):
+    """
+    注册迁移的装饰器
+
+    Args:
+        version (int): 版本号，必须大于已注册的所有版本号
+        name (str): 迁移名称
+    """
+    def decorator(func):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f'迁移版本号必须递增: {version}')
+        MIGRATIONS.append((version, name, func))
+        return func
+    return decorator
+
+
+def _columns(connection, table):
+    """获取数据表的字段名集合"""
+    return {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info({table})')}
+
+
+def _now():
+    """与 ORM 写入格式一致的当前时间文本"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def _add_column(connection, table, name, ddl):
+    """字段不存在时添加字段，返回是否添加"""
+    if name in _columns(connection, table):
+        return False
+    connection.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}')
+    return True
+
+
+@migration(1, '项目金额字段：amount 更名为 contract_amount，新增 received_amount，删除 priority')
+def _project_amount_fields(connection):
+    columns = _columns(connection, 'projects')
+    if 'amount' in columns and 'contract_amount' not in columns:
+        connection.exec_driver_sql('ALTER TABLE projects RENAME COLUMN amount TO contract_amount')
+    _add_column(connection, 'projects', 'contract_amount', 'REAL')
+    _add_column(connection, 'projects', 'received_amount', 'REAL')
+    if 'priority' in _columns(connection, 'projects'):
+        connection.exec_driver_sql('ALTER TABLE projects DROP COLUMN priority')
+
+
+@migration(2, '项目来源和合作方字段')
+def _project_source_fields(connection):
+    if _add_column(connection, 'projects', 'project_source', "VARCHAR(50) DEFAULT 'horizontal'"):
+        connection.exec_driver_sql(
+            "UPDATE projects SET project_source = 'horizontal' WHERE project_source IS NULL"
+        )
+    _add_column(connection, 'projects', 'partner', 'VARCHAR(100)')
+
+
+@migration(3, '纵向项目旧状态映射到纵向专用状态')
+def _vertical_project_status(connection):
+    # 枚举列按名称存储
+    connection.exec_driver_sql("""
+        UPDATE projects SET
+            status = CASE
+                WHEN status IN ('INITIAL_CONTACT', 'PROPOSAL_SUBMITTED') THEN 'VERTICAL_DECLARATION'
+                WHEN status IN ('QUOTATION_SUBMITTED', 'USER_CONFIRMATION') THEN 'VERTICAL_REVIEW'
+                WHEN status = 'NO_FOLLOW_UP' THEN 'VERTICAL_REJECTED'
+                ELSE 'VERTICAL_APPROVED'
+            END,
+            progress = 0
+        WHERE project_source = 'vertical' AND status NOT LIKE 'VERTICAL\\_%' ESCAPE '\\'
+    """)
+
+
+@migration(4, '模块负责人同时作为模块成员')
+def _module_assignees_as_members(connection):
+    connection.exec_driver_sql("""
+        INSERT INTO module_assignments (module_id, user_id, role, assigned_at)
+        SELECT m.id, m.assigned_to_id, 'member', ?
+        FROM project_modules m
+        JOIN users u ON u.id = m.assigned_to_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM module_assignments a
+            WHERE a.module_id = m.id AND a.user_id = m.assigned_to_id
+        )
+    """, (_now(),))
+
+
+# v5 迁移时的项目进度规则（迁移不依赖当前模型和服务层，规则变化时由新迁移重建缓存）
+# 按状态阶段给出固定进度的状态：纵向项目使用全部映射，横向项目只使用无模块映射的状态
+_V5_STAGE_PROGRESS = {
+    'initial_contact': 5, 'proposal_submitted': 15, 'quotation_submitted': 20, 'user_confirmation': 25,
+    'contract_signed': 35, 'project_implementation': None, 'project_acceptance': 100,
+    'warranty_period': None, 'post_warranty': 100, 'no_follow_up': 0,
+    'vertical_declaration': 25, 'vertical_review': 50, 'vertical_approved': 100, 'vertical_rejected': 0
+}
+# 按模块平均进度映射的状态：(范围下限, 范围大小, 无模块时的默认进度)
+_V5_MODULE_RANGES = {
+    'initial_contact': (0, 5, 5), 'proposal_submitted': (5, 10, 15), 'quotation_submitted': (15, 5, 20),
+    'user_confirmation': (20, 5, 25), 'contract_signed': (25, 10, 35),
+    'project_implementation': (35, 50, 60), 'project_acceptance': (85, 5, 88), 'warranty_period': (90, 10, 95)
+}
+
+
+def _v5_computed_progress(status, project_source, module_count, module_progress_sum):
+    """按 v5 时的规则计算项目缓存进度（status 为枚举名称）"""
+    status = (status or '').lower()
+    if project_source == 'vertical':
+        return _V5_STAGE_PROGRESS.get(status, 0)
+    if status in _V5_MODULE_RANGES:
+        low, span, default = _V5_MODULE_RANGES[status]
+        if module_count:
+            return round(low + (module_progress_sum / module_count) / 100 * span)
+        return default
+    if status in ('post_warranty', 'no_follow_up'):
+        return _V5_STAGE_PROGRESS[status]
+    return 0
+
+
+@migration(5, '项目进度缓存字段')
+def _project_progress_cache(connection):
+    _add_column(connection, 'projects', 'module_count', 'INTEGER DEFAULT 0')
+    _add_column(connection, 'projects', 'module_progress_sum', 'INTEGER DEFAULT 0')
+    _add_column(connection, 'projects', 'computed_progress', 'INTEGER')
+
+    connection.exec_driver_sql("""
+        UPDATE projects SET
+            module_count = (SELECT COUNT(*) FROM project_modules WHERE project_id = projects.id),
+            module_progress_sum = (
+                SELECT COALESCE(SUM(progress), 0) FROM project_modules WHERE project_id = projects.id
+            )
+    """)
+
+    # 只读取计算所需的字段，直接写回（不经 ORM，不修改 updated_at）
+    rows = connection.exec_driver_sql(
+        'SELECT id, status, project_source, module_count, module_progress_sum FROM projects'
+    ).fetchall()
+    values = [
+        (_v5_computed_progress(status, project_source, module_count or 0, module_progress_sum or 0), project_id)
+        for project_id, status, project_source, module_count, module_progress_sum in rows
+    ]
+    if values:
+        connection.exec_driver_sql('UPDATE projects SET computed_progress = ? WHERE id = ?', values)
+
+
+# v6 创建的索引（按当时的模型写出，迁移不依赖当前模型）：[(表名, 索引名, 索引定义)]
+_V6_INDEXES = [
+    ('projects', 'ix_projects_status', 'projects (status)'),
+    ('projects', 'ix_projects_updated_at', 'projects (updated_at)'),
+    ('projects', 'ix_projects_updated_sort', "projects (strftime('%Y-%m-%d %H:%M:%f', updated_at), id)"),
+    ('users', 'ix_users_name', 'users (name)'),
+    ('users', 'ix_users_updated_sort', "users (strftime('%Y-%m-%d %H:%M:%f', updated_at), id)"),
+    ('progress_records', 'ix_progress_records_project_updated', 'progress_records (project_id, updated_at)'),
+    ('progress_records', 'ix_progress_records_updated_by_id', 'progress_records (updated_by_id)'),
+    ('project_members', 'ix_project_members_user_id', 'project_members (user_id)'),
+    ('project_modules', 'ix_project_modules_assigned_to_id', 'project_modules (assigned_to_id)'),
+    ('project_modules', 'ix_project_modules_project_id', 'project_modules (project_id)'),
+    ('module_assignments', 'ix_module_assignments_module_user', 'module_assignments (module_id, user_id)'),
+    ('module_assignments', 'ix_module_assignments_user_id', 'module_assignments (user_id)'),
+    ('module_progress_records', 'ix_module_progress_records_module_updated',
+     'module_progress_records (module_id, updated_at)'),
+    ('module_progress_records', 'ix_module_progress_records_updated_by_id', 'module_progress_records (updated_by_id)'),
+    ('module_work_records', 'ix_module_work_records_created_by_id', 'module_work_records (created_by_id)'),
+    ('module_work_records', 'ix_module_work_records_module_week', 'module_work_records (module_id, week_start)'),
+]
+
+
+@migration(6, '外键和常用过滤字段索引')
+def _model_indexes(connection):
+    rows = connection.exec_driver_sql(
+        "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')"
+    ).fetchall()
+    existing_tables = {name for type_, name in rows if type_ == 'table'}
+    existing_indexes = {name for type_, name in rows if type_ == 'index'}
+
+    created = False
+    for table, name, definition in _V6_INDEXES:
+        if table in existing_tables and name not in existing_indexes:
+            connection.exec_driver_sql(f'CREATE INDEX {name} ON {definition}')
+            created = True
+
+    if created:
+        # 更新统计信息，让查询规划器使用新索引
+        connection.exec_driver_sql('ANALYZE')
+
+
+@migration(7, '全文搜索索引（FTS5 trigram）及同步触发器')
+def _search_index(connection):
+    connection.exec_driver_sql("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            entity_type UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, title, body,
+            tokenize = 'trigram'
+        )
+    """)
+    create_search_triggers(connection)
+    rebuild_search_index(connection)
+
+
+def _search_sources():
+    """
+    全文索引的数据来源：[(表名, 类型编号, 索引列取值SQL, 触发更新的字段)]
+
+    rowid = 实体ID * 4 + 类型编号（1 项目 / 2 模块 / 3 工作记录），触发器按 rowid 直接定位
+    """
+    project_values = "'project', NEW.id, NEW.id, NEW.name, COALESCE(NEW.description, '')"
+    module_values = "'module', NEW.id, NEW.project_id, NEW.name, COALESCE(NEW.description, '')"
+    work_values = (
+        "'work_record', NEW.id, (SELECT project_id FROM project_modules WHERE id = NEW.module_id), NULL, "
+        "COALESCE(NEW.work_content, '') || char(10) || COALESCE(NEW.achievements, '') || char(10) || "
+        "COALESCE(NEW.issues, '') || char(10) || COALESCE(NEW.next_week_plan, '')"
+    )
+    return [
+        ('projects', 1, project_values, 'name, description'),
+        ('project_modules', 2, module_values, 'name, description, project_id'),
+        ('module_work_records', 3, work_values, 'work_content, achievements, issues, next_week_plan, module_id'),
+    ]
+
+
+def create_search_triggers(connection):
+    """创建全文索引的同步触发器（已存在时跳过）"""
+    for table, type_code, values, columns in _search_sources():
+        insert_sql = (
+            'INSERT INTO search_index (rowid, entity_type, entity_id, project_id, title, body) '
+            f'VALUES (NEW.id * 4 + {type_code}, {values});'
+        )
+        delete_sql = f'DELETE FROM search_index WHERE rowid = OLD.id * 4 + {type_code};'
+        connection.exec_driver_sql(
+            f'CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} '
+            f'BEGIN {insert_sql} END'
+        )
+        connection.exec_driver_sql(
+            f'CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {columns} ON {table} '
+            f'BEGIN {delete_sql} {insert_sql} END'
+        )
+        connection.exec_driver_sql(
+            f'CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} '
+            f'BEGIN {delete_sql} END'
+        )
+
+
+def drop_search_triggers(connection):
+    """
+    删除全文索引的同步触发器（大批量写入前调用，写完后 rebuild_search_index 并 create_search_triggers）
+
+    Returns:
+        bool: 全文索引是否存在（不存在时无需重建）
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+    ).first()
+    for table, _, _, _ in _search_sources():
+        for action in ('insert', 'update', 'delete'):
+            connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {table}_search_{action}')
+    return exists is not None
+
+
+def rebuild_search_index(connection):
+    """用现有数据重新填充全文索引（一次 INSERT ... SELECT 比逐行触发器快得多）"""
+    connection.exec_driver_sql('DELETE FROM search_index')
+    for table, type_code, values, _ in _search_sources():
+        connection.exec_driver_sql(
+            'INSERT INTO search_index (rowid, entity_type, entity_id, project_id, title, body) '
+            f'SELECT NEW.id * 4 + {type_code}, {values} FROM {table} AS NEW'
+        )
+
+
+def create_missing_indexes(connection):
+    """
+    为已有数据表补建当前模型中声明的索引（create_all 不会给已存在的表加索引）
+
+    维护工具（backend/migrate.py --create-missing-indexes），迁移中不要调用：
+    迁移必须按发布时的结构执行，新增索引应写成新的迁移
+
+    Args:
+        connection: SQLAlchemy Connection
+
+    Returns:
+        list: 新建的索引名称
+    """
+    # 反射接口会跳过表达式索引，直接读取 sqlite_master
+    rows = connection.exec_driver_sql(
+        "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')"
+    ).fetchall()
+    existing_tables = {name for type_, name in rows if type_ == 'table'}
+    existing_indexes = {name for type_, name in rows if type_ == 'index'}
+
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(connection)
+                created.append(index.name)
+
+    if created:
+        # 更新统计信息，让查询规划器使用新索引
+        connection.exec_driver_sql('ANALYZE')
+    return created
+
+
+def _applied_versions(connection):
+    """读取已执行的迁移版本号，版本表不存在时返回空集合"""
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (MIGRATIONS_TABLE,)
+    ).first()
+    if not exists:
+        return set()
+    return {row[0] for row in connection.exec_driver_sql(f'SELECT version FROM {MIGRATIONS_TABLE}')}
+
+
+def get_migration_status(engine):
+    """
+    获取迁移状态
+
+    Args:
+        engine: SQLAlchemy Engine
+
+    Returns:
+        tuple: (已执行的版本号集合, 待执行的迁移列表)
+    """
+    with engine.connect() as connection:
+        applied = _applied_versions(connection)
+    pending = [item for item in MIGRATIONS if item[0] not in applied]
+    return applied, pending
+
+
+def run_migrations(engine):
+    """
+    执行所有待执行的迁移
+
+    Args:
+        engine: SQLAlchemy Engine
+
+    Returns:
+        list: 本次执行的 (版本号, 名称) 列表
+    """
+    _, pending = get_migration_status(engine)
+    if not pending:
+        return []
+
+    applied_now = []
+    with engine.connect() as connection:
+        # 取得写锁后重新读取版本号，其他进程可能已执行完毕
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+        try:
+            connection.exec_driver_sql(
+                f'CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ('
+                'version INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, '
+                'applied_at DATETIME NOT NULL, duration_ms INTEGER NOT NULL)'
+            )
+            applied = _applied_versions(connection)
+            for version, name, func in MIGRATIONS:
+                if version in applied:
+                    continue
+                started = time.perf_counter()
+                func(connection)
+                connection.exec_driver_sql(
+                    f'INSERT INTO {MIGRATIONS_TABLE} (version, name, applied_at, duration_ms) VALUES (?, ?, ?, ?)',
+                    (version, name, _now(), round((time.perf_counter() - started) * 1000))
+                )
+                applied_now.append((version, name))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    return applied_now
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+项目进度缓存修复脚本
+根据 project_modules 表从头重建所有项目的缓存进度（缓存字段由数据库迁移添加）
+可重复执行，用于数据导入或手工修改数据库后修复缓存
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.models.database import db
+from backend.services.project_service import ProjectService
+from backend.app import create_app
+
+def rebuild():
+    """重建项目进度缓存"""
+    try:
+        count = ProjectService.rebuild_progress_cache()
+        print(f"✅ 已重建 {count} 个项目的进度缓存")
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ 重建失败: {str(e)}")
+        raise
+
+if __name__ == '__main__':
+    app = create_app()
+    
+    with app.app_context():
+        rebuild()
@@ -1,13 +1,20 @@
 """
 认证服务 - 处理用户认证、权限检查等业务逻辑
 """
+import logging
 import re
+from sqlalchemy import and_, or_, case
 from sqlalchemy.exc import IntegrityError
 from pypinyin import lazy_pinyin
 
+logger = logging.getLogger(__name__)
+
 class AuthService:
     """认证服务类"""
     
+    # 新建用户和重置密码使用的初始密码
+    DEFAULT_PASSWORD = 'td123456'
+    
     @staticmethod
     def authenticate_user(username, password):
         """
@@ -22,30 +29,36 @@ class AuthService:
         """
         try:
             from ..models.database import User
-            # 首先尝试用户名匹配
-            user = User.query.filter_by(username=username).first()
-            if user and user.check_password(password):
-                return user
-            
-            # 如果用户名匹配失败，尝试中文姓名匹配
-            user = User.query.filter_by(name=username).first()
-            if user and user.check_password(password):
-                return user
+            # 一次查询同时匹配用户名和中文姓名（两列均有索引），用户名匹配的排在前面：
+            # 第一行是用户名匹配的用户（如有），其余为按ID排序的姓名匹配
+            candidates = User.query.filter(or_(User.username == username, User.name == username))\
+                .order_by(case((User.username == username, 0), else_=1), User.id)\
+                .limit(2).all()
             
+            # 依次尝试用户名匹配和第一个姓名匹配（同一用户只校验一次密码）
+            by_username = next((user for user in candidates if user.username == username), None)
+            by_name = next((user for user in candidates if user.name == username), None)
+            for user in dict.fromkeys(user for user in (by_username, by_name) if user is not None):
+                if user.check_password(password):
+                    return user
+
             return None
         except Exception:
             return None
     
+    # 批量分配用户名时，每条查询包含的用户名前缀数量（每个前缀一个范围条件）
+    USERNAME_PREFIX_BATCH = 200
+    
     @staticmethod
-    def generate_username(name):
+    def _base_username(name):
         """
-        生成用户名 - 使用pypinyin自动转换所有汉字
+        由姓名生成基础用户名（不含数字后缀）- 使用pypinyin自动转换所有汉字
         
         Args:
             name (str): 用户姓名
             
         Returns:
-            str: 生成的用户名
+            str: 基础用户名
         """
         try:
             # 使用pypinyin自动转换中文为拼音
@@ -61,29 +74,69 @@ class AuthService:
             elif len(base_username) > 40:  # 留10个字符给序号
                 base_username = base_username[:40]
             
-            # 检查用户名是否已存在，如果存在则添加数字后缀
-            username = base_username
-            counter = 1
-            
-            from ..models.database import User
-            while User.query.filter_by(username=username).first():
-                username = f"{base_username}{counter}"
-                counter += 1
-                # 防止无限循环
-                if counter > 9999:
-                    username = f"{base_username}{counter}"
-                    break
-            
-            return username
+            return base_username
             
         except Exception as e:
-            # 如果pypinyin转换失败，使用备用方案
-            print(f"Pypinyin转换失败: {e}")
-            # 使用姓名的哈希值作为用户名
+            # 如果pypinyin转换失败，使用姓名的哈希值作为用户名
+            logger.warning('Pypinyin转换失败: %s', e)
             import hashlib
             hash_value = hashlib.md5(name.encode('utf-8')).hexdigest()
             return f"user_{hash_value[:8]}"
     
+    @staticmethod
+    def generate_usernames(names):
+        """
+        批量生成用户名 - 已存在时添加最小的可用数字后缀（zhangsan、zhangsan1、zhangsan2…）
+        
+        已占用的用户名按前缀范围一次查出（每 USERNAME_PREFIX_BATCH 个前缀一条查询），
+        后缀在内存中分配，同一批姓名之间也不会重复。
+        
+        Args:
+            names (list): 用户姓名列表
+            
+        Returns:
+            list: 与names一一对应的用户名
+        """
+        from ..models.database import db, User
+        
+        bases = [AuthService._base_username(name) for name in names]
+        
+        # 基础用户名及其数字后缀都落在 [base, base + ':') 范围内（':' 是 '9' 之后的字符），
+        # 范围条件可以使用 username 的唯一索引，且不需要处理 LIKE 通配符转义
+        taken = set()
+        distinct_bases = list(dict.fromkeys(bases))
+        for offset in range(0, len(distinct_bases), AuthService.USERNAME_PREFIX_BATCH):
+            batch = distinct_bases[offset:offset + AuthService.USERNAME_PREFIX_BATCH]
+            rows = db.session.query(User.username).filter(or_(*[
+                and_(User.username >= base, User.username < base + ':') for base in batch
+            ])).all()
+            taken.update(username for (username,) in rows)
+        
+        usernames = []
+        for base in bases:
+            username = base
+            counter = 1
+            while username in taken:
+                username = f"{base}{counter}"
+                counter += 1
+            taken.add(username)
+            usernames.append(username)
+        
+        return usernames
+    
+    @staticmethod
+    def generate_username(name):
+        """
+        生成用户名 - 使用pypinyin自动转换所有汉字，重名时添加数字后缀
+        
+        Args:
+            name (str): 用户姓名
+            
+        Returns:
+            str: 生成的用户名
+        """
+        return AuthService.generate_usernames([name])[0]
+    
     @staticmethod
     def create_user(name, email=None, position=None, role=None):
         """
@@ -117,7 +170,7 @@ class AuthService:
             )
             
             # 设置默认密码
-            default_password = 'td123456'
+            default_password = AuthService.DEFAULT_PASSWORD
             user.set_password(default_password)
             
             # 保存到数据库
@@ -200,31 +253,28 @@ class AuthService:
         if not user:
             return False
         
-        from ..models.database import UserRole, ProjectMember, ProjectMemberRole
+        from ..models.database import UserRole
+        from ..utils.principal import get_principal
         
         # 部门主管拥有所有项目的所有权限
         if user.role == UserRole.DEPARTMENT_MANAGER:
             return True
         
-        # 查询用户在该项目中的角色
-        project_member = ProjectMember.query.filter_by(
-            user_id=user.id,
-            project_id=project_id
-        ).first()
-        
-        if not project_member:
+        # 用户在该项目中的角色（来自缓存的权限数据）
+        principal = get_principal(user.id)
+        if not principal or project_id not in principal.project_roles:
             return False  # 用户不是该项目成员
         
         # 根据项目角色和权限类型判断
         if permission == 'edit_project':
             # 只有项目负责人可以编辑项目
-            return project_member.role == ProjectMemberRole.LEADER
+            return principal.is_leader_of(project_id)
         elif permission == 'view_project':
             # 所有项目成员都可以查看项目
             return True
         elif permission == 'update_project_modules':
             # 项目负责人可以更新项目的所有模块
-            return project_member.role == ProjectMemberRole.LEADER
+            return principal.is_leader_of(project_id)
         elif permission == 'view_project_modules':
             # 所有项目成员都可以查看项目模块
             return True
@@ -247,38 +297,26 @@ class AuthService:
         if not user:
             return False
         
-        from ..models.database import UserRole, ProjectModule, ProjectMember, ProjectMemberRole
+        from ..models.database import UserRole
+        from ..utils.principal import get_principal
         
         # 部门主管拥有所有权限
         if user.role == UserRole.DEPARTMENT_MANAGER:
             return True
         
-        # 获取模块信息
-        module = ProjectModule.query.get(module_id)
-        if not module:
+        # 模块必须属于用户所在的项目
+        principal = get_principal(user.id)
+        if not principal or module_id not in principal.module_projects:
             return False
         
-        # 检查用户是否是该项目成员
-        project_member = ProjectMember.query.filter_by(
-            user_id=user.id,
-            project_id=module.project_id
-        ).first()
-        
-        if not project_member:
-            return False
+        project_id = principal.module_projects[module_id]
         
         if permission == 'update_module':
-            # 项目负责人可以更新项目的所有模块
-            if project_member.role == ProjectMemberRole.LEADER:
-                return True
-            # 普通成员只能更新分配给自己的模块
-            return user.id in [u.id for u in module.assigned_users]
+            # 项目负责人可以更新项目的所有模块，普通成员只能更新通过模块分配分到的模块
+            return module_id in principal.editable_module_ids
         elif permission == 'delete_module':
-            # 项目负责人可以删除项目的所有模块
-            if project_member.role == ProjectMemberRole.LEADER:
-                return True
-            # 普通成员不能删除模块
-            return False
+            # 项目负责人可以删除项目的所有模块，普通成员不能删除模块
+            return principal.is_leader_of(project_id)
         elif permission == 'view_module':
             # 所有项目成员都可以查看模块
             return True
@@ -303,15 +341,13 @@ class AuthService:
         
         # 部门主管可以看到所有项目
         if user.role == UserRole.DEPARTMENT_MANAGER:
-            from ..models.database import Project
-            return [p.id for p in Project.query.all()]
+            from ..models.database import db, Project
+            return [project_id for (project_id,) in db.session.query(Project.id).all()]
         
         # 项目负责人和成员只能看到自己参与的项目
-        project_ids = []
-        for membership in user.project_memberships:
-            project_ids.append(membership.project_id)
-        
-        return project_ids
+        from ..utils.principal import get_principal
+        principal = get_principal(user.id)
+        return principal.project_ids if principal else []
     
     @staticmethod
     def get_user_modules(user, project_id=None):
@@ -332,34 +368,22 @@ class AuthService:
         
         # 部门主管可以更新所有模块
         if user.role == UserRole.DEPARTMENT_MANAGER:
-            from ..models.database import ProjectModule
-            query = ProjectModule.query
+            from ..models.database import db, ProjectModule
+            query = db.session.query(ProjectModule.id)
             if project_id:
-                query = query.filter_by(project_id=project_id)
-            return [m.id for m in query.all()]
+                query = query.filter(ProjectModule.project_id == project_id)
+            return [module_id for (module_id,) in query.all()]
         
-        # 普通成员中的项目负责人可以更新自己项目的所有模块
+        # 普通成员：负责项目中的所有模块 + 模块负责人是自己的模块（不要求是项目成员）
         if user.role == UserRole.MEMBER:
-            from ..models.database import ProjectModule, ProjectMember, ProjectMemberRole
-            # 获取用户作为项目负责人的项目中的所有模块
-            leader_modules = ProjectModule.query.join(ProjectMember).filter(
-                ProjectMember.user_id == user.id,
-                ProjectMember.role == ProjectMemberRole.LEADER
-            )
-            if project_id:
-                leader_modules = leader_modules.filter(ProjectModule.project_id == project_id)
-            
-            leader_module_ids = [m.id for m in leader_modules.all()]
-            
-            # 获取用户直接负责的模块
-            assigned_modules = ProjectModule.query.filter_by(assigned_to_id=user.id)
-            if project_id:
-                assigned_modules = assigned_modules.filter_by(project_id=project_id)
-            
-            assigned_module_ids = [m.id for m in assigned_modules.all()]
-            
-            # 合并两个列表并去重
-            return list(set(leader_module_ids + assigned_module_ids))
+            from ..utils.principal import get_principal
+            principal = get_principal(user.id)
+            if not principal:
+                return []
+            return [
+                module_id for module_id, module_project_id in principal.responsible_module_projects.items()
+                if not project_id or module_project_id == project_id
+            ]
         
         # 默认情况，返回空列表
         return []
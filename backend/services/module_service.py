@@ -6,7 +6,16 @@
 from typing import List, Dict, Optional, Any
 from datetime import datetime, date, timedelta
 from sqlalchemy import and_, or_, desc, func
-from ..models.database import db, ProjectModule, ModuleProgressRecord, ModuleWorkRecord, ModuleAssignment, Project, User, ProjectStatus, ModuleStatus
+from sqlalchemy.orm import joinedload, selectinload
+from ..utils.pagination import keyset_paginate, project_fields, wants_field
+from ..utils.cache import response_cache
+from ..models.database import db, ProjectModule, ModuleProgressRecord, ModuleWorkRecord, ModuleAssignment, Project, ProjectMember, User, ProjectStatus, ModuleStatus
+
+# 模块概览依赖的数据表（任一表提交写入后概览缓存失效）
+MODULES_OVERVIEW_TABLES = (
+    Project.__tablename__, ProjectMember.__tablename__, User.__tablename__,
+    ProjectModule.__tablename__, ModuleAssignment.__tablename__, ModuleWorkRecord.__tablename__
+)
 
 class ModuleService:
     """模块服务类 - 处理项目模块相关的业务逻辑"""
@@ -78,15 +87,11 @@ class ModuleService:
             )
             
             db.session.add(module)
-            db.session.commit()
             
-            # 创建模块后更新项目进度
-            try:
-                ModuleService._update_project_progress(project_id)
-                db.session.commit()
-            except Exception as e:
-                print(f"更新项目进度时出错: {str(e)}")
-                # 不影响模块创建的成功
+            # 创建模块后在同一事务中更新项目进度
+            ModuleService._update_project_progress(project, count_delta=1, progress_delta=initial_progress or 0)
+            
+            db.session.commit()
             
             return {
                 'success': True,
@@ -261,6 +266,7 @@ class ModuleService:
                     'data': None
                 }
             
+            old_progress = module.progress or 0
             module.progress = new_progress
             
             # 根据进度自动更新状态
@@ -284,11 +290,7 @@ class ModuleService:
             db.session.add(progress_record)
             
             # 更新项目整体进度（基于所有模块的平均进度）
-            try:
-                ModuleService._update_project_progress(module.project_id)
-            except Exception as e:
-                print(f"更新项目进度时出错: {str(e)}")
-                # 即使项目进度更新失败，也要保存模块进度
+            ModuleService._update_project_progress(module.project, progress_delta=new_progress - old_progress)
             
             db.session.commit()
             
@@ -307,38 +309,136 @@ class ModuleService:
             }
     
     @staticmethod
-    def _update_project_progress(project_id: int):
+    def get_missing_module_ids(module_ids: List[int]) -> List[int]:
         """
-        根据模块进度更新项目整体进度
+        找出不存在的模块ID（一次 IN 查询）
         
         Args:
-            project_id: 项目ID
+            module_ids: 模块ID列表
+            
+        Returns:
+            不存在的模块ID列表，保持传入顺序
+        """
+        existing_ids = {
+            module_id for (module_id,) in
+            db.session.query(ProjectModule.id).filter(ProjectModule.id.in_(module_ids)).all()
+        }
+        return [module_id for module_id in module_ids if module_id not in existing_ids]
+    
+    @staticmethod
+    def batch_update_module_progress(updates: List[Dict[str, Any]], updated_by_id: int) -> Dict[str, Any]:
+        """
+        批量更新模块进度（单个事务）
+        模块一次查询加载，进度记录一次批量插入，每个受影响的项目只重新计算一次进度
+        
+        Args:
+            updates: [{module_id, progress, notes}]，调用方已校验格式和权限
+            updated_by_id: 更新人ID
+            
+        Returns:
+            更新结果，data 为更新后的模块列表
         """
         try:
-            modules = ProjectModule.query.filter_by(project_id=project_id).all()
-            if not modules:
-                return
+            module_ids = [item['module_id'] for item in updates]
+            modules = ProjectModule.query.options(selectinload(ProjectModule.assigned_to))\
+                .filter(ProjectModule.id.in_(module_ids)).all()
+            modules_map = {module.id: module for module in modules}
             
-            # 计算所有模块的平均进度
-            total_progress = sum(module.progress for module in modules)
-            avg_progress = round(total_progress / len(modules))
+            missing_ids = [module_id for module_id in module_ids if module_id not in modules_map]
+            if missing_ids:
+                return {
+                    'success': False,
+                    'message': f'模块不存在: {", ".join(str(module_id) for module_id in missing_ids)}',
+                    'data': None
+                }
             
-            # 更新项目进度
-            project = Project.query.get(project_id)
-            if project:
-                project.progress = avg_progress
-                project.updated_at = datetime.now()
+            now = datetime.now()
+            project_deltas = {}
+            progress_records = []
+            for item in updates:
+                module = modules_map[item['module_id']]
+                new_progress = item['progress']
+                old_progress = module.progress or 0
+                
+                module.progress = new_progress
+                # 根据进度自动更新状态
+                if new_progress == 0:
+                    module.status = ModuleStatus.NOT_STARTED
+                elif new_progress == 100:
+                    module.status = ModuleStatus.COMPLETED
+                else:
+                    module.status = ModuleStatus.IN_PROGRESS
+                module.updated_at = now
                 
-                # 根据模块进度自动更新项目状态（仅在特定状态下）
-                if avg_progress == 0 and project.status == ProjectStatus.INITIAL_CONTACT:
-                    project.status = ProjectStatus.INITIAL_CONTACT  # 保持初步接触状态
-                elif avg_progress == 100 and project.status == ProjectStatus.PROJECT_IMPLEMENTATION:
-                    project.status = ProjectStatus.PROJECT_ACCEPTANCE  # 实施完成后进入验收
-                elif avg_progress > 0 and project.status == ProjectStatus.CONTRACT_SIGNED:
-                    project.status = ProjectStatus.PROJECT_IMPLEMENTATION  # 开始实施
-                    
+                project_deltas[module.project_id] = project_deltas.get(module.project_id, 0) + new_progress - old_progress
+                progress_records.append({
+                    'module_id': module.id,
+                    'progress': new_progress,
+                    'notes': item.get('notes'),
+                    'updated_by_id': updated_by_id,
+                    'updated_at': now
+                })
+            
+            # 进度记录一次批量插入
+            db.session.execute(db.insert(ModuleProgressRecord), progress_records)
+            
+            # 每个项目按进度总和的变化量更新一次
+            projects = Project.query.filter(Project.id.in_(list(project_deltas.keys()))).all()
+            for project in projects:
+                ModuleService._update_project_progress(project, progress_delta=project_deltas[project.id])
+            
+            # 提交前序列化，避免提交后逐个重新加载过期的模块
+            data = [modules_map[module_id].to_dict() for module_id in module_ids]
+            db.session.commit()
+            
+            return {
+                'success': True,
+                'message': f'已更新 {len(modules)} 个模块的进度',
+                'data': data
+            }
+            
         except Exception as e:
-            print(f"更新项目进度失败: {str(e)}")
+            db.session.rollback()
+            return {
+                'success': False,
+                'message': f'批量更新模块进度失败: {str(e)}',
+                'data': None
+            }
+    
+    @staticmethod
+    def _update_project_progress(project, count_delta: int = 0, progress_delta: int = 0):
+        """
+        根据模块进度增量更新项目整体进度
+        使用项目表上缓存的模块统计，不重新加载模块；调用方负责提交事务
+        
+        Args:
+            project: 项目对象
+            count_delta: 模块数量变化
+            progress_delta: 模块进度总和变化
+        """
+        from .project_service import ProjectService
+        ProjectService.apply_module_stats_delta(project, count_delta, progress_delta)
+        
+        if not project.module_count:
+            return
+        
+        # 计算所有模块的平均进度
+        avg_progress = round(project.module_progress_sum / project.module_count)
+        
+        # 更新项目进度
+        project.progress = avg_progress
+        project.updated_at = datetime.now()
+        
+        # 根据模块进度自动更新项目状态（仅在特定状态下）
+        if avg_progress == 100 and project.status == ProjectStatus.PROJECT_IMPLEMENTATION:
+            project.status = ProjectStatus.PROJECT_ACCEPTANCE  # 实施完成后进入验收
+        elif avg_progress > 0 and project.status == ProjectStatus.CONTRACT_SIGNED:
+            project.status = ProjectStatus.PROJECT_IMPLEMENTATION  # 开始实施
+        else:
+            return
+        
+        # 状态变化后重新映射缓存进度
+        ProjectService.refresh_computed_progress(project)
     
     @staticmethod
     def assign_module_to_user(module_id: int, user_id: int) -> Dict[str, Any]:
@@ -678,120 +778,6 @@ class ModuleService:
                 'data': None
             }
     
-    @staticmethod
-    def get_all_modules_overview() -> Dict[str, Any]:
-        """
-        获取所有项目的模块概览
-        
-        Returns:
-            所有项目及其模块信息
-        """
-        try:
-            # 获取所有项目及其模块
-            projects = Project.query.all()
-            
-            projects_with_modules = []
-            for project in projects:
-                project_dict = project.to_dict()
-                
-                # 使用新的进度计算逻辑
-                from .project_service import ProjectService
-                progress_info = ProjectService.calculate_project_progress(project)
-                project_dict['progress'] = progress_info['progress']  # 使用实时计算的进度
-                project_dict['progress_type'] = progress_info.get('type', 'unknown')
-                project_dict['progress_info'] = progress_info.get('info', '')
-                
-                # 获取项目模块
-                modules = ProjectModule.query.filter_by(project_id=project.id)\
-                    .order_by(ProjectModule.priority.desc(), ProjectModule.created_at).all()
-                
-                module_list = []
-                for module in modules:
-                    module_dict = module.to_dict()
-                    
-                    # 添加分配的用户列表
-                    assignments = ModuleAssignment.query.filter_by(module_id=module.id).all()
-                    assigned_users = []
-                    for assignment in assignments:
-                        if assignment.user:
-                            assigned_users.append({
-                                'id': assignment.user.id,
-                                'name': assignment.user.name,
-                                'position': assignment.user.position,
-                                'role': assignment.role
-                            })
-                    module_dict['assigned_users'] = assigned_users
-                    
-                    # 添加最近2条工作记录
-                    recent_works = ModuleWorkRecord.query.filter_by(module_id=module.id)\
-                        .order_by(desc(ModuleWorkRecord.week_start)).limit(2).all()
-                    
-                    recent_works_list = []
-                    for work in recent_works:
-                        week_label = f"{work.week_start.strftime('%m/%d')} - {work.week_end.strftime('%m/%d')}" if work.week_start and work.week_end else None
-                        recent_works_list.append({
-                            'week_label': week_label,
-                            'work_content': work.work_content,
-                            'achievements': work.achievements,
-                            'created_by': work.created_by.name if work.created_by else None,
-                            'updated_at': work.updated_at.isoformat()
-                        })
-                    
-                    module_dict['recent_works'] = recent_works_list
-                    # 保留latest_work以保持向后兼容
-                    module_dict['latest_work'] = recent_works_list[0] if recent_works_list else None
-                    
-                    # 添加最新进度记录
-                    latest_record = ModuleProgressRecord.query.filter_by(module_id=module.id)\
-                        .order_by(desc(ModuleProgressRecord.updated_at)).first()
-                    if latest_record:
-                        module_dict['latest_update'] = {
-                            'progress': latest_record.progress,
-                            'notes': latest_record.notes,
-                            'updated_by': latest_record.updated_by.name,
-                            'updated_at': latest_record.updated_at.isoformat()
-                        }
-                    
-                    module_list.append(module_dict)
-                
-                project_dict['modules'] = module_list
-                project_dict['module_count'] = len(module_list)
-                
-                # 计算项目模块统计
-                if module_list:
-                    completed_modules = [m for m in module_list if m['progress'] == 100]
-                    in_progress_modules = [m for m in module_list if 0 < m['progress'] < 100]
-                    pending_modules = [m for m in module_list if m['progress'] == 0]
-                    
-                    project_dict['module_stats'] = {
-                        'total': len(module_list),
-                        'completed': len(completed_modules),
-                        'in_progress': len(in_progress_modules),
-                        'pending': len(pending_modules)
-                    }
-                else:
-                    project_dict['module_stats'] = {
-                        'total': 0,
-                        'completed': 0,
-                        'in_progress': 0,
-                        'pending': 0
-                    }
-                
-                projects_with_modules.append(project_dict)
-            
-            return {
-                'success': True,
-                'message': '获取模块概览成功',
-                'data': projects_with_modules
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f'获取模块概览失败: {str(e)}',
-                'data': []
-            }
-    
     @staticmethod
     def add_work_record(module_id: int, work_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1049,23 +1035,47 @@ class ModuleService:
                     'data': None
                 }
             
-            # 清除现有分配
-            ModuleAssignment.query.filter_by(module_id=module_id).delete()
-            
-            # 添加新分配
-            for user_id in user_ids:
-                user = User.query.get(user_id)
-                if user:
-                    assignment = ModuleAssignment(
-                        module_id=module_id,
-                        user_id=user_id,
-                        role='member'
-                    )
-                    db.session.add(assignment)
+            # 一次查询校验用户，忽略不存在的用户和重复ID，保持请求顺序
+            requested_ids = list(dict.fromkeys(user_ids))
+            valid_ids = set()
+            if requested_ids:
+                valid_ids = {
+                    user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(requested_ids)).all()
+                }
+            target_ids = [user_id for user_id in requested_ids if user_id in valid_ids]
+            
+            # 与现有分配比较，只删除和插入有变化的记录（保留的记录保持原分配时间）
+            existing_rows = db.session.query(ModuleAssignment.id, ModuleAssignment.user_id, ModuleAssignment.role)\
+                .filter(ModuleAssignment.module_id == module_id)\
+                .order_by(ModuleAssignment.id).all()
+            kept_user_ids = set()
+            removed_ids = []
+            role_fix_ids = []
+            for assignment_id, user_id, role in existing_rows:
+                if user_id in valid_ids and user_id not in kept_user_ids:
+                    kept_user_ids.add(user_id)
+                    if role != 'member':
+                        role_fix_ids.append(assignment_id)
+                else:
+                    removed_ids.append(assignment_id)
+            
+            if removed_ids:
+                ModuleAssignment.query.filter(ModuleAssignment.id.in_(removed_ids))\
+                    .delete(synchronize_session=False)
+            if role_fix_ids:
+                ModuleAssignment.query.filter(ModuleAssignment.id.in_(role_fix_ids))\
+                    .update({ModuleAssignment.role: 'member'}, synchronize_session=False)
+            
+            added_rows = [
+                {'module_id': module_id, 'user_id': user_id, 'role': 'member'}
+                for user_id in target_ids if user_id not in kept_user_ids
+            ]
+            if added_rows:
+                db.session.execute(db.insert(ModuleAssignment), added_rows)
             
             # 保持原有的assigned_to_id字段兼容性（设置为第一个用户）
-            if user_ids:
-                module.assigned_to_id = user_ids[0]
+            if target_ids:
+                module.assigned_to_id = target_ids[0]
             
             db.session.commit()
             
@@ -1099,104 +1109,33 @@ class ModuleService:
         return week_start, week_end
     
     @staticmethod
-    def get_all_modules_overview():
+    @response_cache.cached('all_modules_overview', tables=MODULES_OVERVIEW_TABLES)
+    def get_all_modules_overview(limit: Optional[int] = None, cursor: Optional[str] = None,
+                                 fields: Optional[Dict[str, Any]] = None):
         """
         获取所有项目的模块概览
         
+        Args:
+            limit: 每页项目数，为None时返回全部项目
+            cursor: 上一页返回的游标
+            fields: 字段树（parse_fields），为None时返回全部字段
+            
         Returns:
             包含所有项目模块信息的字典
         """
         try:
-            from backend.models.database import Project, ProjectModule, User, ProjectMember, ProjectMemberRole, ModuleWorkRecord, ModuleAssignment
-            from sqlalchemy import desc
-            
-            projects = Project.query.all()
-            projects_data = []
-            
-            for project in projects:
-                modules = ProjectModule.query.filter_by(project_id=project.id).all()
-                modules_data = []
-                
-                for module in modules:
-                    module_dict = module.to_dict()
-                    
-                    # 添加分配的用户列表
-                    assignments = ModuleAssignment.query.filter_by(module_id=module.id).all()
-                    assigned_users = []
-                    for assignment in assignments:
-                        if assignment.user:
-                            assigned_users.append({
-                                'id': assignment.user.id,
-                                'name': assignment.user.name,
-                                'position': assignment.user.position,
-                                'role': assignment.role
-                            })
-                    module_dict['assigned_users'] = assigned_users
-                    
-                    # 添加最近2条工作记录
-                    recent_works = ModuleWorkRecord.query.filter_by(module_id=module.id)\
-                        .order_by(desc(ModuleWorkRecord.week_start)).limit(2).all()
-                    
-                    recent_works_list = []
-                    for work in recent_works:
-                        week_label = f"{work.week_start.strftime('%m/%d')} - {work.week_end.strftime('%m/%d')}" if work.week_start and work.week_end else None
-                        recent_works_list.append({
-                            'week_label': week_label,
-                            'work_content': work.work_content,
-                            'achievements': work.achievements,
-                            'created_by': work.created_by.name if work.created_by else None,
-                            'updated_at': work.updated_at.isoformat()
-                        })
-                    
-                    module_dict['recent_works'] = recent_works_list
-                    # 保留latest_work以保持向后兼容
-                    module_dict['latest_work'] = recent_works_list[0] if recent_works_list else None
-                        
-                    modules_data.append(module_dict)
-                
-                project_dict = project.to_dict()
-                
-                # 使用新的进度计算逻辑
-                from .project_service import ProjectService
-                progress_info = ProjectService.calculate_project_progress(project)
-                project_dict['progress'] = progress_info['progress']  # 使用实时计算的进度
-                project_dict['progress_type'] = progress_info.get('type', 'unknown')
-                project_dict['progress_info'] = progress_info.get('info', '')
-                
-                project_dict['modules'] = modules_data
-                
-                # 添加项目成员信息
-                members = []
-                for member in project.members:
-                    member_info = {
-                        'id': member.user.id,
-                        'user_id': member.user.id,
-                        'name': member.user.name,
-                        'role': member.role.value,
-                        'position': member.user.position
-                    }
-                    members.append(member_info)
-                
-                project_dict['members'] = members
-                
-                # 添加项目负责人信息
-                project_leader = ProjectMember.query.filter_by(
-                    project_id=project.id, 
-                    role=ProjectMemberRole.LEADER
-                ).first()
-                
-                if project_leader and project_leader.user:
-                    project_dict['leader'] = project_leader.user.to_dict()
-                else:
-                    project_dict['leader'] = None
-                
-                projects_data.append(project_dict)
+            projects_data, next_cursor = ModuleService._build_modules_overview(
+                limit=limit, cursor=cursor, fields=fields
+            )
             
-            return {
+            result = {
                 'success': True,
                 'message': '获取模块概览成功',
                 'data': projects_data
             }
+            if limit is not None:
+                result['next_cursor'] = next_cursor
+            return result
             
         except Exception as e:
             return {
@@ -1206,114 +1145,44 @@ class ModuleService:
             }
     
     @staticmethod
-    def get_modules_overview_by_projects(project_ids):
+    @response_cache.cached('modules_overview_by_projects', tables=MODULES_OVERVIEW_TABLES)
+    def get_modules_overview_by_projects(project_ids, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                         fields: Optional[Dict[str, Any]] = None):
         """
         根据项目ID列表获取模块概览
         
         Args:
             project_ids (list): 项目ID列表
+            limit: 每页项目数，为None时返回全部项目
+            cursor: 上一页返回的游标
+            fields: 字段树（parse_fields），为None时返回全部字段
             
         Returns:
             包含指定项目模块信息的字典
         """
         try:
             if not project_ids:
-                return {
+                result = {
                     'success': True,
                     'message': '获取模块概览成功',
                     'data': []
                 }
+                if limit is not None:
+                    result['next_cursor'] = None
+                return result
             
-            from backend.models.database import Project, ProjectModule, User, ProjectMember, ProjectMemberRole, ModuleWorkRecord, ModuleAssignment
-            from sqlalchemy import desc
-            
-            projects = Project.query.filter(Project.id.in_(project_ids)).all()
-            projects_data = []
-            
-            for project in projects:
-                modules = ProjectModule.query.filter_by(project_id=project.id).all()
-                modules_data = []
-                
-                for module in modules:
-                    module_dict = module.to_dict()
-                    
-                    # 添加分配的用户列表
-                    assignments = ModuleAssignment.query.filter_by(module_id=module.id).all()
-                    assigned_users = []
-                    for assignment in assignments:
-                        if assignment.user:
-                            assigned_users.append({
-                                'id': assignment.user.id,
-                                'name': assignment.user.name,
-                                'position': assignment.user.position,
-                                'role': assignment.role
-                            })
-                    module_dict['assigned_users'] = assigned_users
-                    
-                    # 添加最近2条工作记录
-                    recent_works = ModuleWorkRecord.query.filter_by(module_id=module.id)\
-                        .order_by(desc(ModuleWorkRecord.week_start)).limit(2).all()
-                    
-                    recent_works_list = []
-                    for work in recent_works:
-                        week_label = f"{work.week_start.strftime('%m/%d')} - {work.week_end.strftime('%m/%d')}" if work.week_start and work.week_end else None
-                        recent_works_list.append({
-                            'week_label': week_label,
-                            'work_content': work.work_content,
-                            'achievements': work.achievements,
-                            'created_by': work.created_by.name if work.created_by else None,
-                            'updated_at': work.updated_at.isoformat()
-                        })
-                    
-                    module_dict['recent_works'] = recent_works_list
-                    # 保留latest_work以保持向后兼容
-                    module_dict['latest_work'] = recent_works_list[0] if recent_works_list else None
-                        
-                    modules_data.append(module_dict)
-                
-                project_dict = project.to_dict()
-                
-                # 使用新的进度计算逻辑
-                from .project_service import ProjectService
-                progress_info = ProjectService.calculate_project_progress(project)
-                project_dict['progress'] = progress_info['progress']  # 使用实时计算的进度
-                project_dict['progress_type'] = progress_info.get('type', 'unknown')
-                project_dict['progress_info'] = progress_info.get('info', '')
-                
-                project_dict['modules'] = modules_data
-                
-                # 添加项目成员信息
-                members = []
-                for member in project.members:
-                    member_info = {
-                        'id': member.user.id,
-                        'user_id': member.user.id,
-                        'name': member.user.name,
-                        'role': member.role.value,
-                        'position': member.user.position
-                    }
-                    members.append(member_info)
-                
-                project_dict['members'] = members
-                
-                # 添加项目负责人信息
-                project_leader = ProjectMember.query.filter_by(
-                    project_id=project.id, 
-                    role=ProjectMemberRole.LEADER
-                ).first()
-                
-                if project_leader and project_leader.user:
-                    project_dict['leader'] = project_leader.user.to_dict()
-                else:
-                    project_dict['leader'] = None
-                
-                projects_data.append(project_dict)
+            projects_data, next_cursor = ModuleService._build_modules_overview(
+                project_ids, limit=limit, cursor=cursor, fields=fields
+            )
             
-            return {
+            result = {
                 'success': True,
                 'message': '获取模块概览成功',
                 'data': projects_data
             }
+            if limit is not None:
+                result['next_cursor'] = next_cursor
+            return result
             
         except Exception as e:
             return {
@@ -1322,6 +1191,202 @@ class ModuleService:
                 'data': []
             }
     
+    @staticmethod
+    def _build_modules_overview(project_ids: Optional[List[int]] = None, limit: Optional[int] = None,
+                                cursor: Optional[str] = None, fields: Optional[Dict[str, Any]] = None):
+        """
+        使用固定数量的查询构建模块概览（项目、模块、分配成员、最近工作记录各一次）
+        
+        Args:
+            project_ids: 项目ID列表，为None时包含所有项目
+            limit: 每页项目数，为None时返回全部项目（按ID排序）
+            cursor: 上一页返回的游标
+            fields: 字段树（parse_fields），未请求的关联数据不查询
+            
+        Returns:
+            tuple: (项目概览列表, next_cursor)
+        """
+        from backend.models.database import ProjectMemberRole
+        from .project_service import ProjectService
+        
+        include_members = wants_field(fields, 'members') or wants_field(fields, 'leader')
+        include_modules = wants_field(fields, 'modules')
+        module_fields = fields.get('modules') if fields else None
+        
+        projects_query = Project.query
+        if include_members:
+            projects_query = projects_query.options(
+                selectinload(Project.members).joinedload(ProjectMember.user)
+            )
+        if project_ids is not None:
+            projects_query = projects_query.filter(Project.id.in_(project_ids))
+        
+        if limit is None:
+            projects, next_cursor = projects_query.order_by(Project.id).all(), None
+        else:
+            projects, next_cursor = keyset_paginate(projects_query, Project, limit, cursor)
+            project_ids = [project.id for project in projects]
+        
+        modules = []
+        if include_modules and projects:
+            modules_query = ProjectModule.query.options(joinedload(ProjectModule.assigned_to))
+            if project_ids is not None:
+                modules_query = modules_query.filter(ProjectModule.project_id.in_(project_ids))
+            modules = modules_query.order_by(ProjectModule.id).all()
+        
+        # 批量计算所有项目进度
+        progress_map = ProjectService.calculate_projects_progress(projects)
+        
+        module_ids = [module.id for module in modules]
+        assigned_users_map = ModuleService._get_assigned_users_map(module_ids) \
+            if wants_field(module_fields, 'assigned_users') else {}
+        recent_works_map = ModuleService._get_recent_works_map(module_ids, limit=2) \
+            if wants_field(module_fields, 'recent_works') or wants_field(module_fields, 'latest_work') else {}
+        
+        modules_map = {}
+        for module in modules:
+            module_dict = module.to_dict()
+            module_dict['assigned_users'] = assigned_users_map.get(module.id, [])
+            
+            recent_works_list = recent_works_map.get(module.id, [])
+            module_dict['recent_works'] = recent_works_list
+            # 保留latest_work以保持向后兼容
+            module_dict['latest_work'] = recent_works_list[0] if recent_works_list else None
+            
+            modules_map.setdefault(module.project_id, []).append(module_dict)
+        
+        projects_data = []
+        for project in projects:
+            project_dict = project.to_dict()
+            
+            # 使用新的进度计算逻辑
+            progress_info = progress_map[project.id]
+            project_dict['progress'] = progress_info['progress']  # 使用实时计算的进度
+            project_dict['progress_type'] = progress_info.get('type', 'unknown')
+            project_dict['progress_info'] = progress_info.get('info', '')
+            
+            project_dict['modules'] = modules_map.get(project.id, [])
+            
+            # 添加项目成员信息
+            members = []
+            project_leader = None
+            for member in (sorted(project.members, key=lambda m: m.id) if include_members else []):
+                member_info = {
+                    'id': member.user.id,
+                    'user_id': member.user.id,
+                    'name': member.user.name,
+                    'role': member.role.value,
+                    'position': member.user.position
+                }
+                members.append(member_info)
+                
+                if project_leader is None and member.role == ProjectMemberRole.LEADER:
+                    project_leader = member
+            
+            project_dict['members'] = members
+            
+            # 添加项目负责人信息（取第一位负责人）
+            if project_leader and project_leader.user:
+                project_dict['leader'] = project_leader.user.to_dict()
+            else:
+                project_dict['leader'] = None
+            
+            projects_data.append(project_dict)
+        
+        return project_fields(projects_data, fields), next_cursor
+    
+    @staticmethod
+    def _get_assigned_users_map(module_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        批量获取模块分配的用户列表
+        
+        Args:
+            module_ids: 模块ID列表
+            
+        Returns:
+            {模块ID: 分配用户列表}
+        """
+        if not module_ids:
+            return {}
+        
+        rows = db.session.query(ModuleAssignment.module_id, ModuleAssignment.role, User.id, User.name, User.position)\
+            .join(User, User.id == ModuleAssignment.user_id)\
+            .filter(ModuleAssignment.module_id.in_(module_ids))\
+            .order_by(ModuleAssignment.id)\
+            .all()
+        
+        assigned_users_map = {}
+        for module_id, role, user_id, name, position in rows:
+            assigned_users_map.setdefault(module_id, []).append({
+                'id': user_id,
+                'name': name,
+                'position': position,
+                'role': role
+            })
+        return assigned_users_map
+    
+    @staticmethod
+    def _get_recent_works_map(module_ids: List[int], limit: int = 2) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        使用窗口函数一次性获取每个模块最近的工作记录
+        
+        Args:
+            module_ids: 模块ID列表
+            limit: 每个模块返回的记录数
+            
+        Returns:
+            {模块ID: 最近工作记录列表（按周倒序）}
+        """
+        if not module_ids:
+            return {}
+        
+        ranked = db.session.query(
+            ModuleWorkRecord.id.label('id'),
+            func.row_number().over(
+                partition_by=ModuleWorkRecord.module_id,
+                order_by=(desc(ModuleWorkRecord.week_start), desc(ModuleWorkRecord.id))
+            ).label('rn')
+        ).filter(ModuleWorkRecord.module_id.in_(module_ids)).subquery()
+        
+        rows = db.session.query(
+            ModuleWorkRecord.module_id,
+            ModuleWorkRecord.week_start,
+            ModuleWorkRecord.week_end,
+            ModuleWorkRecord.work_content,
+            ModuleWorkRecord.achievements,
+            ModuleWorkRecord.updated_at,
+            User.name
+        ).join(ranked, ranked.c.id == ModuleWorkRecord.id)\
+            .outerjoin(User, User.id == ModuleWorkRecord.created_by_id)\
+            .filter(ranked.c.rn <= limit)\
+            .order_by(ModuleWorkRecord.module_id, ranked.c.rn)\
+            .all()
+        
+        recent_works_map = {}
+        for module_id, week_start, week_end, work_content, achievements, updated_at, created_by in rows:
+            week_label = f"{week_start.strftime('%m/%d')} - {week_end.strftime('%m/%d')}" if week_start and week_end else None
+            recent_works_map.setdefault(module_id, []).append({
+                'week_label': week_label,
+                'work_content': work_content,
+                'achievements': achievements,
+                'created_by': created_by,
+                'updated_at': updated_at.isoformat()
+            })
+        return recent_works_map
+    
+    @staticmethod
+    def delete_module_rows(module_ids) -> None:
+        """
+        批量删除模块及其分配、进度和工作记录
+        使用集合式 DELETE 语句，不加载任何对象；调用方负责提交事务和维护项目进度缓存
+        
+        Args:
+            module_ids: 模块ID列表或返回模块ID的子查询
+        """
+        for model in (ModuleAssignment, ModuleProgressRecord, ModuleWorkRecord):
+            model.query.filter(model.module_id.in_(module_ids)).delete(synchronize_session=False)
+        ProjectModule.query.filter(ProjectModule.id.in_(module_ids)).delete(synchronize_session=False)
+    
     @staticmethod
     def delete_module(module_id: int) -> Dict[str, Any]:
         """
@@ -1342,30 +1407,18 @@ class ModuleService:
                     'data': None
                 }
             
-            project_id = module.project_id
+            project = module.project
+            module_progress = module.progress or 0
             
-            # 删除相关数据
-            # 1. 删除模块分配记录
-            ModuleAssignment.query.filter_by(module_id=module_id).delete()
+            # 1. 批量删除模块及其关联数据（不走ORM级联，不加载子记录）
+            ModuleService.delete_module_rows([module_id])
+            db.session.expunge(module)
             
-            # 2. 删除模块进度记录
-            ModuleProgressRecord.query.filter_by(module_id=module_id).delete()
+            # 2. 在同一事务中更新项目进度
+            ModuleService._update_project_progress(project, count_delta=-1, progress_delta=-module_progress)
             
-            # 3. 删除模块工作记录
-            ModuleWorkRecord.query.filter_by(module_id=module_id).delete()
-            
-            # 4. 删除模块本身
-            db.session.delete(module)
             db.session.commit()
             
-            # 5. 更新项目进度（删除模块后重新计算）
-            try:
-                ModuleService._update_project_progress(project_id)
-                db.session.commit()
-            except Exception as e:
-                print(f"更新项目进度时出错: {str(e)}")
-                # 不影响模块删除的成功
-            
             return {
                 'success': True,
                 'message': '模块删除成功',
@@ -5,8 +5,11 @@
 
 from typing import List, Dict, Optional, Any
 from datetime import datetime, date
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, func, bindparam
+from sqlalchemy.orm import joinedload, selectinload
 from ..models.database import db, Project, ProjectMember, ProgressRecord, User, ProjectStatus, ProjectMemberRole, ProjectModule, ModuleAssignment, ModuleWorkRecord
+from ..utils.pagination import keyset_paginate, project_fields, wants_field
+from ..utils.cache import response_cache
 
 class ProjectService:
     """项目服务类 - 处理项目相关的业务逻辑"""
@@ -63,6 +66,116 @@ class ProjectService:
         Args:
             project: 项目对象
             
+        Returns:
+            进度信息字典 {progress: int, type: str, info: str, ...}
+        """
+        return ProjectService.calculate_projects_progress([project])[project.id]
+    
+    @staticmethod
+    def calculate_projects_progress(projects: List[Project]) -> Dict[int, Dict[str, Any]]:
+        """
+        批量计算项目进度
+        
+        直接使用项目表上缓存的模块数量和进度总和，
+        在内存中套用阶段映射规则，不访问 project_modules 表
+        
+        Args:
+            projects: 项目对象列表
+            
+        Returns:
+            {项目ID: 进度信息字典}
+        """
+        return {
+            project.id: ProjectService._progress_from_module_stats(
+                project, project.module_count or 0, project.module_progress_sum or 0
+            )
+            for project in projects
+        }
+    
+    @staticmethod
+    def apply_module_stats_delta(project, count_delta: int = 0, progress_delta: int = 0):
+        """
+        增量更新项目的模块统计缓存并重新计算缓存进度
+        调用方负责提交事务
+        
+        Args:
+            project: 项目对象
+            count_delta: 模块数量变化
+            progress_delta: 模块进度总和变化
+        """
+        # 使用SQL表达式原地累加，避免并发写入时丢失更新；flush后属性会重新加载
+        project.module_count = func.coalesce(Project.module_count, 0) + count_delta
+        project.module_progress_sum = func.coalesce(Project.module_progress_sum, 0) + progress_delta
+        db.session.flush()
+        ProjectService.refresh_computed_progress(project)
+    
+    @staticmethod
+    def refresh_computed_progress(project):
+        """
+        根据缓存的模块统计重新计算项目进度（状态或来源变化时调用）
+        调用方负责提交事务
+        
+        Args:
+            project: 项目对象
+        """
+        progress_info = ProjectService._progress_from_module_stats(
+            project, project.module_count or 0, project.module_progress_sum or 0
+        )
+        project.computed_progress = progress_info['progress']
+    
+    @staticmethod
+    def rebuild_progress_cache() -> int:
+        """
+        从 project_modules 表重新统计并重建所有项目的进度缓存
+        
+        Returns:
+            重建的项目数量
+        """
+        rows = db.session.query(
+            ProjectModule.project_id,
+            func.count(ProjectModule.id),
+            func.coalesce(func.sum(ProjectModule.progress), 0)
+        ).group_by(ProjectModule.project_id).all()
+        module_stats = {project_id: (count, total) for project_id, count, total in rows}
+        
+        projects = Project.query.all()
+        rows = []
+        for project in projects:
+            project.module_count, project.module_progress_sum = module_stats.get(project.id, (0, 0))
+            ProjectService.refresh_computed_progress(project)
+            rows.append({
+                'b_id': project.id,
+                'module_count': project.module_count,
+                'module_progress_sum': project.module_progress_sum,
+                'computed_progress': project.computed_progress
+            })
+            # 缓存字段不经 ORM flush 写回，避免 onupdate 修改 updated_at
+            db.session.expunge(project)
+        
+        if rows:
+            table = Project.__table__
+            db.session.execute(
+                table.update().where(table.c.id == bindparam('b_id')).values(
+                    module_count=bindparam('module_count'),
+                    module_progress_sum=bindparam('module_progress_sum'),
+                    computed_progress=bindparam('computed_progress'),
+                    updated_at=table.c.updated_at
+                ),
+                rows
+            )
+        db.session.commit()
+        return len(projects)
+    
+    @staticmethod
+    def _progress_from_module_stats(project, module_count: int, total_progress: int) -> Dict[str, Any]:
+        """
+        根据模块统计数据计算项目进度（纯内存计算，不访问数据库）
+        
+        Args:
+            project: 项目对象
+            module_count: 模块数量
+            total_progress: 模块进度总和
+            
         Returns:
             进度信息字典 {progress: int, type: str, info: str, ...}
         """
@@ -70,9 +183,7 @@ class ProjectService:
         project_source = project.project_source
         manual_progress = getattr(project, 'manual_progress', None)
         
-        # 获取项目的所有模块
-        modules = ProjectModule.query.filter_by(project_id=project.id).all()
-        has_modules = len(modules) > 0
+        has_modules = module_count > 0
         
         # 纵向项目：使用状态阶段进度
         if project_source == 'vertical':
@@ -90,8 +201,7 @@ class ProjectService:
         if status == 'project_acceptance':
             if has_modules:
                 # 计算模块平均进度
-                total_progress = sum(module.progress for module in modules)
-                avg_module_progress = total_progress / len(modules)
+                avg_module_progress = total_progress / module_count
                 
                 # 将模块进度（0-100%）映射到验收阶段范围（85-90%）
                 # 公式：85 + (模块平均 / 100 × 5)
@@ -101,10 +211,10 @@ class ProjectService:
                 return {
                     'progress': progress,
                     'type': 'acceptance',
-                    'module_count': len(modules),
+                    'module_count': module_count,
                     'avg_module_progress': round(avg_module_progress),
                     'label': '项目验收',
-                    'info': f'验收阶段，基于 {len(modules)} 个模块（平均 {round(avg_module_progress)}%），映射到 85-90%',
+                    'info': f'验收阶段，基于 {module_count} 个模块（平均 {round(avg_module_progress)}%），映射到 85-90%',
                     'source': 'modules',
                     'detail': {
                         'stage': 7,
@@ -125,8 +235,7 @@ class ProjectService:
         if status == 'warranty_period':
             if has_modules:
                 # 维保期内：90-100%，基于模块映射
-                total_progress = sum(module.progress for module in modules)
-                avg_module_progress = total_progress / len(modules)
+                avg_module_progress = total_progress / module_count
                 
                 # 将模块进度（0-100%）映射到维保阶段范围（90-100%）
                 # 公式：90 + (模块平均 / 100 × 10)
@@ -136,10 +245,10 @@ class ProjectService:
                 return {
                     'progress': progress,
                     'type': 'warranty',
-                    'module_count': len(modules),
+                    'module_count': module_count,
                     'avg_module_progress': round(avg_module_progress),
                     'label': '维保期内',
-                    'info': f'维保期内，基于 {len(modules)} 个模块（平均 {round(avg_module_progress)}%），映射到 90-100%',
+                    'info': f'维保期内，基于 {module_count} 个模块（平均 {round(avg_module_progress)}%），映射到 90-100%',
                     'source': 'modules',
                     'detail': {
                         'stage': 8,
@@ -179,8 +288,7 @@ class ProjectService:
         if status == 'project_implementation':
             if has_modules:
                 # 计算模块平均进度
-                total_progress = sum(module.progress for module in modules)
-                avg_module_progress = total_progress / len(modules)
+                avg_module_progress = total_progress / module_count
                 
                 # 将模块进度（0-100%）映射到项目实施范围（35-85%）
                 # 公式：35 + (模块平均 / 100 × 50)
@@ -190,9 +298,9 @@ class ProjectService:
                 return {
                     'progress': final_progress,
                     'type': 'implementation',
-                    'module_count': len(modules),
+                    'module_count': module_count,
                     'avg_module_progress': round(avg_module_progress),
-                    'info': f'项目实施，基于 {len(modules)} 个模块（平均 {round(avg_module_progress)}%），映射到 35-85%',
+                    'info': f'项目实施，基于 {module_count} 个模块（平均 {round(avg_module_progress)}%），映射到 35-85%',
                     'source': 'modules',
                     'detail': {
                         'stage': 6,
@@ -218,8 +326,7 @@ class ProjectService:
             
             # 优先级1：如果有模块，基于模块进度映射到阶段范围
             if has_modules:
-                total_progress = sum(module.progress for module in modules)
-                avg_module_progress = total_progress / len(modules)
+                avg_module_progress = total_progress / module_count
                 
                 # 将模块进度映射到当前阶段的范围
                 # 公式：阶段下限 + (模块平均 / 100 × 阶段范围)
@@ -231,10 +338,10 @@ class ProjectService:
                     'type': 'stage_with_modules',
                     'stage': limits['stage'],
                     'total_stages': 7,
-                    'module_count': len(modules),
+                    'module_count': module_count,
                     'avg_module_progress': round(avg_module_progress),
                     'label': limits['label'],
-                    'info': f'基于 {len(modules)} 个模块，映射到阶段范围 {limits["min"]}-{limits["max"]}%',
+                    'info': f'基于 {module_count} 个模块，映射到阶段范围 {limits["min"]}-{limits["max"]}%',
                     'source': 'modules'
                 }
             
@@ -308,8 +415,11 @@ class ProjectService:
                 partner=project_data.get('partner'),  # 合作方（可选）
                 contract_amount=project_data.get('contract_amount'),  # 合同金额（可选）
                 received_amount=project_data.get('received_amount'),  # 到账金额（可选）
-                progress=0 if project_source == 'vertical' else project_data.get('progress', 0)  # 纵向项目进度固定为0
+                progress=0 if project_source == 'vertical' else project_data.get('progress', 0),  # 纵向项目进度固定为0
+                module_count=0,
+                module_progress_sum=0
             )
+            ProjectService.refresh_computed_progress(project)
             
             db.session.add(project)
             db.session.flush()  # 获取项目ID
@@ -341,15 +451,19 @@ class ProjectService:
             }
     
     @staticmethod
-    def get_project_list(filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def get_project_list(filters: Dict[str, Any] = None, limit: Optional[int] = None,
+                         cursor: Optional[str] = None, fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         获取项目列表
         
         Args:
             filters: 过滤条件字典
+            limit: 每页条数，为None时返回全部项目
+            cursor: 上一页返回的游标
+            fields: 字段树（parse_fields），为None时返回全部字段
             
         Returns:
-            项目列表
+            项目列表，分页时附带next_cursor
         """
         try:
             query = Project.query
@@ -364,12 +478,11 @@ class ProjectService:
                     query = query.join(ProjectMember).filter(ProjectMember.user_id == filters['user_id'])
                 
                 if filters.get('search'):
-                    # 搜索项目名称或描述
-                    search_term = f"%{filters['search']}%"
-                    query = query.filter(or_(
-                        Project.name.like(search_term),
-                        Project.description.like(search_term)
-                    ))
+                    # 在全文索引中搜索项目名称或描述
+                    from .search_service import SearchService
+                    matched_ids = SearchService.matching_entity_ids('project', filters['search'])
+                    if matched_ids is not None:
+                        query = query.filter(Project.id.in_(matched_ids))
                 
                 if filters.get('project_ids'):
                     # 按项目ID列表过滤
@@ -379,8 +492,24 @@ class ProjectService:
                     else:  # 如果列表为空，返回空结果
                         query = query.filter(False)
             
+            # 未请求的字段不做关联查询
+            include_members = wants_field(fields, 'members') or wants_field(fields, 'leaders')
+            if include_members:
+                # 成员及其用户信息一次性预加载
+                query = query.options(
+                    selectinload(Project.members).joinedload(ProjectMember.user)
+                )
+            
             # 按更新时间降序排列
-            projects = query.order_by(desc(Project.updated_at)).all()
+            projects, next_cursor = keyset_paginate(query, Project, limit, cursor)
+            project_ids = [project.id for project in projects]
+            
+            # 批量获取模块成员和最新进度记录，查询次数不随项目数量增长
+            module_members_map = ProjectService._get_module_members_map(project_ids) \
+                if wants_field(fields, 'member_count') else {}
+            latest_records = ProjectService._get_latest_progress_records(project_ids) \
+                if wants_field(fields, 'latest_update') else {}
+            progress_map = ProjectService.calculate_projects_progress(projects)
             
             # 转换为字典并添加成员信息
             project_list = []
@@ -390,7 +519,7 @@ class ProjectService:
                 # 添加项目成员信息
                 members = []
                 leaders = []
-                for member in project.members:
+                for member in (project.members if include_members else []):
                     member_info = {
                         'id': member.user.id,
                         'name': member.user.name,
@@ -403,19 +532,7 @@ class ProjectService:
                         leaders.append(member_info)
                 
                 # 从模块中收集真实的项目成员（去重）
-                module_members = {}
-                project_modules = ProjectModule.query.filter_by(project_id=project.id).all()
-                for module in project_modules:
-                    # 获取模块分配的成员
-                    assignments = ModuleAssignment.query.filter_by(module_id=module.id).all()
-                    for assignment in assignments:
-                        user = assignment.user
-                        if user.id not in module_members:
-                            module_members[user.id] = {
-                                'id': user.id,
-                                'name': user.name,
-                                'position': user.position
-                            }
+                module_members = module_members_map.get(project.id, {})
                 
                 project_dict['members'] = members
                 project_dict['leaders'] = leaders
@@ -423,15 +540,14 @@ class ProjectService:
                 project_dict['member_count'] = len(module_members)
                 
                 # 计算项目进度（使用新的三层进度体系）
-                progress_info = ProjectService.calculate_project_progress(project)
+                progress_info = progress_map[project.id]
                 project_dict['progress'] = progress_info['progress']
                 project_dict['progress_type'] = progress_info['type']
                 project_dict['progress_info'] = progress_info.get('info', '')
                 project_dict['progress_detail'] = progress_info  # 完整的进度信息
                 
                 # 添加最新进度记录
-                latest_record = ProgressRecord.query.filter_by(project_id=project.id)\
-                    .order_by(desc(ProgressRecord.updated_at)).first()
+                latest_record = latest_records.get(project.id)
                 if latest_record:
                     project_dict['latest_update'] = {
                         'progress': latest_record.progress,
@@ -442,11 +558,14 @@ class ProjectService:
                 
                 project_list.append(project_dict)
             
-            return {
+            result = {
                 'success': True,
                 'message': '获取项目列表成功',
-                'data': project_list
+                'data': project_fields(project_list, fields)
             }
+            if limit is not None:
+                result['next_cursor'] = next_cursor
+            return result
             
         except Exception as e:
             return {
@@ -455,6 +574,67 @@ class ProjectService:
                 'data': []
             }
     
+    @staticmethod
+    def _get_module_members_map(project_ids: List[int]) -> Dict[int, Dict[int, Dict[str, Any]]]:
+        """
+        批量获取各项目模块中分配的成员（去重）
+        
+        Args:
+            project_ids: 项目ID列表
+            
+        Returns:
+            {项目ID: {用户ID: 成员信息}}
+        """
+        if not project_ids:
+            return {}
+        
+        rows = db.session.query(ProjectModule.project_id, User.id, User.name, User.position)\
+            .join(ModuleAssignment, ModuleAssignment.module_id == ProjectModule.id)\
+            .join(User, User.id == ModuleAssignment.user_id)\
+            .filter(ProjectModule.project_id.in_(project_ids))\
+            .all()
+        
+        members_map = {}
+        for project_id, user_id, name, position in rows:
+            project_members = members_map.setdefault(project_id, {})
+            if user_id not in project_members:
+                project_members[user_id] = {
+                    'id': user_id,
+                    'name': name,
+                    'position': position
+                }
+        return members_map
+    
+    @staticmethod
+    def _get_latest_progress_records(project_ids: List[int]) -> Dict[int, ProgressRecord]:
+        """
+        使用窗口函数一次性获取每个项目的最新进度记录
+        
+        Args:
+            project_ids: 项目ID列表
+            
+        Returns:
+            {项目ID: 最新进度记录}
+        """
+        if not project_ids:
+            return {}
+        
+        ranked = db.session.query(
+            ProgressRecord.id.label('id'),
+            func.row_number().over(
+                partition_by=ProgressRecord.project_id,
+                order_by=(desc(ProgressRecord.updated_at), desc(ProgressRecord.id))
+            ).label('rn')
+        ).filter(ProgressRecord.project_id.in_(project_ids)).subquery()
+        
+        records = ProgressRecord.query\
+            .join(ranked, ranked.c.id == ProgressRecord.id)\
+            .filter(ranked.c.rn == 1)\
+            .options(joinedload(ProgressRecord.updated_by))\
+            .all()
+        
+        return {record.project_id: record for record in records}
+    
     @staticmethod
     def get_project_detail(project_id: int) -> Dict[str, Any]:
         """
@@ -571,6 +751,10 @@ class ProjectService:
                 # 金额可以为None（表示未设置）
                 project.received_amount = project_data['received_amount']
             
+            # 状态或来源变化会影响进度映射规则，同步刷新缓存进度
+            if 'status' in project_data or 'project_source' in project_data:
+                ProjectService.refresh_computed_progress(project)
+            
             project.updated_at = datetime.now()
             
             # 处理项目成员更新
@@ -616,36 +800,28 @@ class ProjectService:
             删除结果
         """
         try:
-            project = Project.query.get(project_id)
-            if not project:
+            project_name = db.session.query(Project.name).filter(Project.id == project_id).scalar()
+            if project_name is None:
                 return {
                     'success': False,
                     'message': '项目不存在',
                     'data': None
                 }
             
-            project_name = project.name
-            
-            # 手动删除关联数据（避免外键约束错误）
-            # 1. 获取项目的所有模块
-            modules = ProjectModule.query.filter_by(project_id=project_id).all()
+            from .module_service import ModuleService
             
-            # 2. 删除每个模块的关联数据
-            for module in modules:
-                # 删除模块分配记录
-                ModuleAssignment.query.filter_by(module_id=module.id).delete()
-                # 删除模块工作记录
-                ModuleWorkRecord.query.filter_by(module_id=module.id).delete()
-                # 删除模块进度记录会被级联删除（已配置cascade）
+            # 使用集合式 DELETE 按外键顺序删除关联数据，不加载模块和子记录
+            # 1. 删除项目的所有模块及模块分配、进度、工作记录
+            module_ids = db.session.query(ProjectModule.id)\
+                .filter(ProjectModule.project_id == project_id).scalar_subquery()
+            ModuleService.delete_module_rows(module_ids)
             
-            # 3. 删除项目成员记录
-            ProjectMember.query.filter_by(project_id=project_id).delete()
+            # 2. 删除项目成员记录和项目进度记录
+            ProjectMember.query.filter_by(project_id=project_id).delete(synchronize_session=False)
+            ProgressRecord.query.filter_by(project_id=project_id).delete(synchronize_session=False)
             
-            # 4. 删除项目进度记录
-            ProgressRecord.query.filter_by(project_id=project_id).delete()
-            
-            # 5. 删除项目本身（会级联删除模块）
-            db.session.delete(project)
+            # 3. 删除项目本身
+            Project.query.filter_by(id=project_id).delete(synchronize_session=False)
             db.session.commit()
             
             return {
@@ -711,6 +887,7 @@ class ProjectService:
             elif new_progress > 0 and project.status == ProjectStatus.CONTRACT_SIGNED:
                 project.status = ProjectStatus.PROJECT_IMPLEMENTATION  # 合同签订后开始实施
             
+            ProjectService.refresh_computed_progress(project)
             project.updated_at = datetime.now()
             
             # 创建进度记录
@@ -821,6 +998,9 @@ class ProjectService:
             }
     
     @staticmethod
+    @response_cache.cached('department_overview', tables=(
+        Project.__tablename__, ProjectMember.__tablename__, User.__tablename__
+    ))
     def get_department_overview() -> Dict[str, Any]:
         """
         获取部门项目总览
@@ -830,33 +1010,48 @@ class ProjectService:
             部门项目总览数据
         """
         try:
-            # 统计各状态项目数量
-            status_counts = {}
-            for status in ProjectStatus:
-                count = Project.query.filter_by(status=status).count()
-                status_counts[status.value] = count
+            # 统计各状态项目数量（单次分组查询，保留所有状态键）
+            status_counts = {status.value: 0 for status in ProjectStatus}
+            status_rows = db.session.query(Project.status, func.count(Project.id))\
+                .group_by(Project.status).all()
+            for status, count in status_rows:
+                if status is not None:
+                    status_counts[status.value] = count
             
             # 获取所有项目的基本信息
             projects = Project.query.order_by(desc(Project.updated_at)).all()
             
+            # 一次性获取项目负责人和成员数量
+            leaders_map = {}
+            leader_rows = db.session.query(ProjectMember.project_id, User.name)\
+                .join(User, User.id == ProjectMember.user_id)\
+                .filter(ProjectMember.role == ProjectMemberRole.LEADER)\
+                .order_by(ProjectMember.id)\
+                .all()
+            for project_id, name in leader_rows:
+                leaders_map.setdefault(project_id, []).append(name)
+            
+            member_counts = dict(
+                db.session.query(ProjectMember.project_id, func.count(ProjectMember.id))
+                .group_by(ProjectMember.project_id).all()
+            )
+            
             # 计算整体进度
             total_progress = 0
             active_projects = 0
             
+            progress_map = ProjectService.calculate_projects_progress(projects)
+            
             project_summary = []
             for project in projects:
                 # 使用新的进度计算逻辑
-                progress_info = ProjectService.calculate_project_progress(project)
+                progress_info = progress_map[project.id]
                 current_progress = progress_info['progress']
                 
                 if project.status not in [ProjectStatus.NO_FOLLOW_UP]:
                     total_progress += current_progress
                     active_projects += 1
                 
-                # 获取项目负责人
-                leaders = [member.user.name for member in project.members 
-                          if member.role == ProjectMemberRole.LEADER]
-                
                 project_info = {
                     'id': project.id,
                     'name': project.name,
@@ -864,8 +1059,8 @@ class ProjectService:
                     'progress': current_progress,  # 使用计算后的进度
                     'progress_type': progress_info.get('type', 'unknown'),  # 进度类型
                     'progress_info': progress_info.get('info', ''),  # 进度说明
-                    'leaders': leaders,
-                    'member_count': len(project.members),
+                    'leaders': leaders_map.get(project.id, []),
+                    'member_count': member_counts.get(project.id, 0),
                     'start_date': project.start_date.isoformat() if project.start_date else None,
                     'end_date': project.end_date.isoformat() if project.end_date else None,
                     'project_source': project.project_source,  # 添加项目来源
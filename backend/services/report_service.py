@@ -0,0 +1,240 @@
+"""
+报表服务层 - 服务端生成 Excel 报表
+遵循DDD分层架构，按批次读取数据并用 openpyxl 只写模式写出，内存占用不随项目数量增长
+"""
+
+import tempfile
+from datetime import datetime
+from typing import List, Dict, Optional, Any
+from sqlalchemy import case, func
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from ..models.database import db, Project, ProjectMember, ProjectModule, User, ProjectStatus, ProjectMemberRole
+from .project_service import ProjectService
+from .module_service import ModuleService
+
+
+class ReportService:
+    """报表服务类 - 处理报表导出相关的业务逻辑"""
+
+    # 每批读取的项目数量
+    BATCH_SIZE = 200
+
+    # 生成的文件超过该大小后落盘
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+    # 列名及列宽（与前端导出保持一致）
+    MODULES_REPORT_COLUMNS = [
+        ('项目名称', 20), ('状态', 10), ('合作方', 15), ('合同金额', 15), ('到账金额', 15),
+        ('进度', 10), ('负责人', 15), ('模块名称', 20), ('模块状态', 12), ('模块进度', 12),
+        ('模块负责人', 15), ('负责人职位', 15), ('上次工作', 35), ('最新工作', 35), ('更新时间', 20)
+    ]
+
+    PROJECT_STATUS_TEXT = {
+        'initial_contact': '初步接触',
+        'proposal_submitted': '提交方案',
+        'quotation_submitted': '提交报价',
+        'user_confirmation': '用户确认',
+        'contract_signed': '合同签订',
+        'project_implementation': '项目实施',
+        'project_acceptance': '项目验收',
+        'warranty_period': '维保期内',
+        'post_warranty': '维保期外',
+        'no_follow_up': '不再跟进',
+        'vertical_declaration': '申报阶段',
+        'vertical_review': '审核阶段',
+        'vertical_approved': '审核通过',
+        'vertical_rejected': '审核未通过'
+    }
+
+    MODULE_STATUS_TEXT = {
+        'not_started': '待开始',
+        'in_progress': '进行中',
+        'completed': '已完成',
+        'paused': '暂停'
+    }
+
+    # 项目排序：先按来源（横向 → 纵向 → 自研），再按横向业务流程状态
+    SOURCE_ORDER = {'horizontal': 1, 'vertical': 2, 'self_developed': 3}
+    STATUS_ORDER = [
+        ProjectStatus.INITIAL_CONTACT, ProjectStatus.PROPOSAL_SUBMITTED, ProjectStatus.QUOTATION_SUBMITTED,
+        ProjectStatus.USER_CONFIRMATION, ProjectStatus.CONTRACT_SIGNED, ProjectStatus.PROJECT_IMPLEMENTATION,
+        ProjectStatus.PROJECT_ACCEPTANCE, ProjectStatus.WARRANTY_PERIOD, ProjectStatus.POST_WARRANTY,
+        ProjectStatus.NO_FOLLOW_UP
+    ]
+
+    @staticmethod
+    def build_modules_report(project_ids: Optional[List[int]] = None):
+        """
+        生成项目模块进度一览表
+
+        Args:
+            project_ids: 可导出的项目ID列表，为None时导出所有项目
+
+        Returns:
+            位于文件开头的临时文件对象，调用方负责关闭
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('项目模块进度一览')
+        for index, (_, width) in enumerate(ReportService.MODULES_REPORT_COLUMNS, start=1):
+            sheet.column_dimensions[get_column_letter(index)].width = width
+
+        column_count = len(ReportService.MODULES_REPORT_COLUMNS)
+        sheet.append([name for name, _ in ReportService.MODULES_REPORT_COLUMNS])
+
+        # 汇总信息（部门总览已缓存）
+        summary = ProjectService.get_department_overview()['data']['summary']
+        distribution = summary.get('status_distribution', {})
+        completed_count = distribution.get('project_acceptance', 0) + distribution.get('warranty_period', 0) \
+            + distribution.get('post_warranty', 0)
+        sheet.append(['=== 项目汇总信息 ==='] + [''] * (column_count - 1))
+        sheet.append([
+            f"总项目数: {summary['total_projects']}",
+            f"进行中: {summary['active_projects']}",
+            '', '', '',
+            f"平均进度: {summary['avg_progress']}%",
+            f'已完成: {completed_count}'
+        ] + [''] * (column_count - 7))
+        sheet.append([])
+
+        if project_ids is None or project_ids:
+            for projects in ReportService._iter_project_batches(project_ids):
+                ReportService._append_project_rows(sheet, projects)
+
+        output = tempfile.SpooledTemporaryFile(max_size=ReportService.SPOOL_MAX_SIZE)
+        workbook.save(output)
+        output.seek(0)
+        return output
+
+    @staticmethod
+    def _iter_project_batches(project_ids: Optional[List[int]]):
+        """
+        按导出顺序分批读取项目
+
+        Args:
+            project_ids: 项目ID列表，为None时读取所有项目
+
+        Yields:
+            项目对象列表
+        """
+        source_rank = case(
+            ReportService.SOURCE_ORDER,
+            value=func.coalesce(Project.project_source, 'horizontal'),
+            else_=99
+        )
+        status_rank = case(
+            *[(Project.status == status, index) for index, status in enumerate(ReportService.STATUS_ORDER)],
+            else_=99
+        )
+
+        query = Project.query
+        if project_ids is not None:
+            query = query.filter(Project.id.in_(project_ids))
+        query = query.order_by(source_rank, status_rank, Project.id)\
+            .yield_per(ReportService.BATCH_SIZE)
+
+        batch = []
+        for project in query:
+            batch.append(project)
+            if len(batch) >= ReportService.BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _append_project_rows(sheet, projects: List[Project]):
+        """
+        写入一批项目及其模块行
+
+        Args:
+            sheet: 只写工作表
+            projects: 项目对象列表
+        """
+        project_ids = [project.id for project in projects]
+        progress_map = ProjectService.calculate_projects_progress(projects)
+
+        # 每个项目取第一位负责人
+        leaders = {}
+        leader_rows = db.session.query(ProjectMember.project_id, User.name)\
+            .join(User, User.id == ProjectMember.user_id)\
+            .filter(ProjectMember.project_id.in_(project_ids), ProjectMember.role == ProjectMemberRole.LEADER)\
+            .order_by(ProjectMember.id)\
+            .all()
+        for project_id, name in leader_rows:
+            leaders.setdefault(project_id, name)
+
+        module_rows = db.session.query(
+            ProjectModule.id, ProjectModule.project_id, ProjectModule.name, ProjectModule.status,
+            ProjectModule.progress, User.name, User.position
+        ).outerjoin(User, User.id == ProjectModule.assigned_to_id)\
+            .filter(ProjectModule.project_id.in_(project_ids))\
+            .order_by(ProjectModule.id)\
+            .all()
+        modules_map = {}
+        for row in module_rows:
+            modules_map.setdefault(row[1], []).append(row)
+
+        recent_works_map = ModuleService._get_recent_works_map([row[0] for row in module_rows], limit=2)
+
+        for project in projects:
+            progress = progress_map[project.id]['progress']
+            # 纵向项目不显示进度
+            if project.project_source == 'vertical' or progress is None:
+                progress_display = '-'
+            else:
+                progress_display = f'{progress}%'
+
+            status = project.status.value if project.status else None
+            sheet.append([
+                project.name,
+                ReportService.PROJECT_STATUS_TEXT.get(status, status),
+                project.partner or '-',
+                ReportService._format_amount(project.contract_amount),
+                ReportService._format_amount(project.received_amount),
+                progress_display,
+                leaders.get(project.id, '未指定'),
+                '=== 项目模块 ===',
+                '', '', '', '', '', '',
+                ReportService._format_date(project.updated_at)
+            ])
+
+            for module_id, _, name, module_status, module_progress, assignee_name, assignee_position \
+                    in modules_map.get(project.id, []):
+                recent_works = recent_works_map.get(module_id, [])
+                module_status = module_status.value if module_status else None
+                sheet.append([
+                    '', '', '', '', '', '', '',
+                    name,
+                    ReportService.MODULE_STATUS_TEXT.get(module_status, module_status),
+                    f'{module_progress}%',
+                    assignee_name or '未分配',
+                    assignee_position or '',
+                    ReportService._format_work(recent_works[1]) if len(recent_works) > 1 else '',
+                    ReportService._format_work(recent_works[0]) if recent_works else '暂无工作记录',
+                    ReportService._format_date(datetime.fromisoformat(recent_works[0]['updated_at'])) if recent_works else ''
+                ])
+
+            # 项目间空行分隔
+            sheet.append([])
+
+    @staticmethod
+    def _format_work(work: Dict[str, Any]) -> str:
+        """格式化工作记录：[周] 内容 + 成果"""
+        week_label = f"[{work['week_label']}]" if work['week_label'] else ''
+        achievements = f"\n成果: {work['achievements']}" if work['achievements'] else ''
+        return f"{week_label} {work['work_content'] or ''}{achievements}"
+
+    @staticmethod
+    def _format_amount(amount) -> str:
+        """格式化金额"""
+        if amount is None:
+            return '-'
+        return f'¥{amount:,.2f}'
+
+    @staticmethod
+    def _format_date(value) -> str:
+        """格式化日期（与前端 zh-CN 日期格式一致）"""
+        if not value:
+            return '未设置'
+        return f'{value.year}/{value.month}/{value.day}'
@@ -0,0 +1,265 @@
+"""
+搜索服务层 - 项目、模块和周工作记录的全文搜索
+遵循DDD分层架构，基于 SQLite FTS5 全文索引 search_index（trigram 分词，适用于中文）
+
+索引由数据库迁移 v7 创建，projects / project_modules / module_work_records 上的触发器负责同步。
+trigram 分词只能匹配不少于3个字符的词，更短的词（如两个汉字）退化为在索引表上做 LIKE 匹配。
+"""
+
+import html
+import re
+from typing import List, Dict, Optional, Any
+from sqlalchemy import Table, Column, Integer, Text, MetaData, select, and_, or_, func, literal_column
+from ..models.database import db, Project, ProjectModule, ModuleWorkRecord
+
+# 全文索引表（虚拟表，不属于 db.metadata，不由 create_all 创建）
+search_index = Table(
+    'search_index', MetaData(),
+    Column('rowid', Integer, primary_key=True),
+    Column('entity_type', Text),
+    Column('entity_id', Integer),
+    Column('project_id', Integer),
+    Column('title', Text),
+    Column('body', Text),
+)
+
+# 高亮标记：先用控制字符标记，HTML 转义后再替换为 <mark>
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+
+class SearchService:
+    """搜索服务类 - 处理全文搜索相关的业务逻辑"""
+
+    ENTITY_TYPES = ('project', 'module', 'work_record')
+
+    # trigram 分词可匹配的最短词长
+    MIN_MATCH_LENGTH = 3
+
+    # 单次搜索最大返回条数
+    MAX_LIMIT = 100
+
+    # 摘要长度（字符）
+    SNIPPET_LENGTH = 32
+
+    @staticmethod
+    def _split_terms(text: str) -> List[str]:
+        """按空白拆分搜索词并去重"""
+        return list(dict.fromkeys(term for term in text.split() if term))
+
+    @staticmethod
+    def _match_condition(text: str):
+        """
+        构造搜索条件：长词走 FTS5 MATCH，短词在标题和内容上做 LIKE 匹配，各词之间为 AND
+
+        Args:
+            text: 搜索文本
+
+        Returns:
+            (SQL条件, 是否使用了MATCH)，没有有效搜索词时条件为 None
+        """
+        terms = SearchService._split_terms(text)
+        if not terms:
+            return None, False
+
+        conditions = []
+        match_terms = [term for term in terms if len(term) >= SearchService.MIN_MATCH_LENGTH]
+        if match_terms:
+            # 每个词作为短语加引号，避免用户输入被解析为 FTS5 查询语法
+            match_query = ' AND '.join('"' + term.replace('"', '""') + '"' for term in match_terms)
+            conditions.append(literal_column('search_index').op('MATCH')(match_query))
+
+        for term in terms:
+            if len(term) < SearchService.MIN_MATCH_LENGTH:
+                pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                conditions.append(or_(
+                    search_index.c.title.like(pattern, escape='\\'),
+                    search_index.c.body.like(pattern, escape='\\')
+                ))
+
+        return and_(*conditions), bool(match_terms)
+
+    @staticmethod
+    def matching_entity_ids(entity_type: str, text: str):
+        """
+        返回匹配搜索文本的实体ID子查询，供列表接口的 search 参数使用
+
+        Args:
+            entity_type: 实体类型 project / module / work_record
+            text: 搜索文本
+
+        Returns:
+            SELECT entity_id 子查询；没有有效搜索词时返回 None
+        """
+        condition, _ = SearchService._match_condition(text)
+        if condition is None:
+            return None
+        return select(search_index.c.entity_id).where(condition, search_index.c.entity_type == entity_type)
+
+    @staticmethod
+    def search(text: str, project_ids: Optional[List[int]] = None, entity_types: Optional[List[str]] = None,
+               limit: int = 20) -> Dict[str, Any]:
+        """
+        全文搜索项目、模块和工作记录
+
+        Args:
+            text: 搜索文本，多个词用空格分隔（AND）
+            project_ids: 可访问的项目ID列表，为None时不限制
+            entity_types: 实体类型过滤，为None时搜索全部类型
+            limit: 最大返回条数
+
+        Returns:
+            搜索结果，按相关度排序，标题和摘要中的匹配部分用 <mark> 标出
+        """
+        try:
+            condition, use_match = SearchService._match_condition(text)
+            if condition is None or project_ids == []:
+                return {
+                    'success': True,
+                    'message': '搜索完成',
+                    'data': []
+                }
+
+            columns = [
+                search_index.c.entity_type, search_index.c.entity_id, search_index.c.project_id,
+                search_index.c.title, search_index.c.body
+            ]
+            if use_match:
+                # 标题权重高于内容；bm25 越小越相关
+                columns += [
+                    func.highlight(literal_column('search_index'), 3, _MARK_START, _MARK_END),
+                    func.snippet(literal_column('search_index'), 4, _MARK_START, _MARK_END, '…',
+                                 SearchService.SNIPPET_LENGTH),
+                    func.bm25(literal_column('search_index'), 0.0, 0.0, 0.0, 10.0, 1.0).label('rank')
+                ]
+
+            query = select(*columns).where(condition)
+            if project_ids is not None:
+                query = query.where(search_index.c.project_id.in_(project_ids))
+            if entity_types:
+                query = query.where(search_index.c.entity_type.in_(entity_types))
+            if use_match:
+                query = query.order_by(literal_column('rank'))
+            else:
+                query = query.order_by(search_index.c.rowid.desc())
+            rows = db.session.execute(query.limit(min(limit, SearchService.MAX_LIMIT))).all()
+
+            short_terms = [
+                term for term in SearchService._split_terms(text)
+                if len(term) < SearchService.MIN_MATCH_LENGTH
+            ]
+            return {
+                'success': True,
+                'message': '搜索完成',
+                'data': SearchService._build_results(rows, use_match, short_terms)
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'搜索失败: {str(e)}',
+                'data': None
+            }
+
+    @staticmethod
+    def _build_results(rows, use_match: bool, short_terms: List[str]) -> List[Dict[str, Any]]:
+        """
+        补充项目、模块名称和工作周，并生成高亮标题和摘要（每种实体一次查询）
+
+        Args:
+            rows: 搜索结果行
+            use_match: 结果行是否带有 highlight / snippet / rank 列
+            short_terms: 需要在 Python 中补充高亮的短词
+
+        Returns:
+            搜索结果列表
+        """
+        work_ids = [row.entity_id for row in rows if row.entity_type == 'work_record']
+        works = {}
+        if work_ids:
+            works = {
+                row.id: row for row in db.session.query(
+                    ModuleWorkRecord.id, ModuleWorkRecord.module_id,
+                    ModuleWorkRecord.week_start, ModuleWorkRecord.week_end
+                ).filter(ModuleWorkRecord.id.in_(work_ids)).all()
+            }
+
+        module_ids = {row.entity_id for row in rows if row.entity_type == 'module'}
+        module_ids.update(work.module_id for work in works.values())
+        module_names = {}
+        if module_ids:
+            module_names = dict(
+                db.session.query(ProjectModule.id, ProjectModule.name)
+                .filter(ProjectModule.id.in_(list(module_ids))).all()
+            )
+
+        project_ids = {row.project_id for row in rows if row.project_id is not None}
+        project_names = {}
+        if project_ids:
+            project_names = dict(
+                db.session.query(Project.id, Project.name).filter(Project.id.in_(list(project_ids))).all()
+            )
+
+        results = []
+        for row in rows:
+            if use_match:
+                title, snippet = row[5], row[6]
+            else:
+                title, snippet = row.title, SearchService._excerpt(row.body, short_terms)
+
+            item = {
+                'type': row.entity_type,
+                'id': row.entity_id,
+                'project_id': row.project_id,
+                'project_name': project_names.get(row.project_id),
+                'module_id': None,
+                'module_name': None,
+                'week_label': None,
+                'title': SearchService._render(title, short_terms),
+                'snippet': SearchService._render(snippet, short_terms),
+                'score': round(-row.rank, 4) if use_match else None
+            }
+
+            if row.entity_type == 'module':
+                item['module_id'] = row.entity_id
+                item['module_name'] = module_names.get(row.entity_id)
+            elif row.entity_type == 'work_record':
+                work = works.get(row.entity_id)
+                if work:
+                    item['module_id'] = work.module_id
+                    item['module_name'] = module_names.get(work.module_id)
+                    item['week_label'] = f"{work.week_start.strftime('%m/%d')} - {work.week_end.strftime('%m/%d')}"
+                    item['title'] = html.escape(f"{item['module_name'] or ''} {item['week_label']}".strip())
+
+            results.append(item)
+
+        return results
+
+    @staticmethod
+    def _excerpt(text: Optional[str], terms: List[str]) -> str:
+        """截取第一个匹配词附近的内容作为摘要（LIKE 匹配时使用）"""
+        text = (text or '').strip()
+        length = SearchService.SNIPPET_LENGTH
+        lowered = text.lower()
+        positions = [lowered.find(term.lower()) for term in terms]
+        positions = [position for position in positions if position >= 0]
+        start = max(min(positions) - length // 4, 0) if positions else 0
+        excerpt = text[start:start + length]
+        return ('…' if start > 0 else '') + excerpt + ('…' if start + length < len(text) else '')
+
+    @staticmethod
+    def _render(text: Optional[str], short_terms: List[str]) -> str:
+        """HTML 转义并把高亮标记替换为 <mark>，短词在这里补充高亮"""
+        text = (text or '').strip()
+        if not text:
+            return ''
+        if short_terms:
+            pattern = re.compile('|'.join(re.escape(term) for term in short_terms), re.IGNORECASE)
+            # 只在已有标记之外补充高亮
+            parts = re.split(f'({_MARK_START}.*?{_MARK_END})', text, flags=re.DOTALL)
+            text = ''.join(
+                part if part.startswith(_MARK_START)
+                else pattern.sub(lambda match: _MARK_START + match.group(0) + _MARK_END, part)
+                for part in parts
+            )
+        return html.escape(text).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
@@ -0,0 +1,237 @@
+"""
+数据同步服务层 - 数据库导出/导入（NDJSON 流式格式）
+遵循DDD分层架构，处理本地与部署环境之间的数据同步
+
+导出格式（每行一个 JSON 对象）：
+    {"format": "project-management-ndjson", "version": 1, "exported_at": "..."}
+    {"table": "users", "data": {...}}
+    {"table": "projects", "data": {...}}
+    ...
+数据表按外键依赖顺序输出，导入时逐行读取，每个表按批次用 executemany 插入，
+全部数据在同一个事务中导入，内存占用只与批次大小有关。
+仍兼容旧版 database_export.json（整个文件为一个 JSON 对象）。
+"""
+
+import json
+from datetime import datetime, date
+from enum import Enum
+from typing import Dict, Any, Iterator, Tuple
+from sqlalchemy import select
+from ..models.database import (
+    db, User, Project, ProjectMember, ProjectModule, ModuleAssignment,
+    ModuleWorkRecord, ModuleProgressRecord, ProgressRecord
+)
+
+NDJSON_FORMAT = 'project-management-ndjson'
+NDJSON_VERSION = 1
+
+# 同步的数据表（按外键依赖顺序）
+SYNC_MODELS = [
+    User, Project, ProjectMember, ProjectModule, ModuleAssignment,
+    ModuleWorkRecord, ModuleProgressRecord, ProgressRecord
+]
+
+# 不导出的缓存字段（导入后重建）
+EXCLUDED_COLUMNS = {
+    Project.__tablename__: {'module_count', 'module_progress_sum', 'computed_progress'}
+}
+
+# 旧版 JSON 的键名和字段名
+LEGACY_TABLE_KEYS = {
+    'modules': ProjectModule.__tablename__,
+    'work_records': ModuleWorkRecord.__tablename__
+}
+LEGACY_COLUMN_ALIASES = {
+    Project.__tablename__: {'amount': 'contract_amount'}
+}
+
+
+class SyncService:
+    """数据同步服务类 - 处理数据库导出导入相关的业务逻辑"""
+
+    # 导出时每次从数据库读取的行数
+    EXPORT_FETCH_SIZE = 1000
+
+    # 导入时每批插入的行数
+    IMPORT_BATCH_SIZE = 1000
+
+    @staticmethod
+    def _tables():
+        """按外键依赖顺序返回 {表名: 表对象}"""
+        return {model.__tablename__: model.__table__ for model in SYNC_MODELS}
+
+    @staticmethod
+    def _export_columns(table):
+        excluded = EXCLUDED_COLUMNS.get(table.name, set())
+        return [column for column in table.columns if column.name not in excluded]
+
+    @staticmethod
+    def _to_json_value(value):
+        """数据库值转为 JSON 值"""
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _converters(table) -> Dict[str, Any]:
+        """按字段类型生成 JSON 值到 Python 值的转换函数"""
+        converters = {}
+        for column in table.columns:
+            column_type = column.type
+            if isinstance(column_type, db.Enum) and column_type.enum_class is not None:
+                converters[column.name] = column_type.enum_class
+            elif isinstance(column_type, db.DateTime):
+                converters[column.name] = datetime.fromisoformat
+            elif isinstance(column_type, db.Date):
+                converters[column.name] = lambda value: date.fromisoformat(value[:10])
+        return converters
+
+    @staticmethod
+    def export_ndjson(output) -> Dict[str, int]:
+        """
+        按表逐批读取并写出 NDJSON
+
+        Args:
+            output: 以文本模式打开的可写文件对象
+
+        Returns:
+            {表名: 导出行数}
+        """
+        counts = {}
+        header = {
+            'format': NDJSON_FORMAT,
+            'version': NDJSON_VERSION,
+            'exported_at': datetime.now().isoformat(timespec='seconds')
+        }
+        output.write(json.dumps(header, ensure_ascii=False) + '\n')
+
+        with db.engine.connect() as connection:
+            for name, table in SyncService._tables().items():
+                columns = SyncService._export_columns(table)
+                result = connection.execution_options(yield_per=SyncService.EXPORT_FETCH_SIZE)\
+                    .execute(select(*columns).order_by(table.c.id))
+                count = 0
+                for row in result:
+                    data = {column.name: SyncService._to_json_value(value) for column, value in zip(columns, row)}
+                    output.write(json.dumps({'table': name, 'data': data}, ensure_ascii=False) + '\n')
+                    count += 1
+                counts[name] = count
+
+        return counts
+
+    @staticmethod
+    def iter_records(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        逐条读取导出文件中的记录，自动识别 NDJSON 和旧版 JSON
+
+        Args:
+            path: 导出文件路径
+
+        Yields:
+            (表名, 记录字典)
+
+        Raises:
+            ValueError: 文件格式不正确
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+            try:
+                header = json.loads(first_line)
+            except json.JSONDecodeError:
+                header = None
+
+            if not (isinstance(header, dict) and header.get('format') == NDJSON_FORMAT):
+                # 旧版格式：整个文件为一个 JSON 对象
+                f.seek(0)
+                data = json.load(f)
+                for key, records in data.items():
+                    name = LEGACY_TABLE_KEYS.get(key, key)
+                    aliases = LEGACY_COLUMN_ALIASES.get(name, {})
+                    for record in records:
+                        yield name, {aliases.get(field, field): value for field, value in record.items()}
+                return
+
+            if header.get('version', 0) > NDJSON_VERSION:
+                raise ValueError(f"不支持的导出文件版本: {header.get('version')}")
+
+            for line_number, line in enumerate(f, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                    yield item['table'], item['data']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    raise ValueError(f'第 {line_number} 行格式错误')
+
+    @staticmethod
+    def import_file(path: str, batch_size: int = None) -> Dict[str, Any]:
+        """
+        清空同步的数据表并从导出文件导入（单个事务，失败时整体回滚）
+
+        Args:
+            path: 导出文件路径
+            batch_size: 每批插入的行数
+
+        Returns:
+            导入结果，data 为 {表名: 导入行数}
+        """
+        batch_size = batch_size or SyncService.IMPORT_BATCH_SIZE
+        tables = SyncService._tables()
+        converters = {name: SyncService._converters(table) for name, table in tables.items()}
+        column_names = {name: set(table.columns.keys()) for name, table in tables.items()}
+        counts = {name: 0 for name in tables}
+
+        try:
+            with db.engine.begin() as connection:
+                # 按外键依赖的逆序清空
+                for table in reversed(list(tables.values())):
+                    connection.execute(table.delete())
+
+                # 同一表、同一组字段的记录攒成一批，用 executemany 插入
+                batch_key, batch = None, []
+
+                def flush():
+                    if batch:
+                        connection.execute(tables[batch_key[0]].insert(), batch)
+                        counts[batch_key[0]] += len(batch)
+                        batch.clear()
+
+                for name, record in SyncService.iter_records(path):
+                    if name not in tables:
+                        continue
+                    table_converters = converters[name]
+                    row = {}
+                    for field, value in record.items():
+                        if field not in column_names[name]:
+                            continue
+                        if value is not None and field in table_converters:
+                            value = table_converters[field](value)
+                        row[field] = value
+
+                    key = (name, frozenset(row))
+                    if key != batch_key or len(batch) >= batch_size:
+                        flush()
+                        batch_key = key
+                    batch.append(row)
+                flush()
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'导入失败，数据库已回滚: {str(e)}',
+                'data': None
+            }
+
+        # 原生SQL写入绕过了会话事件和服务层：重建项目进度缓存并使响应缓存失效
+        from .project_service import ProjectService
+        from ..utils.cache import response_cache
+        ProjectService.rebuild_progress_cache()
+        response_cache.invalidate(*tables.keys())
+
+        return {
+            'success': True,
+            'message': '数据导入成功',
+            'data': counts
+        }
@@ -3,13 +3,40 @@
 遵循DDD分层架构，处理用户管理的核心业务逻辑
 """
 
-from typing import List, Dict, Optional, Any
+import csv
+import io
+import os
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
+from openpyxl import load_workbook
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash
 from ..models.database import db, User, ProjectMember, Project, UserRole, ProjectMemberRole, ModuleAssignment, ProjectModule
+from ..utils.pagination import keyset_paginate, project_fields, wants_field
 from .auth_service import AuthService
 
 class UserService:
     """用户服务类 - 处理用户相关的业务逻辑"""
     
+    # 批量导入的列名（表头支持中文或英文）
+    IMPORT_COLUMNS = {
+        '姓名': 'name', 'name': 'name',
+        '邮箱': 'email', 'email': 'email',
+        '职位': 'position', 'position': 'position',
+        '角色': 'role', 'role': 'role'
+    }
+    
+    # 角色列可以填写中文名称或角色值，留空为普通成员
+    IMPORT_ROLE_TEXT = {
+        '部门主管': UserRole.DEPARTMENT_MANAGER,
+        '普通成员': UserRole.MEMBER,
+        '成员': UserRole.MEMBER
+    }
+    
+    # 单次导入的最大行数
+    IMPORT_MAX_ROWS = 1000
+    
     @staticmethod
     def create_user(user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -57,15 +84,228 @@ class UserService:
             }
     
     @staticmethod
-    def get_user_list(filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _read_import_rows(filename: str, stream) -> List[Tuple[int, Dict[str, str]]]:
+        """
+        读取批量导入文件（CSV 或 Excel），第一行为表头
+        
+        Args:
+            filename: 上传的文件名（按扩展名判断格式）
+            stream: 文件内容
+            
+        Returns:
+            [(行号, {字段: 值})]，跳过空行
+            
+        Raises:
+            ValueError: 文件格式不支持、无法读取、缺少姓名列或行数超过上限
+        """
+        extension = os.path.splitext(filename or '')[1].lower()
+        try:
+            if extension == '.csv':
+                content = stream.read()
+                try:
+                    text = content.decode('utf-8-sig')
+                except UnicodeDecodeError:
+                    # Excel 另存的中文 CSV 通常是 GBK 编码
+                    text = content.decode('gbk')
+                rows = list(csv.reader(io.StringIO(text)))
+            elif extension in ('.xlsx', '.xlsm'):
+                workbook = load_workbook(stream, read_only=True, data_only=True)
+                try:
+                    rows = list(workbook.active.iter_rows(values_only=True))
+                finally:
+                    workbook.close()
+            else:
+                raise ValueError('仅支持 CSV 和 Excel（.xlsx）文件')
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f'无法读取文件: {str(e)}')
+        
+        if not rows:
+            raise ValueError('文件内容为空')
+        
+        def cell_text(value):
+            return '' if value is None else str(value).strip()
+        
+        header = [UserService.IMPORT_COLUMNS.get(cell_text(cell).lower()) for cell in rows[0]]
+        if 'name' not in header:
+            raise ValueError('缺少姓名列（表头应包含：姓名、邮箱、职位、角色）')
+        
+        records = []
+        for row_number, row in enumerate(rows[1:], start=2):
+            record = {}
+            for field, value in zip(header, row):
+                if field and field not in record:
+                    record[field] = cell_text(value)
+            if any(record.values()):
+                records.append((row_number, record))
+        
+        if len(records) > UserService.IMPORT_MAX_ROWS:
+            raise ValueError(f'单次最多导入 {UserService.IMPORT_MAX_ROWS} 个用户')
+        return records
+    
+    @staticmethod
+    def import_users(filename: str, stream) -> Dict[str, Any]:
+        """
+        批量导入用户（CSV 或 Excel）
+        
+        先校验全部行，有错误时不导入任何用户；校验通过后在内存中生成用户名（一次范围查询），
+        初始密码只计算一次哈希，所有用户在同一个事务中插入。
+        
+        Args:
+            filename: 上传的文件名
+            stream: 文件内容
+            
+        Returns:
+            导入结果，成功时包含新用户列表和初始密码，失败时包含每行的错误信息
+        """
+        try:
+            records = UserService._read_import_rows(filename, stream)
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'data': None
+            }
+        
+        if not records:
+            return {
+                'success': False,
+                'message': '文件中没有用户数据',
+                'data': None
+            }
+        
+        try:
+            # 已存在的邮箱一次查出
+            emails = {record['email'] for _, record in records if record.get('email')}
+            existing_emails = {
+                email for (email,) in db.session.query(User.email).filter(User.email.in_(emails)).all()
+            } if emails else set()
+            
+            errors = []
+            seen_emails = set()
+            users = []
+            for row_number, record in records:
+                name = record.get('name', '')
+                email = record.get('email') or None
+                position = record.get('position') or None
+                role_text = record.get('role', '')
+                
+                if not name:
+                    errors.append({'row': row_number, 'message': '姓名不能为空'})
+                    continue
+                if len(name) > 50:
+                    errors.append({'row': row_number, 'message': '姓名不能超过50个字符'})
+                    continue
+                if position and len(position) > 50:
+                    errors.append({'row': row_number, 'message': '职位不能超过50个字符'})
+                    continue
+                if email:
+                    if len(email) > 100:
+                        errors.append({'row': row_number, 'message': '邮箱不能超过100个字符'})
+                        continue
+                    if email in existing_emails:
+                        errors.append({'row': row_number, 'message': f'邮箱已存在: {email}'})
+                        continue
+                    if email in seen_emails:
+                        errors.append({'row': row_number, 'message': f'邮箱在文件中重复: {email}'})
+                        continue
+                    seen_emails.add(email)
+                
+                if not role_text:
+                    role = UserRole.MEMBER
+                elif role_text in UserService.IMPORT_ROLE_TEXT:
+                    role = UserService.IMPORT_ROLE_TEXT[role_text]
+                else:
+                    try:
+                        role = UserRole(role_text.lower())
+                    except ValueError:
+                        errors.append({'row': row_number, 'message': f'无效的角色: {role_text}'})
+                        continue
+                
+                users.append({'name': name, 'email': email, 'position': position, 'role': role})
+            
+            if errors:
+                return {
+                    'success': False,
+                    'message': f'{len(errors)} 行数据有误，未导入任何用户',
+                    'data': {'errors': errors}
+                }
+            
+            # 初始密码相同，只计算一次哈希
+            password = AuthService.DEFAULT_PASSWORD
+            password_hash = generate_password_hash(password)
+            now = datetime.now()
+            usernames = AuthService.generate_usernames([user['name'] for user in users])
+            for user, username in zip(users, usernames):
+                user.update({
+                    'username': username,
+                    'password_hash': password_hash,
+                    'created_at': now,
+                    'updated_at': now
+                })
+            
+            # executemany 一次插入，再按用户名查回ID（SQLite 上带 RETURNING 的批量插入会退化为逐行执行；
+            # render_nulls 保证空邮箱、空职位的行与其他行使用同一条语句）
+            db.session.execute(db.insert(User).execution_options(render_nulls=True), users)
+            user_ids = dict(
+                db.session.query(User.username, User.id).filter(User.username.in_(usernames)).all()
+            )
+            db.session.commit()
+            
+            return {
+                'success': True,
+                'message': f'成功导入 {len(users)} 个用户',
+                'data': {
+                    'count': len(users),
+                    'password': password,
+                    'users': [{
+                        'id': user_ids.get(user['username']),
+                        'name': user['name'],
+                        'username': user['username'],
+                        'email': user['email'],
+                        'position': user['position'],
+                        'role': user['role'].value
+                    } for user in users]
+                }
+            }
+            
+        except IntegrityError as e:
+            db.session.rollback()
+            if 'username' in str(e):
+                message = '用户名已存在（可能有其他用户同时创建），请重新导入'
+            elif 'email' in str(e):
+                message = '邮箱已存在'
+            else:
+                message = '数据完整性错误'
+            return {
+                'success': False,
+                'message': f'导入失败，未导入任何用户: {message}',
+                'data': None
+            }
+        except Exception as e:
+            db.session.rollback()
+            return {
+                'success': False,
+                'message': f'导入失败，未导入任何用户: {str(e)}',
+                'data': None
+            }
+    
+    @staticmethod
+    def get_user_list(filters: Dict[str, Any] = None, include_stats: bool = True, limit: Optional[int] = None,
+                      cursor: Optional[str] = None, fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         获取用户列表
         
         Args:
             filters: 过滤条件字典
+            include_stats: 是否统计参与项目数和负责项目数（下拉选择等场景可关闭）
+            limit: 每页条数，为None时按姓名排序返回全部用户
+            cursor: 上一页返回的游标
+            fields: 字段树（parse_fields），为None时返回全部字段
             
         Returns:
-            用户列表
+            用户列表，分页时附带next_cursor
         """
         try:
             query = User.query
@@ -83,44 +323,40 @@ class UserService:
                         User.position.like(search_term)
                     )
             
-            users = query.order_by(User.name).all()
+            if limit is None:
+                users, next_cursor = query.order_by(User.name).all(), None
+            else:
+                users, next_cursor = keyset_paginate(query, User, limit, cursor)
+            
+            include_stats = include_stats and (
+                wants_field(fields, 'project_count') or wants_field(fields, 'leader_count')
+            )
+            if include_stats:
+                # 分页或过滤时只统计本页用户，统计开销随页大小而不是全表增长
+                page_user_ids = None if limit is None and not filters else [user.id for user in users]
+                project_counts, leader_counts = UserService._get_user_workload_counts(page_user_ids)
             
             # 转换为字典并添加项目参与信息
             user_list = []
             for user in users:
                 user_dict = user.to_dict()
                 
-                # 统计参与项目数量：通过模块参与统计
-                # 1. 找到用户参与的所有模块
-                module_assignments = ModuleAssignment.query.filter_by(user_id=user.id).all()
-                module_ids = [assignment.module_id for assignment in module_assignments]
-                
-                # 2. 找到这些模块对应的项目（去重）
-                if module_ids:
-                    project_ids = db.session.query(ProjectModule.project_id)\
-                        .filter(ProjectModule.id.in_(module_ids))\
-                        .distinct()\
-                        .all()
-                    project_count = len(project_ids)
-                else:
-                    project_count = 0
-                
-                user_dict['project_count'] = project_count
-                
-                # 统计负责项目数量：通过ProjectMember表中的LEADER角色
-                leader_count = ProjectMember.query.filter_by(
-                    user_id=user.id, 
-                    role=ProjectMemberRole.LEADER
-                ).count()
-                user_dict['leader_count'] = leader_count
+                if include_stats:
+                    # 参与项目数量：通过模块参与统计（按项目去重）
+                    user_dict['project_count'] = project_counts.get(user.id, 0)
+                    # 负责项目数量：通过ProjectMember表中的LEADER角色
+                    user_dict['leader_count'] = leader_counts.get(user.id, 0)
                 
                 user_list.append(user_dict)
             
-            return {
+            result = {
                 'success': True,
                 'message': '获取用户列表成功',
-                'data': user_list
+                'data': project_fields(user_list, fields)
             }
+            if limit is not None:
+                result['next_cursor'] = next_cursor
+            return result
             
         except Exception as e:
             return {
@@ -129,6 +365,39 @@ class UserService:
                 'data': []
             }
     
+    @staticmethod
+    def _get_user_workload_counts(user_ids: Optional[List[int]] = None):
+        """
+        使用两次分组查询统计用户的参与项目数和负责项目数
+        
+        Args:
+            user_ids: 只统计这些用户，为None时统计所有用户
+            
+        Returns:
+            tuple: ({用户ID: 参与项目数}, {用户ID: 负责项目数})
+        """
+        if user_ids is not None and not user_ids:
+            return {}, {}
+        
+        project_query = db.session.query(
+            ModuleAssignment.user_id,
+            func.count(func.distinct(ProjectModule.project_id))
+        ).join(ProjectModule, ProjectModule.id == ModuleAssignment.module_id)
+        
+        leader_query = db.session.query(
+            ProjectMember.user_id,
+            func.count(ProjectMember.id)
+        ).filter(ProjectMember.role == ProjectMemberRole.LEADER)
+        
+        if user_ids is not None:
+            project_query = project_query.filter(ModuleAssignment.user_id.in_(user_ids))
+            leader_query = leader_query.filter(ProjectMember.user_id.in_(user_ids))
+        
+        project_rows = project_query.group_by(ModuleAssignment.user_id).all()
+        leader_rows = leader_query.group_by(ProjectMember.user_id).all()
+        
+        return dict(project_rows), dict(leader_rows)
+    
     @staticmethod
     def get_user_detail(user_id: int) -> Dict[str, Any]:
         """
@@ -0,0 +1,61 @@
+"""
+测试夹具 - 每个测试使用临时目录中的独立 SQLite 数据库和新建的应用实例
+"""
+
+import os
+
+# 测试不需要请求日志（需在导入应用之前设置）
+os.environ.setdefault('REQUEST_LOG', 'off')
+
+import pytest
+
+from backend.models.database import db, Project
+from backend.utils.principal import clear_principal_cache
+
+ADMIN_USERNAME = 'admin'
+ADMIN_PASSWORD = 'td123456'
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """空数据库（只有默认管理员）上的应用，响应缓存使用进程内后端"""
+    monkeypatch.setenv('DATABASE_PATH', str(tmp_path / 'test.db'))
+    monkeypatch.setenv('CACHE_BACKEND', 'memory')
+    from backend.app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    # 权限缓存按用户ID保存，各测试的数据库不同，不能沿用上一个测试的结果
+    clear_principal_cache()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    clear_principal_cache()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def login(client, username=ADMIN_USERNAME, password=ADMIN_PASSWORD):
+    """登录并断言成功，返回用户信息"""
+    response = client.post('/api/auth/login', json={'username': username, 'password': password})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()['data']['user']
+
+
+def progress_cache_snapshot():
+    """所有项目的进度缓存字段 {项目ID: (模块数, 模块进度总和, 计算进度)}，直接从数据库读取"""
+    rows = db.session.execute(db.select(
+        Project.id, Project.module_count, Project.module_progress_sum, Project.computed_progress
+    )).all()
+    return {project_id: tuple(values) for project_id, *values in rows}
+
+
+def assert_progress_cache_consistent():
+    """增量维护的项目进度缓存应与 rebuild_progress_cache 全量重算的结果一致"""
+    from backend.services.project_service import ProjectService
+    cached = progress_cache_snapshot()
+    ProjectService.rebuild_progress_cache()
+    assert cached == progress_cache_snapshot()
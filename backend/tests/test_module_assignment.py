@@ -0,0 +1,117 @@
+"""
+模块批量分配用户（PUT /api/modules/<id>/assign-users）按差异增删分配记录
+"""
+
+from sqlalchemy import event
+
+from backend.models.database import db, User, UserRole, ProjectModule, ModuleAssignment
+from backend.services.auth_service import AuthService
+from backend.utils.dataset import generate_dataset
+from backend.tests.conftest import assert_progress_cache_consistent
+
+MISSING_USER_ID = 999999
+
+
+def _setup(app):
+    """生成数据并给一个模块设置初始分配，返回 (模块ID, 初始分配的用户ID, 未分配的用户ID)"""
+    with app.app_context():
+        generate_dataset(users=10, projects=2, modules=6, work_records=0, seed=3)
+        module = ProjectModule.query.order_by(ProjectModule.id).first()
+        ModuleAssignment.query.filter_by(module_id=module.id).delete()
+        member_ids = [user_id for (user_id,) in db.session.query(User.id)
+                      .filter(User.role == UserRole.MEMBER).order_by(User.id).all()]
+        initial_ids, other_ids = member_ids[:3], member_ids[3:]
+        db.session.add_all([
+            ModuleAssignment(module_id=module.id, user_id=initial_ids[0], role='member'),
+            ModuleAssignment(module_id=module.id, user_id=initial_ids[1], role='leader'),
+            ModuleAssignment(module_id=module.id, user_id=initial_ids[2], role='member'),
+        ])
+        db.session.commit()
+        return module.id, initial_ids, other_ids
+
+
+def _assignments(module_id):
+    """{用户ID: (分配ID, 角色, 分配时间)}"""
+    rows = db.session.query(
+        ModuleAssignment.user_id, ModuleAssignment.id, ModuleAssignment.role, ModuleAssignment.assigned_at
+    ).filter(ModuleAssignment.module_id == module_id).all()
+    return {user_id: (assignment_id, role, assigned_at) for user_id, assignment_id, role, assigned_at in rows}
+
+
+def test_assignment_diff_keeps_unchanged_rows(app, client):
+    module_id, initial_ids, other_ids = _setup(app)
+    with app.app_context():
+        before = _assignments(module_id)
+
+    # 保留 initial_ids[1]（角色改回 member），删除 0 和 2，新增两人；重复和不存在的ID被忽略
+    requested = [MISSING_USER_ID, initial_ids[1], other_ids[0], initial_ids[1], other_ids[1]]
+    response = client.put(f'/api/modules/{module_id}/assign-users', json={'user_ids': requested})
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    with app.app_context():
+        after = _assignments(module_id)
+        assert set(after) == {initial_ids[1], other_ids[0], other_ids[1]}
+        kept_id, kept_role, kept_at = after[initial_ids[1]]
+        assert (kept_id, kept_at) == (before[initial_ids[1]][0], before[initial_ids[1]][2])
+        assert kept_role == 'member'
+        assert all(role == 'member' for _, role, _ in after.values())
+        # 第一个有效用户作为模块负责人
+        assert db.session.get(ProjectModule, module_id).assigned_to_id == initial_ids[1]
+        assert_progress_cache_consistent()
+
+
+def test_assignment_diff_statement_count_does_not_grow_with_team(app, client):
+    module_id, initial_ids, other_ids = _setup(app)
+    with app.app_context():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split(None, 1)[0].upper())
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = client.put(f'/api/modules/{module_id}/assign-users',
+                                  json={'user_ids': [initial_ids[0]] + other_ids})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    # 删除两条、新增多条分配记录，各只执行一条语句
+    assert statements.count('DELETE') == 1
+    assert statements.count('INSERT') == 1
+    with app.app_context():
+        assert set(_assignments(module_id)) == {initial_ids[0], *other_ids}
+
+
+def test_assignment_change_updates_module_permission(app, client):
+    module_id, initial_ids, other_ids = _setup(app)
+    with app.app_context():
+        project_id = db.session.get(ProjectModule, module_id).project_id
+        newcomer = next(
+            user for user in User.query.filter(User.id.in_(other_ids)).order_by(User.id).all()
+            if any(member.project_id == project_id and member.role.name == 'MEMBER'
+                   for member in user.project_memberships)
+        )
+        assert not AuthService.has_module_permission(newcomer, module_id, 'update_module')
+
+    response = client.put(f'/api/modules/{module_id}/assign-users', json={'user_ids': [newcomer.id]})
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    # 分配变化后缓存的权限数据随表版本失效
+    with app.app_context():
+        newcomer = db.session.get(User, newcomer.id)
+        assert AuthService.has_module_permission(newcomer, module_id, 'update_module')
+
+
+def test_empty_assignment_removes_all(app, client):
+    module_id, initial_ids, _ = _setup(app)
+    with app.app_context():
+        assigned_to_id = db.session.get(ProjectModule, module_id).assigned_to_id
+
+    response = client.put(f'/api/modules/{module_id}/assign-users', json={'user_ids': []})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    with app.app_context():
+        assert _assignments(module_id) == {}
+        assert db.session.get(ProjectModule, module_id).assigned_to_id == assigned_to_id
+
+    assert client.put('/api/modules/999999/assign-users', json={'user_ids': initial_ids}).status_code == 400
@@ -0,0 +1,111 @@
+"""
+批量更新模块进度接口（PUT /api/modules/progress:batch）
+"""
+
+from backend.models.database import (
+    db, User, ProjectMember, ProjectMemberRole, ProjectModule, ModuleProgressRecord
+)
+from backend.utils.dataset import generate_dataset
+from backend.tests.conftest import login, assert_progress_cache_consistent, progress_cache_snapshot
+
+MEMBER_PASSWORD = 'td-test'
+MISSING_MODULE_ID = 999999
+
+
+def _setup(app):
+    """生成数据，返回 (项目负责人用户名, 其负责项目的模块ID, 其他项目的模块ID)"""
+    with app.app_context():
+        generate_dataset(users=8, projects=3, modules=18, work_records=0, seed=5, password=MEMBER_PASSWORD)
+        leader = ProjectMember.query.filter_by(role=ProjectMemberRole.LEADER)\
+            .order_by(ProjectMember.project_id).first()
+        own_ids = [module_id for (module_id,) in db.session.query(ProjectModule.id)
+                   .filter(ProjectModule.project_id == leader.project_id).order_by(ProjectModule.id).all()]
+        member_project_ids = db.session.query(ProjectMember.project_id).filter_by(user_id=leader.user_id)
+        other_ids = [module_id for (module_id,) in db.session.query(ProjectModule.id)
+                     .filter(ProjectModule.project_id.notin_(member_project_ids)).order_by(ProjectModule.id).all()]
+        assert own_ids and other_ids
+        return db.session.get(User, leader.user_id).username, own_ids, other_ids
+
+
+def _batch(client, updates):
+    return client.put('/api/modules/progress:batch', json={'updates': updates})
+
+
+def test_batch_update_across_projects_keeps_progress_cache(app, client):
+    _, own_ids, other_ids = _setup(app)
+    login(client)
+
+    module_ids = own_ids[:3] + other_ids[:3]
+    updates = [{'module_id': module_id, 'progress': progress}
+               for module_id, progress in zip(module_ids, (0, 45, 100, 10, 100, 73))]
+    with app.app_context():
+        records_before = ModuleProgressRecord.query.count()
+
+    response = _batch(client, updates)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert [module['id'] for module in response.get_json()['data']] == module_ids
+
+    with app.app_context():
+        for item in updates:
+            module = db.session.get(ProjectModule, item['module_id'])
+            assert module.progress == item['progress']
+        assert module.status.name == 'IN_PROGRESS'
+        assert db.session.get(ProjectModule, own_ids[0]).status.name == 'NOT_STARTED'
+        assert db.session.get(ProjectModule, own_ids[2]).status.name == 'COMPLETED'
+        assert ModuleProgressRecord.query.count() == records_before + len(updates)
+        assert_progress_cache_consistent()
+
+
+def test_missing_module_is_rejected_before_permission_check(app, client):
+    leader_username, own_ids, other_ids = _setup(app)
+    with app.app_context():
+        before = progress_cache_snapshot()
+
+    # 部门主管与普通成员对不存在的模块得到相同的状态码和消息
+    login(client)
+    manager_response = _batch(client, [{'module_id': own_ids[0], 'progress': 50},
+                                       {'module_id': MISSING_MODULE_ID, 'progress': 50}])
+
+    login(client, leader_username, MEMBER_PASSWORD)
+    member_response = _batch(client, [{'module_id': other_ids[0], 'progress': 50},
+                                      {'module_id': MISSING_MODULE_ID, 'progress': 50}])
+
+    assert manager_response.status_code == member_response.status_code == 400
+    assert manager_response.get_json()['message'] == member_response.get_json()['message'] \
+        == f'模块不存在: {MISSING_MODULE_ID}'
+
+    # 存在但无权限的模块仍返回 403，整批不写入
+    forbidden_response = _batch(client, [{'module_id': own_ids[0], 'progress': 50},
+                                         {'module_id': other_ids[0], 'progress': 50}])
+    assert forbidden_response.status_code == 403
+
+    with app.app_context():
+        assert progress_cache_snapshot() == before
+        assert_progress_cache_consistent()
+
+
+def test_project_leader_updates_own_modules(app, client):
+    leader_username, own_ids, _ = _setup(app)
+    login(client, leader_username, MEMBER_PASSWORD)
+
+    response = _batch(client, [{'module_id': module_id, 'progress': 100} for module_id in own_ids])
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    with app.app_context():
+        project = db.session.get(ProjectModule, own_ids[0]).project
+        assert project.module_progress_sum == 100 * project.module_count
+        assert project.progress == 100
+        assert_progress_cache_consistent()
+
+
+def test_invalid_payload_is_rejected(app, client):
+    _, own_ids, _ = _setup(app)
+    login(client)
+
+    assert _batch(client, []).status_code == 400
+    assert _batch(client, [{'module_id': own_ids[0], 'progress': 101}]).status_code == 400
+    assert _batch(client, [{'module_id': own_ids[0], 'progress': True}]).status_code == 400
+    assert _batch(client, [{'module_id': own_ids[0], 'progress': 10},
+                           {'module_id': own_ids[0], 'progress': 20}]).status_code == 400
+    with app.app_context():
+        assert ModuleProgressRecord.query.count() == 0
@@ -0,0 +1,92 @@
+"""
+列表接口的游标分页：updated_at 为空或没有微秒部分的记录也不会被跳过或重复
+"""
+
+from datetime import datetime
+
+import pytest
+
+from backend.models.database import db
+from backend.utils.dataset import generate_dataset
+from backend.tests.conftest import login, assert_progress_cache_consistent
+
+# 原生SQL写入的时间格式各不相同：无微秒、补零微秒、同一毫秒内的不同微秒、空值
+RAW_UPDATED_AT = [
+    '2026-03-01 09:00:00',
+    '2026-03-01 09:00:00.000000',
+    '2026-03-01 09:00:00.000400',
+    '2026-03-01 09:00:00',
+    None,
+    None,
+    '2026-03-01 09:00:01',
+    '2026-02-28 23:59:59.999999',
+    None,
+]
+
+
+def _mix_updated_at(table):
+    """给表中前若干行写入不同格式的 updated_at（绕过 ORM），返回 {id: updated_at}"""
+    ids = [row_id for (row_id,) in db.session.execute(db.text(f'SELECT id FROM {table} ORDER BY id')).all()]
+    for row_id, value in zip(ids, RAW_UPDATED_AT):
+        db.session.execute(db.text(f'UPDATE {table} SET updated_at = :value WHERE id = :id'),
+                           {'value': value, 'id': row_id})
+    db.session.commit()
+    return dict(db.session.execute(db.text(f'SELECT id, updated_at FROM {table}')).all())
+
+
+def _expected_order(updated_at):
+    """按毫秒精度的更新时间降序、ID降序，空值排在最后"""
+    def key(item):
+        row_id, value = item
+        if value is None:
+            return (1, 0, -row_id)
+        moment = datetime.fromisoformat(value)
+        moment = moment.replace(microsecond=moment.microsecond // 1000 * 1000)
+        return (0, -moment.timestamp(), -row_id)
+    return [row_id for row_id, _ in sorted(updated_at.items(), key=key)]
+
+
+def _collect_pages(client, url, limit):
+    """沿 next_cursor 取完所有页"""
+    ids, cursor = [], None
+    while True:
+        params = {'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get(url, query_string=params)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        body = response.get_json()
+        ids.extend(item['id'] for item in body['data'])
+        cursor = body.get('next_cursor')
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize('limit', [1, 2, 4, 7])
+def test_project_pages_are_stable_with_mixed_timestamps(app, client, limit):
+    with app.app_context():
+        generate_dataset(users=6, projects=12, modules=24, work_records=0, seed=8)
+        expected = _expected_order(_mix_updated_at('projects'))
+    login(client)
+
+    assert _collect_pages(client, '/api/projects', limit) == expected
+    assert _collect_pages(client, '/api/modules/overview', limit) == expected
+
+    with app.app_context():
+        assert_progress_cache_consistent()
+
+
+def test_user_pages_are_stable_with_mixed_timestamps(app, client):
+    with app.app_context():
+        generate_dataset(users=11, projects=2, modules=4, work_records=0, seed=8)
+        expected = _expected_order(_mix_updated_at('users'))
+    login(client)
+
+    for limit in (1, 3, 5):
+        assert _collect_pages(client, '/api/users', limit) == expected
+
+
+def test_invalid_cursor_is_rejected(app, client):
+    login(client)
+    assert client.get('/api/projects', query_string={'limit': 2, 'cursor': 'not-a-cursor'}).status_code == 400
+    assert client.get('/api/projects', query_string={'limit': 0}).status_code == 400
@@ -0,0 +1,97 @@
+"""
+权限快照（Principal）与原逐次查询权限规则的一致性
+
+参考实现按原 AuthService 的查询逻辑编写（原代码中负责人模块的 join 缺少 ON 条件、
+module.assigned_users 并不存在，这里分别改为按 project_id 关联和查询 ModuleAssignment）。
+"""
+
+from backend.models.database import (
+    db, User, UserRole, Project, ProjectMember, ProjectMemberRole, ProjectModule, ModuleAssignment
+)
+from backend.services.auth_service import AuthService
+from backend.utils.dataset import generate_dataset
+
+PERMISSIONS = ('update_module', 'delete_module', 'view_module', 'unknown')
+
+
+def baseline_get_user_modules(user, project_id=None):
+    if user.role == UserRole.DEPARTMENT_MANAGER:
+        query = ProjectModule.query
+        if project_id:
+            query = query.filter_by(project_id=project_id)
+        return {module.id for module in query.all()}
+
+    leader_modules = ProjectModule.query.join(
+        ProjectMember, ProjectMember.project_id == ProjectModule.project_id
+    ).filter(ProjectMember.user_id == user.id, ProjectMember.role == ProjectMemberRole.LEADER)
+    assigned_modules = ProjectModule.query.filter_by(assigned_to_id=user.id)
+    if project_id:
+        leader_modules = leader_modules.filter(ProjectModule.project_id == project_id)
+        assigned_modules = assigned_modules.filter_by(project_id=project_id)
+    return {module.id for module in leader_modules.all()} | {module.id for module in assigned_modules.all()}
+
+
+def baseline_has_module_permission(user, module_id, permission):
+    if user.role == UserRole.DEPARTMENT_MANAGER:
+        return True
+
+    module = db.session.get(ProjectModule, module_id)
+    if not module:
+        return False
+    project_member = ProjectMember.query.filter_by(user_id=user.id, project_id=module.project_id).first()
+    if not project_member:
+        return False
+
+    if permission == 'update_module':
+        if project_member.role == ProjectMemberRole.LEADER:
+            return True
+        return ModuleAssignment.query.filter_by(module_id=module_id, user_id=user.id).first() is not None
+    elif permission == 'delete_module':
+        return project_member.role == ProjectMemberRole.LEADER
+    elif permission == 'view_module':
+        return True
+    return False
+
+
+def _build_fixture():
+    generate_dataset(users=10, projects=5, modules=25, work_records=0, seed=11)
+
+    project = Project.query.order_by(Project.id).first()
+    member_ids = {member.user_id for member in project.members}
+    plain_member = next(
+        member.user_id for member in project.members if member.role == ProjectMemberRole.MEMBER
+    )
+    outsider = User.query.filter(User.id.notin_(member_ids), User.role == UserRole.MEMBER).first()
+    modules = ProjectModule.query.filter_by(project_id=project.id).order_by(ProjectModule.id).all()
+    assert len(modules) >= 3 and outsider is not None
+
+    # 模块负责人不是项目成员：可出现在其模块列表中，但没有更新权限
+    modules[0].assigned_to_id = outsider.id
+    # 通过模块分配分到、但不是模块负责人：有更新权限，不在模块列表中
+    ModuleAssignment.query.filter_by(module_id=modules[1].id, user_id=plain_member).delete()
+    modules[1].assigned_to_id = None
+    db.session.add(ModuleAssignment(module_id=modules[1].id, user_id=plain_member, role='member'))
+    # 是模块负责人、但没有模块分配：在模块列表中，没有更新权限
+    ModuleAssignment.query.filter_by(module_id=modules[2].id, user_id=plain_member).delete()
+    modules[2].assigned_to_id = plain_member
+    db.session.commit()
+
+
+def test_principal_matches_baseline_permission_rules(app):
+    with app.app_context():
+        _build_fixture()
+        users = User.query.order_by(User.id).all()
+        module_ids = [module_id for (module_id,) in db.session.query(ProjectModule.id).all()] + [999999]
+        project_ids = [project_id for (project_id,) in db.session.query(Project.id).all()]
+
+        for user in users:
+            for module_id in module_ids:
+                for permission in PERMISSIONS:
+                    assert AuthService.has_module_permission(user, module_id, permission) == \
+                        baseline_has_module_permission(user, module_id, permission), \
+                        (user.username, module_id, permission)
+
+            assert set(AuthService.get_user_modules(user)) == baseline_get_user_modules(user), user.username
+            for project_id in project_ids:
+                assert set(AuthService.get_user_modules(user, project_id)) == \
+                    baseline_get_user_modules(user, project_id), (user.username, project_id)
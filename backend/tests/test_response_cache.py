@@ -0,0 +1,135 @@
+"""
+响应缓存：JSON 存储、按提交写入的数据表失效（包括 Core 批量语句）
+"""
+
+import sqlite3
+
+from backend.models.database import db, Project, ProjectModule, ModuleAssignment
+from backend.services.module_service import ModuleService
+from backend.services.project_service import ProjectService
+from backend.utils.cache import ResponseCache, response_cache, _default_cache_path
+from backend.utils.dataset import generate_dataset
+from backend.tests.conftest import assert_progress_cache_consistent
+
+TABLES = ('projects', 'project_modules', 'module_assignments', 'module_progress_records', 'module_work_records')
+
+
+def _versions():
+    return dict(zip(TABLES, response_cache.get_versions(TABLES)))
+
+
+def _bumped(before):
+    after = _versions()
+    return {table for table in TABLES if after[table] != before[table]}
+
+
+def test_core_statements_invalidate_tables_on_commit(app):
+    with app.app_context():
+        generate_dataset(users=6, projects=3, modules=9, work_records=10, seed=4)
+
+        # Core UPDATE executemany（rebuild_progress_cache 不经 ORM flush 写回缓存字段）
+        before = _versions()
+        ProjectService.rebuild_progress_cache()
+        assert _bumped(before) == {'projects'}
+
+        # Core INSERT executemany
+        module_id, project_id = db.session.query(ProjectModule.id, ProjectModule.project_id)\
+            .order_by(ProjectModule.id).first()
+        before = _versions()
+        ModuleAssignment.query.filter_by(module_id=module_id).delete()
+        db.session.execute(db.insert(ModuleAssignment), [
+            {'module_id': module_id, 'user_id': 1, 'role': 'member'}
+        ])
+        assert _bumped(before) == set()  # 提交前不失效
+        db.session.commit()
+        assert _bumped(before) == {'module_assignments'}
+
+        # 回滚的写入不失效
+        before = _versions()
+        db.session.execute(Project.__table__.update().values(module_count=0))
+        db.session.rollback()
+        assert _bumped(before) == set()
+
+        # 集合式 DELETE（同时维护项目进度缓存）
+        before = _versions()
+        project = db.session.get(Project, project_id)
+        progress_sum = db.session.query(db.func.sum(ProjectModule.progress))\
+            .filter(ProjectModule.id == module_id).scalar() or 0
+        ModuleService.delete_module_rows([module_id])
+        ProjectService.apply_module_stats_delta(project, -1, -progress_sum)
+        db.session.commit()
+        assert _bumped(before) == set(TABLES)
+        assert_progress_cache_consistent()
+
+
+def test_overview_reflects_core_updates(app, client):
+    with app.app_context():
+        generate_dataset(users=6, projects=8, modules=24, work_records=0, seed=9)
+
+    original = client.get('/api/projects/overview').get_json()['data']
+    assert client.get('/api/projects/overview').get_json()['data'] == original
+
+    # 直接用 Core 语句改写进度缓存字段，提交后总览不再返回旧的缓存结果
+    with app.app_context():
+        table = Project.__table__
+        db.session.execute(table.update().values(
+            module_progress_sum=table.c.module_count * 100, updated_at=table.c.updated_at
+        ))
+        db.session.commit()
+    assert client.get('/api/projects/overview').get_json()['data'] != original
+
+    # 重算后与原结果一致
+    with app.app_context():
+        ProjectService.rebuild_progress_cache()
+        assert_progress_cache_consistent()
+    assert client.get('/api/projects/overview').get_json()['data'] == original
+
+
+def test_sqlite_backend_stores_json(tmp_path):
+    cache = ResponseCache()
+    cache.configure(backend='sqlite', ttl=60, path=str(tmp_path / 'cache.db'))
+    calls = []
+
+    @cache.cached('sample', tables=('projects',))
+    def sample(value):
+        calls.append(value)
+        return {'success': True, 'data': {'name': value, 'items': [1, 2]}}
+
+    assert sample('项目') == sample('项目') == {'success': True, 'data': {'name': '项目', 'items': [1, 2]}}
+    assert calls == ['项目']
+
+    connection = sqlite3.connect(str(tmp_path / 'cache.db'))
+    (stored,) = connection.execute('SELECT value FROM cache_entries').fetchone()
+    assert stored == '{"success":true,"data":{"name":"项目","items":[1,2]}}'
+
+    # 缓存内容损坏时回退到直接调用
+    connection.execute("UPDATE cache_entries SET value = 'not json'")
+    connection.commit()
+    connection.close()
+    assert sample('项目')['data']['name'] == '项目'
+    assert calls == ['项目', '项目']
+
+    # 表版本号变化后重新计算
+    cache.invalidate('projects')
+    sample('项目')
+    assert len(calls) == 3
+
+
+def test_unserializable_results_are_not_cached(tmp_path):
+    cache = ResponseCache()
+    cache.configure(backend='memory', ttl=60)
+    calls = []
+
+    @cache.cached('sample', tables=('projects',))
+    def sample():
+        calls.append(1)
+        return {'success': True, 'data': {1, 2}}
+
+    assert sample() == sample() == {'success': True, 'data': {1, 2}}
+    assert len(calls) == 2
+
+
+def test_default_cache_path_is_next_to_database(app, tmp_path):
+    assert _default_cache_path(app) == str(tmp_path / 'test.cache.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    assert _default_cache_path(app) is None
@@ -0,0 +1,118 @@
+"""
+全文搜索：触发器维护 search_index，长词走 FTS5 MATCH，短词退化为 LIKE
+"""
+
+from datetime import date
+
+from backend.models.database import db, ModuleWorkRecord
+from backend.utils.dataset import generate_dataset
+from backend.tests.conftest import login, assert_progress_cache_consistent
+
+
+def _search(client, text, **params):
+    response = client.get('/api/search', query_string={'q': text, **params})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return [(item['type'], item['id']) for item in response.get_json()['data']]
+
+
+def _create_project(client, name, description):
+    response = client.post('/api/projects', json={
+        'name': name, 'description': description, 'status': 'contract_signed'
+    })
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()['data']['id']
+
+
+def _create_module(client, project_id, name, description=''):
+    response = client.post(f'/api/modules/projects/{project_id}', json={'name': name, 'description': description})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()['data']['id']
+
+
+def test_triggers_keep_search_index_in_sync(app, client):
+    admin = login(client)
+    project_id = _create_project(client, '智慧水务平台', '管网监测与漏损分析')
+    module_id = _create_module(client, project_id, '漏损分析引擎', '夜间最小流量算法')
+    with app.app_context():
+        work = ModuleWorkRecord(module_id=module_id, week_start=date(2026, 10, 12), week_end=date(2026, 10, 18),
+                                work_content='完成压力传感器接入调试', created_by_id=admin['id'])
+        db.session.add(work)
+        db.session.commit()
+        work_id = work.id
+
+    # 插入
+    assert set(_search(client, '漏损分析')) == {('module', module_id), ('project', project_id)}
+    assert _search(client, '压力传感器') == [('work_record', work_id)]
+    assert _search(client, '漏损分析', types='module') == [('module', module_id)]
+
+    # 更新：旧内容不再命中，新内容命中
+    response = client.put(f'/api/projects/{project_id}', json={'name': '城市供水平台', 'description': '管网监测'})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    response = client.put(f'/api/modules/work-records/{work_id}', json={
+        'week_start': '2026-10-12', 'week_end': '2026-10-18', 'work_content': '完成流量计标定'
+    })
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert _search(client, '漏损分析') == [('module', module_id)]
+    assert _search(client, '城市供水') == [('project', project_id)]
+    assert _search(client, '压力传感器') == []
+    assert _search(client, '流量计标定') == [('work_record', work_id)]
+
+    # 删除模块：模块及其工作记录都从索引中移除
+    assert client.delete(f'/api/modules/{module_id}').status_code == 200
+    assert _search(client, '漏损分析') == []
+    assert _search(client, '流量计标定') == []
+
+    with app.app_context():
+        assert_progress_cache_consistent()
+
+
+def test_short_terms_fall_back_to_like(app, client):
+    login(client)
+    project_id = _create_project(client, '数据中台', '指标口径 100% 对齐')
+    module_id = _create_module(client, project_id, '报表导出', 'CSV_和Excel')
+    _create_module(client, project_id, '权限管理', '角色配置')
+
+    # 两个字的词不满足 trigram 的最短长度，用 LIKE 匹配并补充高亮
+    response = client.get('/api/search', query_string={'q': '中台'})
+    items = response.get_json()['data']
+    assert [(item['type'], item['id']) for item in items] == [('project', project_id)]
+    assert items[0]['title'] == '数据<mark>中台</mark>'
+    assert items[0]['score'] is None
+
+    # LIKE 通配符按字面匹配
+    assert _search(client, '%') == [('project', project_id)]
+    assert _search(client, 'V_') == [('module', module_id)]
+    assert _search(client, '_') == [('module', module_id)]
+
+    # 长词和短词混合时同时满足（AND）
+    assert _search(client, '报表导出 CSV') == [('module', module_id)]
+    assert _search(client, '报表导出 角色') == []
+
+    # 项目列表的 search 参数使用同一套条件
+    response = client.get('/api/projects', query_string={'search': '中台'})
+    assert [project['id'] for project in response.get_json()['data']] == [project_id]
+
+    with app.app_context():
+        assert_progress_cache_consistent()
+
+
+def test_generated_dataset_rebuilds_index_and_restores_triggers(app, client):
+    with app.app_context():
+        generate_dataset(users=5, projects=3, modules=9, work_records=20, seed=7)
+        indexed = dict(db.session.execute(db.text(
+            'SELECT entity_type, COUNT(*) FROM search_index GROUP BY entity_type'
+        )).all())
+        assert indexed == {
+            'project': db.session.execute(db.text('SELECT COUNT(*) FROM projects')).scalar(),
+            'module': db.session.execute(db.text('SELECT COUNT(*) FROM project_modules')).scalar(),
+            'work_record': db.session.execute(db.text('SELECT COUNT(*) FROM module_work_records')).scalar(),
+        }
+        triggers = {name for (name,) in db.session.execute(db.text(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_search_%'"
+        )).all()}
+        assert len(triggers) == 9
+        assert_progress_cache_consistent()
+
+    login(client)
+    project_id = _create_project(client, '生成后新建的项目', '')
+    assert _search(client, '生成后新建') == [('project', project_id)]
@@ -0,0 +1,119 @@
+"""
+批量导入用户（POST /api/users/import）与用户名分配
+"""
+
+import io
+
+from openpyxl import Workbook
+
+from backend.models.database import db, User, UserRole
+from backend.services.auth_service import AuthService
+from backend.utils.dataset import generate_dataset
+from backend.tests.conftest import login, assert_progress_cache_consistent
+
+
+def _upload(client, filename, content):
+    return client.post('/api/users/import', data={'file': (io.BytesIO(content), filename)},
+                       content_type='multipart/form-data')
+
+
+def _add_users(*usernames):
+    db.session.add_all([
+        User(name=username, username=username, password_hash='x', role=UserRole.MEMBER) for username in usernames
+    ])
+    db.session.commit()
+
+
+def test_import_utf8_csv_allocates_usernames(app, client):
+    with app.app_context():
+        generate_dataset(users=5, projects=2, modules=6, work_records=0, seed=2)
+        _add_users('li', 'li1', 'li3', 'lia')
+    login(client)
+
+    csv_text = '姓名,邮箱,职位,角色\n李,li@example.com,工程师,\n李,,,普通成员\n张三,,,部门主管\n张三,,,member\n,,,\n'
+    response = _upload(client, 'users.csv', csv_text.encode('utf-8-sig'))
+    assert response.status_code == 201, response.get_data(as_text=True)
+    data = response.get_json()['data']
+
+    assert data['count'] == 4
+    assert [user['username'] for user in data['users']] == ['li2', 'li4', 'zhangsan', 'zhangsan1']
+    assert [user['role'] for user in data['users']] == ['member', 'member', 'department_manager', 'member']
+    assert data['users'][0]['email'] == 'li@example.com' and data['users'][1]['email'] is None
+
+    with app.app_context():
+        for user in data['users']:
+            assert db.session.get(User, user['id']).username == user['username']
+        assert_progress_cache_consistent()
+
+    # 导入的用户可以用初始密码登录
+    login(client, 'li2', data['password'])
+
+
+def test_import_gbk_csv_and_xlsx(app, client):
+    login(client)
+
+    csv_text = 'name,email,position,role\n王五,wangwu@example.com,测试,成员\n'
+    response = _upload(client, 'users.csv', csv_text.encode('gbk'))
+    assert response.status_code == 201, response.get_data(as_text=True)
+    assert response.get_json()['data']['users'][0]['username'] == 'wangwu'
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['姓名', '邮箱', '职位'])
+    sheet.append(['王五', 'wangwu2@example.com', None])
+    sheet.append([None, None, None])
+    sheet.append(['赵六', None, '产品经理'])
+    content = io.BytesIO()
+    workbook.save(content)
+    response = _upload(client, 'users.xlsx', content.getvalue())
+    assert response.status_code == 201, response.get_data(as_text=True)
+    users = response.get_json()['data']['users']
+    assert [(user['username'], user['position']) for user in users] == [('wangwu1', None), ('zhaoliu', '产品经理')]
+
+
+def test_import_rejects_invalid_rows_without_inserting(app, client):
+    with app.app_context():
+        db.session.add(User(name='已有', username='yiyou', email='taken@example.com',
+                            password_hash='x', role=UserRole.MEMBER))
+        db.session.commit()
+        user_count = User.query.count()
+    login(client)
+
+    csv_text = (
+        '姓名,邮箱,角色\n'
+        '甲,taken@example.com,\n'
+        ',nobody@example.com,\n'
+        '乙,same@example.com,\n'
+        '丙,same@example.com,\n'
+        '丁,,管理员\n'
+        '戊,,\n'
+    )
+    response = _upload(client, 'users.csv', csv_text.encode('utf-8'))
+    assert response.status_code == 400
+    errors = response.get_json()['data']['errors']
+    assert [error['row'] for error in errors] == [2, 3, 5, 6]
+
+    assert _upload(client, 'users.txt', b'name\nx\n').status_code == 400
+    assert _upload(client, 'users.csv', b'email\na@example.com\n').status_code == 400
+    assert _upload(client, 'users.xlsx', b'not a workbook').status_code == 400
+
+    with app.app_context():
+        assert User.query.count() == user_count
+
+
+def test_import_requires_manager(app, client):
+    with app.app_context():
+        member, password = AuthService.create_user('成员甲')
+        username = member.username
+    login(client, username, password)
+    assert _upload(client, 'users.csv', '姓名\n乙\n'.encode('utf-8')).status_code == 403
+
+
+def test_generate_usernames_across_prefix_batches(app, monkeypatch):
+    # 每条查询只含两个前缀，覆盖跨批次查询已占用的用户名
+    monkeypatch.setattr(AuthService, 'USERNAME_PREFIX_BATCH', 2)
+    with app.app_context():
+        _add_users('wang', 'wang2', 'zhou', 'chen1', 'li')
+        names = ['王', '王', '周', '陈', '陈', '李', '王']
+        assert AuthService.generate_usernames(names) == ['wang1', 'wang3', 'zhou1', 'chen', 'chen2', 'li1', 'wang4']
+        assert AuthService.generate_username('周') == 'zhou1'
@@ -0,0 +1,337 @@
+"""
+响应缓存 - 总览类接口的服务端缓存
+
+缓存键包含所依赖数据表的版本号；通过 SQLAlchemy 会话事件收集每次提交写入的数据表，
+提交成功后递增这些表的版本号，旧的缓存项随之失效，最终由 LRU/TTL 淘汰。
+缓存值以 JSON 文本保存（不使用 pickle：缓存文件被篡改时不会执行任意代码），被缓存的结果必须可以 JSON 序列化。
+
+存储后端可插拔：
+    memory - 进程内 LRU（默认），多个 gunicorn worker 之间不共享
+    sqlite - 本地 SQLite 文件，同一台机器上的多个 worker 共享缓存项和表版本号
+
+环境变量：
+    CACHE_BACKEND      memory / sqlite / none
+    CACHE_PATH         sqlite 后端的缓存文件路径，默认在数据库文件旁边（<数据库文件名>.cache.db）
+    CACHE_TTL          缓存有效期（秒），默认 60
+    CACHE_MAX_ENTRIES  最大缓存条目数，默认 256
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, object_mapper
+
+# 会话中待失效数据表集合的存放键
+_DIRTY_TABLES_KEY = 'response_cache_dirty_tables'
+
+# 每次启动递增的版本键，使重启前（含离线导入）生成的缓存键和 ETag 失效
+STARTUP_VERSION_KEY = '__startup__'
+
+
+class MemoryCacheBackend:
+    """进程内缓存后端 - 带条目上限的 LRU，线程安全"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, tables):
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump_versions(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """本地文件缓存后端 - 同机多进程共享，超过上限时淘汰最早写入的条目"""
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self):
+        # 连接按线程保存；fork 后的子进程需要重新连接
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, created_at REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_versions ('
+            'name TEXT PRIMARY KEY, version INTEGER NOT NULL)'
+        )
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND expires_at >= ?',
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)',
+                (key, value, now + ttl, now)
+            )
+            conn.execute('DELETE FROM cache_entries WHERE expires_at < ?', (now,))
+            conn.execute(
+                'DELETE FROM cache_entries WHERE key IN ('
+                'SELECT key FROM cache_entries ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def get_versions(self, tables):
+        rows = self._connect().execute(
+            f'SELECT name, version FROM cache_versions WHERE name IN ({",".join("?" * len(tables))})',
+            tuple(tables)
+        ).fetchall()
+        versions = dict(rows)
+        return tuple(versions.get(table, 0) for table in tables)
+
+    def bump_versions(self, tables):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO cache_versions (name, version) VALUES (?, 1) '
+                'ON CONFLICT(name) DO UPDATE SET version = version + 1',
+                [(table,) for table in tables]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        self._connect().execute('DELETE FROM cache_entries')
+
+
+class ResponseCache:
+    """服务层结果缓存 - 以函数名、参数和依赖表版本号作为缓存键"""
+
+    def __init__(self):
+        self.backend = None
+        self.backend_name = None
+        self.ttl = 60
+        self.enabled = True
+        self._configured = False
+
+    def configure(self, backend=None, ttl=None, path=None, max_entries=None):
+        """
+        配置缓存后端，未传的参数从环境变量读取
+
+        Args:
+            backend (str): memory / sqlite / none
+            ttl (int): 缓存有效期（秒）
+            path (str): sqlite 后端的缓存文件路径，默认为 CACHE_PATH 或私有临时目录中的文件
+            max_entries (int): 最大缓存条目数
+        """
+        backend = backend or os.environ.get('CACHE_BACKEND', 'memory')
+        self.ttl = int(ttl if ttl is not None else os.environ.get('CACHE_TTL', 60))
+        max_entries = int(max_entries if max_entries is not None else os.environ.get('CACHE_MAX_ENTRIES', 256))
+
+        self.backend_name = backend
+        self.enabled = backend != 'none'
+        if backend == 'sqlite':
+            # 不使用公共临时目录中的固定文件名，避免其他本地用户预先创建或修改缓存文件
+            path = path or os.environ.get('CACHE_PATH') or os.path.join(
+                tempfile.mkdtemp(prefix='project_management_cache-'), 'cache.db'
+            )
+            self.backend = SQLiteCacheBackend(path, max_entries)
+        else:
+            self.backend = MemoryCacheBackend(max_entries)
+        self._configured = True
+
+    def _get_backend(self):
+        if not self._configured:
+            self.configure()
+        return self.backend
+
+    def get_versions(self, tables):
+        """获取数据表当前版本号"""
+        return self._get_backend().get_versions(tuple(tables))
+
+    def invalidate(self, *tables):
+        """立即递增数据表版本号（用于会话事件覆盖不到的原生SQL写入）"""
+        if tables:
+            self._get_backend().bump_versions(tuple(sorted(set(tables))))
+
+    def clear(self):
+        """清空缓存条目"""
+        self._get_backend().clear()
+
+    def cached(self, name, tables):
+        """
+        缓存服务方法返回值的装饰器，返回 success=False 或不能 JSON 序列化的结果不缓存
+
+        Args:
+            name (str): 缓存名称
+            tables (tuple): 结果所依赖的数据表名
+        """
+        tables = tuple(tables)
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                backend = self._get_backend()
+                if not self.enabled:
+                    return func(*args, **kwargs)
+
+                # 先读取版本号再查询数据库，并发写入时最多缓存到更新的数据
+                try:
+                    versions = backend.get_versions(tables)
+                    raw_key = repr((name, args, sorted(kwargs.items()), versions))
+                    key = f'{name}:{hashlib.sha1(raw_key.encode("utf-8")).hexdigest()}'
+                    cached_value = backend.get(key)
+                    if cached_value is not None:
+                        return json.loads(cached_value)
+                except Exception:
+                    return func(*args, **kwargs)
+
+                result = func(*args, **kwargs)
+                if not (isinstance(result, dict) and result.get('success') is False):
+                    try:
+                        backend.set(key, json.dumps(result, ensure_ascii=False, separators=(',', ':')), self.ttl)
+                    except Exception:
+                        pass
+                return result
+
+            return wrapper
+
+        return decorator
+
+
+response_cache = ResponseCache()
+
+
+def _dirty_tables(session):
+    return session.info.setdefault(_DIRTY_TABLES_KEY, set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    """记录本次 flush 写入的数据表"""
+    tables = _dirty_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tables.add(object_mapper(obj).local_table.name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_tables(orm_execute_state):
+    """记录批量 insert/update/delete 语句写入的数据表"""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        mapper = state.bind_mapper
+        if mapper is not None:
+            _dirty_tables(state.session).add(mapper.local_table.name)
+        else:
+            # Core 语句（如 Table.update()）没有映射类，直接取语句的目标表
+            table = getattr(state.statement, 'table', None)
+            if table is not None:
+                _dirty_tables(state.session).add(table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_tables(session):
+    """提交成功后使相关数据表的缓存失效"""
+    tables = session.info.pop(_DIRTY_TABLES_KEY, None)
+    if tables:
+        try:
+            response_cache.invalidate(*tables)
+        except Exception:
+            # 缓存失效失败时清空缓存，避免返回过期数据
+            try:
+                response_cache.clear()
+            except Exception:
+                pass
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_tables(session):
+    """回滚后丢弃已收集的数据表"""
+    session.info.pop(_DIRTY_TABLES_KEY, None)
+
+
+def _default_cache_path(app):
+    """sqlite 后端的默认缓存文件：应用数据库文件旁边的 <数据库文件名>.cache.db（内存数据库时返回None）"""
+    database = make_url(app.config['SQLALCHEMY_DATABASE_URI']).database
+    if not database or database == ':memory:':
+        return None
+    return os.path.splitext(os.path.abspath(database))[0] + '.cache.db'
+
+
+def init_response_cache(app):
+    """
+    根据应用配置初始化响应缓存
+
+    Args:
+        app: Flask应用实例
+    """
+    response_cache.configure(
+        backend=app.config.get('CACHE_BACKEND'),
+        ttl=app.config.get('CACHE_TTL'),
+        path=app.config.get('CACHE_PATH') or os.environ.get('CACHE_PATH') or _default_cache_path(app),
+        max_entries=app.config.get('CACHE_MAX_ENTRIES')
+    )
+    # 共享缓存文件可能保留着上次运行（或离线导入前）的数据，启动时清空
+    response_cache.clear()
+    response_cache.invalidate(STARTUP_VERSION_KEY)
+    print(f"🗄️ 响应缓存: {response_cache.backend_name} (TTL {response_cache.ttl}s)")
@@ -0,0 +1,365 @@
+"""
+测试数据生成 - 按指定规模生成确定性的模拟数据库，用于压力测试和性能回归
+
+相同的规模参数、随机种子和基准日期生成完全相同的数据（ID、文本、日期、进度均一致），
+性能测试结果可以在同一份 "large" 数据上复现。所有数据在一个事务中用 executemany 分批插入
+（期间暂停全文索引触发器，最后一次性重建索引），时间字段由基准日期推算，不依赖生成时的当前时间。
+
+预设规模见 DATASET_PRESETS，命令行入口见 backend/generate_dataset.py。
+"""
+
+import random
+from datetime import date, datetime, time, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from ..models.database import (
+    db, User, Project, ProjectMember, ProjectModule, ModuleAssignment, ModuleWorkRecord,
+    ModuleProgressRecord, ProgressRecord, UserRole, ProjectStatus, ModuleStatus, ProjectMemberRole
+)
+from ..models.migrations import drop_search_triggers, rebuild_search_index, create_search_triggers
+
+# 预设规模：用户数、项目数、模块总数、周工作记录总数、模块进度历史总数、项目进度历史总数
+DATASET_PRESETS = {
+    'sample': dict(users=5, projects=3, modules=9, work_records=12, module_progress_records=9, progress_records=3),
+    'small': dict(users=20, projects=200, modules=2000, work_records=20000,
+                  module_progress_records=6000, progress_records=400),
+    'medium': dict(users=50, projects=1000, modules=10000, work_records=100000,
+                   module_progress_records=30000, progress_records=2000),
+    'large': dict(users=200, projects=5000, modules=50000, work_records=500000,
+                  module_progress_records=150000, progress_records=10000),
+}
+
+DEFAULT_SEED = 20240101
+DEFAULT_PASSWORD = '123456'
+
+# 每批插入的行数
+INSERT_BATCH_SIZE = 5000
+
+# 生成的数据表（按外键依赖顺序）
+DATASET_MODELS = [
+    User, Project, ProjectMember, ProjectModule, ModuleAssignment,
+    ModuleWorkRecord, ModuleProgressRecord, ProgressRecord
+]
+
+SURNAMES = '王李张刘陈杨赵黄周吴徐孙胡朱高林何郭马罗梁宋郑谢韩唐冯于董萧'
+GIVEN_NAMES = ['伟', '芳', '娜', '敏', '静', '磊', '洋', '勇', '军', '杰', '涛', '明', '超', '强', '平',
+               '秀英', '建华', '志强', '海燕', '晓东', '国庆', '文博', '思远', '雨桐', '子涵']
+POSITIONS = ['软件工程师', '硬件工程师', '算法工程师', '测试工程师', '项目经理', '电气工程师',
+             '机械工程师', '产品经理', '实施工程师', '技术总监']
+
+PROJECT_PREFIXES = ['智慧', '数字化', '自动化', '智能', '一体化', '可视化']
+PROJECT_DOMAINS = ['园区', '产线', '仓储', '能源', '质检', '物流', '设备运维', '安全监测', '称重', '探伤', '巡检', '配料']
+PROJECT_SUFFIXES = ['管理平台', '改造项目', '系统开发', '升级项目', '试验平台', '集成项目']
+PROJECT_PHASES = ['', '', '一期', '二期', '三期']
+PARTNERS = ['华东钢铁', '中冶设备', '宏达机械', '恒信电力', '远景物流', '金桥化工', '天成铝业', '鑫源矿业']
+
+MODULE_NAMES = ['需求分析', '方案设计', '硬件选型', '软件开发', '现场安装', '系统联调', '数据采集', '算法开发',
+                '测试验收', '培训交付', '文档编写', '前端开发', '后端开发', '部署上线', '设备通信', '报表统计']
+
+WORK_ACTIONS = ['完成了', '推进了', '优化了', '联调了', '评审了', '测试了', '修复了', '部署了']
+WORK_OBJECTS = ['接口设计', '数据库表结构', '前端页面', '数据采集程序', '设备通信协议', '报表功能',
+                '权限管理', '视觉检测算法', '现场调试', '用户手册', '异常报警', '历史数据查询']
+WORK_ISSUES = ['现场网络不稳定，需要协调甲方处理', '部分设备接口文档缺失', '测试数据不足',
+               '需求有变更，需要重新评估工作量', '硬件到货延迟']
+
+HORIZONTAL_STATUSES = [
+    ProjectStatus.INITIAL_CONTACT, ProjectStatus.PROPOSAL_SUBMITTED, ProjectStatus.QUOTATION_SUBMITTED,
+    ProjectStatus.USER_CONFIRMATION, ProjectStatus.CONTRACT_SIGNED, ProjectStatus.PROJECT_IMPLEMENTATION,
+    ProjectStatus.PROJECT_ACCEPTANCE, ProjectStatus.WARRANTY_PERIOD, ProjectStatus.POST_WARRANTY,
+    ProjectStatus.NO_FOLLOW_UP
+]
+HORIZONTAL_STATUS_WEIGHTS = [5, 5, 5, 5, 10, 35, 10, 10, 5, 10]
+VERTICAL_STATUSES = [
+    ProjectStatus.VERTICAL_DECLARATION, ProjectStatus.VERTICAL_REVIEW,
+    ProjectStatus.VERTICAL_APPROVED, ProjectStatus.VERTICAL_REJECTED
+]
+PROJECT_SOURCES = ['horizontal', 'vertical', 'self_developed']
+PROJECT_SOURCE_WEIGHTS = [60, 25, 15]
+
+
+def _insert_rows(connection, model, rows):
+    """按批次插入行（rows 可以是生成器），返回插入行数"""
+    table = model.__table__
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            connection.execute(table.insert(), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        connection.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def _split(total, parts, rng):
+    """把 total 随机分配到 parts 份（每份至少为0），结果之和等于 total"""
+    if parts <= 0:
+        return []
+    weights = [rng.random() + 0.5 for _ in range(parts)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for index in rng.sample(range(parts), min(total - sum(counts), parts)):
+        counts[index] += 1
+    return counts
+
+
+def _next_id(connection, model):
+    table = model.__table__
+    return (connection.execute(db.select(db.func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _at(day, rng, hour_from=9, hour_to=18):
+    """某天工作时间内的随机时刻"""
+    return datetime.combine(day, time(rng.randrange(hour_from, hour_to), rng.randrange(60), rng.randrange(60)))
+
+
+def clear_dataset(connection):
+    """删除业务数据，只保留部门主管账号"""
+    for model in reversed(DATASET_MODELS[1:]):
+        connection.execute(model.__table__.delete())
+    users = User.__table__
+    connection.execute(users.delete().where(users.c.role != UserRole.DEPARTMENT_MANAGER))
+
+
+def generate_dataset(users, projects, modules, work_records, module_progress_records=0, progress_records=0,
+                     seed=DEFAULT_SEED, anchor_date=None, password=DEFAULT_PASSWORD, reset=False):
+    """
+    生成模拟数据（单个事务），完成后重建项目进度缓存并使响应缓存失效
+
+    Args:
+        users: 普通成员数量
+        projects: 项目数量
+        modules: 模块总数（随机分配到各项目）
+        work_records: 周工作记录总数（每个模块连续若干周）
+        module_progress_records: 模块进度历史记录总数
+        progress_records: 项目进度历史记录总数
+        seed: 随机种子
+        anchor_date: 基准日期（默认本周一），工作周和时间字段都由它推算
+        password: 所有生成用户的密码（只计算一次哈希）
+        reset: 是否先删除现有业务数据（保留部门主管账号）
+
+    Returns:
+        dict: {表名: 插入行数}
+
+    Raises:
+        ValueError: 数据库中已有业务数据且未指定 reset
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    anchor = anchor_date or today - timedelta(days=today.weekday())
+    anchor = anchor - timedelta(days=anchor.weekday())
+    counts = {}
+
+    with db.engine.begin() as connection:
+        if not reset and connection.execute(db.select(db.func.count()).select_from(Project.__table__)).scalar():
+            raise ValueError('数据库中已有项目数据，请使用 reset 清空后再生成')
+
+        # 逐行同步全文索引的触发器是批量写入的主要开销：先删除，写完后一次性重建索引
+        has_search_index = drop_search_triggers(connection)
+        if reset:
+            clear_dataset(connection)
+
+        # 用户（所有用户共用一个密码哈希）
+        password_hash = generate_password_hash(password)
+        first_user_id = _next_id(connection, User)
+        user_ids = list(range(first_user_id, first_user_id + users))
+
+        def user_rows():
+            for user_id in user_ids:
+                created_at = _at(anchor - timedelta(days=rng.randrange(400, 800)), rng)
+                yield {
+                    'id': user_id,
+                    'name': rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES),
+                    'username': f'user{user_id:05d}',
+                    'password_hash': password_hash,
+                    'email': f'user{user_id:05d}@example.com',
+                    'position': rng.choice(POSITIONS),
+                    'role': UserRole.MEMBER,
+                    'created_at': created_at,
+                    'updated_at': created_at
+                }
+        counts[User.__tablename__] = _insert_rows(connection, User, user_rows())
+
+        # 项目及项目成员
+        first_project_id = _next_id(connection, Project)
+        project_infos = []
+        project_rows = []
+        member_rows = []
+        for project_id in range(first_project_id, first_project_id + projects):
+            source = rng.choices(PROJECT_SOURCES, PROJECT_SOURCE_WEIGHTS)[0]
+            if source == 'vertical':
+                status = rng.choice(VERTICAL_STATUSES)
+            else:
+                status = rng.choices(HORIZONTAL_STATUSES, HORIZONTAL_STATUS_WEIGHTS)[0]
+            start_date = anchor - timedelta(days=rng.randrange(30, 720))
+            end_date = start_date + timedelta(days=rng.randrange(90, 540))
+            created_at = _at(start_date - timedelta(days=rng.randrange(0, 30)), rng)
+            contract_amount = None
+            received_amount = None
+            if source == 'horizontal' and rng.random() < 0.8:
+                contract_amount = rng.randrange(5, 500) * 1.0
+                received_amount = round(contract_amount * rng.choice([0, 0, 0.3, 0.5, 0.7, 1.0]), 2)
+
+            partner = rng.choice(PARTNERS) if source == 'horizontal' else None
+            name = rng.choice(PROJECT_PREFIXES) + rng.choice(PROJECT_DOMAINS) + rng.choice(PROJECT_SUFFIXES)
+            phase = rng.choice(PROJECT_PHASES)
+            project_rows.append({
+                'id': project_id,
+                'name': (partner or '') + name + phase,
+                'description': f"{name}，主要包括{'、'.join(rng.sample(WORK_OBJECTS, 3))}等内容。",
+                'start_date': start_date,
+                'end_date': end_date,
+                'status': status,
+                'progress': 0,
+                'project_source': source,
+                'partner': partner,
+                'contract_amount': contract_amount,
+                'received_amount': received_amount,
+                'created_at': created_at,
+                'updated_at': created_at
+            })
+
+            member_ids = rng.sample(user_ids, min(len(user_ids), rng.randrange(2, 7))) if user_ids else []
+            for index, user_id in enumerate(member_ids):
+                member_rows.append({
+                    'project_id': project_id,
+                    'user_id': user_id,
+                    'role': ProjectMemberRole.LEADER if index == 0 else ProjectMemberRole.MEMBER,
+                    'joined_at': created_at
+                })
+            project_infos.append((project_id, start_date, member_ids))
+
+        counts[Project.__tablename__] = _insert_rows(connection, Project, project_rows)
+        counts[ProjectMember.__tablename__] = _insert_rows(connection, ProjectMember, member_rows)
+        del project_rows, member_rows
+
+        # 模块及模块分配：负责人和成员从项目成员中选取
+        first_module_id = _next_id(connection, ProjectModule)
+        module_infos = []
+        module_rows = []
+        assignment_rows = []
+        module_id = first_module_id
+        for (project_id, start_date, member_ids), module_count in zip(
+                project_infos, _split(modules, len(project_infos), rng)):
+            names = rng.sample(MODULE_NAMES, min(module_count, len(MODULE_NAMES)))
+            names += [f'{rng.choice(MODULE_NAMES)}{index + 2}' for index in range(module_count - len(names))]
+            for name in names:
+                progress = rng.choice([0, 0, 100, 100] + list(range(5, 100, 5)))
+                if progress == 0:
+                    status = ModuleStatus.NOT_STARTED
+                elif progress == 100:
+                    status = ModuleStatus.COMPLETED
+                else:
+                    status = ModuleStatus.PAUSED if rng.random() < 0.1 else ModuleStatus.IN_PROGRESS
+                assignee_ids = rng.sample(member_ids, min(len(member_ids), rng.randrange(1, 4)))
+                module_start = start_date + timedelta(days=rng.randrange(0, 60))
+                created_at = _at(module_start, rng)
+                module_rows.append({
+                    'id': module_id,
+                    'project_id': project_id,
+                    'name': name,
+                    'description': f'{name}：{rng.choice(WORK_OBJECTS)}和{rng.choice(WORK_OBJECTS)}',
+                    'assigned_to_id': assignee_ids[0] if assignee_ids else None,
+                    'progress': progress,
+                    'priority': rng.randrange(1, 6),
+                    'start_date': module_start,
+                    'end_date': module_start + timedelta(days=rng.randrange(30, 180)),
+                    'status': status,
+                    'created_at': created_at,
+                    'updated_at': created_at
+                })
+                for user_id in assignee_ids:
+                    assignment_rows.append({
+                        'module_id': module_id, 'user_id': user_id, 'role': 'member', 'assigned_at': created_at
+                    })
+                module_infos.append((module_id, name, progress, assignee_ids[0] if assignee_ids else None))
+                module_id += 1
+
+        counts[ProjectModule.__tablename__] = _insert_rows(connection, ProjectModule, module_rows)
+        counts[ModuleAssignment.__tablename__] = _insert_rows(connection, ModuleAssignment, assignment_rows)
+        del module_rows, assignment_rows
+
+        # 周工作记录：每个模块从最近工作的一周向前连续若干周
+        work_counts = _split(work_records, len(module_infos), rng)
+
+        def work_rows():
+            for (current_id, name, _, assignee_id), count in zip(module_infos, work_counts):
+                if assignee_id is None:
+                    continue
+                # 约六成模块本周有工作记录
+                last_week = anchor if rng.random() < 0.6 else anchor - timedelta(weeks=rng.randrange(1, 9))
+                for offset in range(count):
+                    week_start = last_week - timedelta(weeks=offset)
+                    created_at = _at(week_start + timedelta(days=4), rng, 14, 19)
+                    actions = rng.sample(WORK_ACTIONS, 2)
+                    objects = rng.sample(WORK_OBJECTS, 2)
+                    yield {
+                        'module_id': current_id,
+                        'week_start': week_start,
+                        'week_end': week_start + timedelta(days=6),
+                        'work_content': f'{name}：{actions[0]}{objects[0]}，{actions[1]}{objects[1]}。',
+                        'achievements': f'{objects[0]}完成{rng.randrange(10, 101, 10)}%',
+                        'issues': rng.choice(WORK_ISSUES) if rng.random() < 0.2 else None,
+                        'next_week_plan': f'继续推进{rng.choice(WORK_OBJECTS)}',
+                        'created_by_id': assignee_id,
+                        'created_at': created_at,
+                        'updated_at': created_at
+                    }
+        counts[ModuleWorkRecord.__tablename__] = _insert_rows(connection, ModuleWorkRecord, work_rows())
+
+        # 模块的更新时间取最近一条工作记录的时间
+        connection.exec_driver_sql("""
+            UPDATE project_modules SET updated_at = (
+                SELECT MAX(created_at) FROM module_work_records WHERE module_id = project_modules.id
+            )
+            WHERE id >= ? AND EXISTS (SELECT 1 FROM module_work_records WHERE module_id = project_modules.id)
+        """, (first_module_id,))
+
+        # 模块进度历史：进度逐步增长到当前进度
+        def module_progress_rows():
+            for (current_id, _, progress, assignee_id), count in zip(
+                    module_infos, _split(module_progress_records, len(module_infos), rng)):
+                if assignee_id is None:
+                    continue
+                for index in range(count):
+                    yield {
+                        'module_id': current_id,
+                        'progress': progress * (index + 1) // count,
+                        'notes': None,
+                        'updated_by_id': assignee_id,
+                        'updated_at': _at(anchor - timedelta(weeks=count - index - 1, days=rng.randrange(0, 5)), rng)
+                    }
+        counts[ModuleProgressRecord.__tablename__] = _insert_rows(
+            connection, ModuleProgressRecord, module_progress_rows()
+        )
+
+        # 项目进度历史（由项目负责人填写）
+        def progress_rows():
+            for (project_id, _, member_ids), count in zip(project_infos, _split(progress_records, len(project_infos), rng)):
+                if not member_ids:
+                    continue
+                for index in range(count):
+                    yield {
+                        'project_id': project_id,
+                        'progress': 100 * (index + 1) // (count + 1),
+                        'notes': f'第{index + 1}次进度更新',
+                        'updated_by_id': member_ids[0],
+                        'updated_at': _at(anchor - timedelta(weeks=2 * (count - index)), rng)
+                    }
+        counts[ProgressRecord.__tablename__] = _insert_rows(connection, ProgressRecord, progress_rows())
+
+        if has_search_index:
+            rebuild_search_index(connection)
+            create_search_triggers(connection)
+
+    # 原生SQL写入绕过了会话事件和服务层：重建项目进度缓存并使响应缓存失效
+    from ..services.project_service import ProjectService
+    from .cache import response_cache
+    ProjectService.rebuild_progress_cache()
+    response_cache.invalidate(*(model.__tablename__ for model in DATASET_MODELS))
+
+    return counts
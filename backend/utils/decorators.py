@@ -3,8 +3,8 @@
 """
 from functools import wraps
 from flask import session, jsonify, request
-from ..models.database import User
 from ..services.auth_service import AuthService
+from .principal import get_principal, get_current_user
 
 def login_required(f):
     """
@@ -19,16 +19,18 @@ def login_required(f):
                 'message': '请先登录'
             }), 401
         
-        user = User.query.get(user_id)
-        if not user:
+        # 用户及其权限数据走请求级/进程级缓存
+        principal = get_principal(user_id)
+        if not principal:
             session.clear()
             return jsonify({
                 'success': False,
                 'message': '用户不存在'
             }), 401
         
-        # 将当前用户添加到请求上下文
-        request.current_user = user
+        # 将当前用户添加到请求上下文（嵌套装饰器只解析一次）
+        if getattr(request, 'current_user', None) is None or request.current_user.id != user_id:
+            request.current_user = get_current_user(principal)
         return f(*args, **kwargs)
     
     return decorated_function
@@ -0,0 +1,91 @@
+"""
+ETag 条件请求 - 为 GET JSON 接口生成强 ETag，数据未变化时返回 304
+
+ETag 由所有数据表的版本号（见 utils/cache.py）、请求路径和参数、当前登录用户
+以及当天日期（本周工作等接口依赖日期）计算得出，不需要先执行视图函数。
+命中 If-None-Match 时在 before_request 阶段直接返回 304，跳过服务层查询和序列化。
+
+注意：memory / none 缓存后端的表版本号只在单个进程内有效，多 worker 部署必须使用
+sqlite 后端（CACHE_BACKEND=sqlite），否则其他 worker 的写入不会改变本进程的 ETag
+（gunicorn.conf.py 在这种配置下拒绝启动）。
+"""
+
+import hashlib
+import uuid
+from datetime import date
+
+from flask import g, request, session
+
+from .cache import response_cache, STARTUP_VERSION_KEY
+
+# memory 后端的版本号从进程启动时开始计数，需要区分不同进程
+# （preload_app 时 worker 由主进程 fork，需在 fork 后调用 reset_process_token 重新生成）
+_PROCESS_TOKEN = uuid.uuid4().hex
+
+
+def reset_process_token():
+    """重新生成进程标识（gunicorn post_fork 中调用，重启的 worker 不会与旧 worker 的 ETag 重复）"""
+    global _PROCESS_TOKEN
+    _PROCESS_TOKEN = uuid.uuid4().hex
+
+
+def _compute_etag(tables):
+    """
+    计算当前请求的 ETag
+
+    Args:
+        tables (tuple): 参与计算的数据表名
+
+    Returns:
+        str: ETag 值（不含引号）
+    """
+    versions = response_cache.get_versions(tables)
+    process_token = _PROCESS_TOKEN if response_cache.backend_name != 'sqlite' else ''
+    raw = repr((
+        process_token,
+        versions,
+        request.full_path,
+        session.get('user_id'),
+        date.today().isoformat()
+    ))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def init_etag(app, db):
+    """
+    为 /api/ 下的 GET JSON 接口注册 ETag 处理
+
+    Args:
+        app: Flask应用实例
+        db: SQLAlchemy 实例，用于获取全部数据表名
+    """
+    tables = tuple(table.name for table in db.metadata.sorted_tables) + (STARTUP_VERSION_KEY,)
+
+    @app.before_request
+    def _check_if_none_match():
+        if request.method != 'GET' or not request.path.startswith('/api/'):
+            return None
+
+        # 在执行视图之前取版本号，避免并发写入时给旧数据配上新的 ETag
+        try:
+            g.etag = _compute_etag(tables)
+        except Exception:
+            return None
+
+        if request.if_none_match and request.if_none_match.contains(g.etag):
+            response = app.response_class(status=304)
+            response.set_etag(g.etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return None
+
+    @app.after_request
+    def _set_etag(response):
+        etag = g.pop('etag', None)
+        if etag is None or response.status_code != 200 or response.mimetype != 'application/json':
+            return response
+
+        response.set_etag(etag)
+        # 浏览器每次都带 If-None-Match 重新验证
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,201 @@
+"""
+分页与字段裁剪工具 - 列表接口的游标分页(updated_at, id)和 fields= 字段投影
+"""
+
+import base64
+import json
+from sqlalchemy import and_, or_, desc
+
+from ..models.database import datetime_sort_key
+
+# 单页最大条数
+MAX_PAGE_LIMIT = 200
+
+
+def parse_list_args(args):
+    """
+    解析列表接口的分页和字段参数
+
+    Args:
+        args: request.args
+
+    Returns:
+        tuple: (limit, cursor, fields)，未传 limit 时为 None（不分页）
+
+    Raises:
+        ValueError: 参数不合法
+    """
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError('limit 必须是正整数')
+        if limit <= 0:
+            raise ValueError('limit 必须是正整数')
+        limit = min(limit, MAX_PAGE_LIMIT)
+
+    cursor = args.get('cursor') or None
+    if cursor is not None:
+        decode_cursor(cursor)
+
+    fields = parse_fields(args.get('fields'))
+    return limit, cursor, fields
+
+
+def encode_cursor(sort_key, record_id):
+    """
+    将 (排序键, id) 编码为不透明游标
+
+    Args:
+        sort_key (str): 最后一条记录的更新时间排序键
+        record_id (int): 最后一条记录的ID
+
+    Returns:
+        str: URL 安全的游标字符串
+    """
+    payload = json.dumps([sort_key, record_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    解码游标
+
+    Args:
+        cursor (str): encode_cursor 生成的游标
+
+    Returns:
+        tuple: (排序键, id)
+
+    Raises:
+        ValueError: 游标格式不正确
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_key, record_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if sort_key is not None and not isinstance(sort_key, str):
+            raise ValueError
+        return sort_key, int(record_id)
+    except Exception:
+        raise ValueError('无效的分页游标')
+
+
+def updated_at_sort_key(model):
+    """
+    更新时间的排序键：统一为毫秒精度文本
+
+    迁移脚本用原生SQL写入的时间（如 CURRENT_TIMESTAMP）没有微秒部分，
+    与ORM写入的格式不同，直接比较文本会让游标跳过或重复记录。
+    排序表达式与模型上的 ix_*_updated_sort 表达式索引一致，分页查询可直接按索引顺序扫描。
+
+    Args:
+        model: 含 updated_at 列的模型
+
+    Returns:
+        SQL表达式
+    """
+    return datetime_sort_key(model.updated_at)
+
+
+def keyset_paginate(query, model, limit=None, cursor=None):
+    """
+    按 updated_at 降序、id 降序执行游标分页查询
+
+    Args:
+        query: 已应用过滤条件的查询
+        model: 含 updated_at 和 id 列的模型
+        limit (int): 每页条数，为 None 时返回全部记录
+        cursor (str): 上一页返回的 next_cursor
+
+    Returns:
+        tuple: (记录列表, next_cursor)，没有下一页时 next_cursor 为 None
+    """
+    sort_key = updated_at_sort_key(model)
+    query = query.add_columns(sort_key).order_by(desc(sort_key), desc(model.id))
+
+    if cursor:
+        last_key, last_id = decode_cursor(cursor)
+        if last_key is None:
+            # SQLite 降序时 NULL 排在最后
+            query = query.filter(sort_key.is_(None), model.id < last_id)
+        else:
+            query = query.filter(or_(
+                sort_key < last_key,
+                and_(sort_key == last_key, model.id < last_id),
+                sort_key.is_(None)
+            ))
+
+    if limit is None:
+        return [row[0] for row in query.all()], None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return [row[0] for row in rows], None
+
+    rows = rows[:limit]
+    last, last_key = rows[-1]
+    return [row[0] for row in rows], encode_cursor(last_key, last.id)
+
+
+def parse_fields(fields):
+    """
+    解析 fields= 参数为字段树，支持 modules.name 这样的嵌套字段
+
+    Args:
+        fields (str): 逗号分隔的字段列表
+
+    Returns:
+        dict: {字段: 子字段树或None}，未指定时返回 None（返回全部字段）
+    """
+    if not fields:
+        return None
+
+    tree = {}
+    for field in fields.split(','):
+        parts = [part.strip() for part in field.split('.') if part.strip()]
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                break
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree or None
+
+
+def wants_field(fields, name):
+    """
+    判断字段树是否需要某个字段，用于跳过不需要的关联查询
+
+    Args:
+        fields (dict): parse_fields 返回的字段树
+        name (str): 顶层字段名
+
+    Returns:
+        bool: 需要该字段返回True
+    """
+    return fields is None or name in fields
+
+
+def project_fields(data, fields):
+    """
+    按字段树裁剪字典或字典列表
+
+    Args:
+        data: 字典、字典列表或其他值
+        fields (dict): parse_fields 返回的字段树
+
+    Returns:
+        裁剪后的数据
+    """
+    if fields is None:
+        return data
+    if isinstance(data, list):
+        return [project_fields(item, fields) for item in data]
+    if isinstance(data, dict):
+        return {key: project_fields(data[key], sub) for key, sub in fields.items() if key in data}
+    return data
@@ -0,0 +1,171 @@
+"""
+当前用户（Principal）缓存 - 登录用户、角色、可访问项目和可编辑模块
+
+两级缓存：
+    请求级 - flask.g，同一请求内的装饰器和权限检查共用
+    进程级 - 短 TTL 字典，缓存时记录相关数据表版本号（见 utils/cache.py），
+             用户、项目成员、模块或模块分配有写入提交后自动重建
+
+环境变量：
+    PRINCIPAL_CACHE_TTL  进程级缓存有效期（秒），默认 30
+"""
+
+import os
+import threading
+import time
+
+from flask import g, has_app_context
+
+from sqlalchemy import or_
+
+from ..models.database import db, User, UserRole, ProjectMember, ProjectMemberRole, ProjectModule, ModuleAssignment
+from .cache import response_cache
+
+PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 30))
+PRINCIPAL_CACHE_MAX_ENTRIES = 1024
+
+# 权限数据依赖的数据表
+PRINCIPAL_TABLES = (
+    User.__tablename__, ProjectMember.__tablename__,
+    ProjectModule.__tablename__, ModuleAssignment.__tablename__
+)
+
+_cache = {}
+_lock = threading.Lock()
+
+
+class Principal:
+    """登录用户及其权限数据（只读快照）"""
+
+    def __init__(self, user, project_roles, module_projects, editable_module_ids, responsible_module_projects):
+        self.user = user
+        self.user_id = user.id
+        self.role = user.role
+        # {项目ID: 项目角色}
+        self.project_roles = project_roles
+        # 用户所在项目中的模块 {模块ID: 项目ID}
+        self.module_projects = module_projects
+        # 有 update_module 权限的模块：所在项目中负责的项目的全部模块 + 通过模块分配（ModuleAssignment）分到的模块
+        self.editable_module_ids = frozenset(editable_module_ids)
+        # 用户可更新的模块列表（get_user_modules）{模块ID: 项目ID}：负责的项目的全部模块
+        # + 模块负责人（assigned_to_id）是该用户的模块，后者不要求用户是项目成员
+        self.responsible_module_projects = responsible_module_projects
+
+    @property
+    def is_manager(self):
+        return self.role == UserRole.DEPARTMENT_MANAGER
+
+    @property
+    def project_ids(self):
+        return list(self.project_roles.keys())
+
+    def is_leader_of(self, project_id):
+        return self.project_roles.get(project_id) == ProjectMemberRole.LEADER
+
+
+def _load_principal(user_id):
+    """从数据库构建 Principal（最多4次查询）"""
+    user = db.session.get(User, user_id)
+    if not user:
+        return None
+
+    project_roles = dict(
+        db.session.query(ProjectMember.project_id, ProjectMember.role)
+        .filter(ProjectMember.user_id == user_id).all()
+    )
+
+    assigned_module_ids = set()
+    if project_roles:
+        assigned_module_ids = {
+            module_id for (module_id,) in db.session.query(ModuleAssignment.module_id)
+            .filter(ModuleAssignment.user_id == user_id).all()
+        }
+
+    # 所在项目的模块和用户作为模块负责人的模块（可能不在所在项目中）一次查出
+    module_rows = db.session.query(ProjectModule.id, ProjectModule.project_id, ProjectModule.assigned_to_id)\
+        .filter(or_(
+            ProjectModule.project_id.in_(list(project_roles.keys())),
+            ProjectModule.assigned_to_id == user_id
+        )).all()
+
+    module_projects = {}
+    editable_module_ids = set()
+    responsible_module_projects = {}
+    for module_id, project_id, assigned_to_id in module_rows:
+        is_leader = project_roles.get(project_id) == ProjectMemberRole.LEADER
+        if project_id in project_roles:
+            module_projects[module_id] = project_id
+            # 项目负责人可更新项目的所有模块，普通成员只能更新通过模块分配分到的模块
+            if is_leader or module_id in assigned_module_ids:
+                editable_module_ids.add(module_id)
+        if is_leader or assigned_to_id == user_id:
+            responsible_module_projects[module_id] = project_id
+
+    # 缓存的用户对象与会话分离，各请求再合并到自己的会话中
+    db.session.expunge(user)
+    return Principal(user, project_roles, module_projects, editable_module_ids, responsible_module_projects)
+
+
+def _get_cached(user_id, versions):
+    with _lock:
+        item = _cache.get(user_id)
+    if item is None:
+        return None
+    cached_versions, expires_at, principal = item
+    if cached_versions != versions or expires_at < time.time():
+        return None
+    return principal
+
+
+def _set_cached(user_id, versions, principal):
+    with _lock:
+        _cache[user_id] = (versions, time.time() + PRINCIPAL_CACHE_TTL, principal)
+        while len(_cache) > PRINCIPAL_CACHE_MAX_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+
+
+def get_principal(user_id):
+    """
+    获取用户的 Principal，依次查找请求级缓存、进程级缓存、数据库
+
+    Args:
+        user_id (int): 用户ID
+
+    Returns:
+        Principal: 用户不存在时返回None
+    """
+    if has_app_context():
+        principal = g.get('principal')
+        if principal is not None and principal.user_id == user_id:
+            return principal
+
+    versions = response_cache.get_versions(PRINCIPAL_TABLES)
+    principal = _get_cached(user_id, versions)
+    if principal is None:
+        principal = _load_principal(user_id)
+        if principal is None:
+            return None
+        _set_cached(user_id, versions, principal)
+
+    if has_app_context():
+        g.principal = principal
+    return principal
+
+
+def get_current_user(principal):
+    """
+    将缓存的用户对象合并到当前会话（不发出查询），供控制器按需延迟加载关系
+
+    Args:
+        principal (Principal): get_principal 返回的对象
+
+    Returns:
+        User: 属于当前会话的用户对象
+    """
+    return db.session.merge(principal.user, load=False)
+
+
+def clear_principal_cache():
+    """清空进程级缓存"""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,210 @@
+"""
+请求计时 - 每个请求的 SQL 语句数、数据库耗时、JSON 序列化耗时和处理耗时
+
+通过 SQLAlchemy 引擎的 before/after_cursor_execute 事件统计 SQL，通过 Flask 请求钩子统计请求耗时，
+JSON 序列化耗时由自定义 JSONProvider 统计（jsonify 在视图函数内调用）。结果：
+    - 写入 Server-Timing 响应头（浏览器开发者工具的 Timing 面板可直接查看）
+        db;dur=12.3;desc="8 queries", json;dur=1.2, app;dur=20.4, total;dur=33.9
+      app 为 total 减去数据库和序列化之外的耗时（视图、服务层、ORM 对象构建等）
+    - 每个 /api/ 请求输出一行 JSON 结构化日志（logger: backend.timing）
+    - 超过慢请求阈值时以 WARNING 级别输出，附带最慢的几条 SQL 和重复次数最多的 SQL（排查 N+1）
+    - 单条 SQL 超过慢查询阈值时立即以 WARNING 级别输出该 SQL（不输出参数，避免泄露密码哈希等数据）
+
+环境变量：
+    REQUEST_TIMING     是否启用，默认 true
+    REQUEST_LOG        all（所有 /api/ 请求）/ slow（仅慢请求）/ off，默认 all
+    SLOW_REQUEST_MS    慢请求阈值（毫秒），默认 500
+    SLOW_QUERY_MS      慢查询阈值（毫秒），默认 100
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+REQUEST_TIMING = os.environ.get('REQUEST_TIMING', 'true').lower() not in ('0', 'false', 'off', 'no')
+REQUEST_LOG = os.environ.get('REQUEST_LOG', 'all').lower()
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 500))
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+
+# 慢请求日志中附带的 SQL 条数
+SLOW_REQUEST_TOP_QUERIES = 5
+
+logger = logging.getLogger('backend.timing')
+
+# 连续10个以上的占位符（大的 IN 列表）
+_PLACEHOLDER_LIST = re.compile(r'(?:\?, ){9,}\?')
+
+
+class RequestTimer:
+    """单个请求的计时数据（保存在 flask.g 中）"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.json_time = 0.0
+        # [(耗时秒, SQL)]，用于慢请求日志
+        self.queries = []
+
+    def add_query(self, statement, duration):
+        self.query_count += 1
+        self.db_time += duration
+        self.queries.append((duration, statement))
+
+    def summary(self):
+        """返回各项耗时（毫秒）"""
+        total = (time.perf_counter() - self.started) * 1000
+        db_ms = self.db_time * 1000
+        json_ms = self.json_time * 1000
+        return {
+            'total_ms': round(total, 2),
+            'db_ms': round(db_ms, 2),
+            'json_ms': round(json_ms, 2),
+            'app_ms': round(max(total - db_ms - json_ms, 0.0), 2),
+            'queries': self.query_count
+        }
+
+
+def _current_timer():
+    if not has_request_context():
+        return None
+    return g.get('request_timer')
+
+
+def _short_sql(statement):
+    """压缩 SQL 中的空白和 IN 列表的占位符，便于输出到单行日志"""
+    return _PLACEHOLDER_LIST.sub(
+        lambda match: f'?, ... ({match.group(0).count("?")} params)', ' '.join(statement.split())
+    )
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """统计 jsonify 序列化耗时的 JSONProvider"""
+
+    def dumps(self, obj, **kwargs):
+        timer = _current_timer()
+        if timer is None:
+            return super().dumps(obj, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            timer.json_time += time.perf_counter() - started
+
+
+def _register_engine_events(engine):
+    """统计每条 SQL 的耗时，超过慢查询阈值时输出日志"""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'handle_error')
+    def _handle_error(exception_context):
+        # 执行失败时不会触发 after_cursor_execute，丢弃对应的开始时间
+        conn = exception_context.connection
+        if conn is not None and conn.info.get('query_started'):
+            conn.info['query_started'].pop()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_started'].pop()
+        duration = time.perf_counter() - started
+
+        timer = _current_timer()
+        if timer is not None:
+            timer.add_query(statement, duration)
+
+        if duration * 1000 >= SLOW_QUERY_MS:
+            logger.warning(json.dumps({
+                'event': 'slow_query',
+                'duration_ms': round(duration * 1000, 2),
+                'path': request.path if has_request_context() else None,
+                'executemany': executemany,
+                'sql': _short_sql(statement)
+            }, ensure_ascii=False))
+
+
+def _configure_logger():
+    """没有配置日志处理器时输出到 stdout（与 gunicorn 访问日志一起）"""
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def init_request_timing(app, db):
+    """
+    注册请求计时：引擎 SQL 事件、请求钩子和 JSON 序列化计时
+
+    应在其他 before_request 钩子（如 ETag 的 304 短路）之前调用，以便计入完整耗时。
+
+    Args:
+        app: Flask应用实例
+        db: SQLAlchemy 实例
+    """
+    if not REQUEST_TIMING:
+        return
+
+    _configure_logger()
+    app.json_provider_class = TimedJSONProvider
+    app.json = TimedJSONProvider(app)
+
+    with app.app_context():
+        _register_engine_events(db.engine)
+
+    @app.before_request
+    def _start_timer():
+        g.request_timer = RequestTimer()
+
+    @app.after_request
+    def _finish_timer(response):
+        timer = g.pop('request_timer', None)
+        if timer is None:
+            return response
+
+        summary = timer.summary()
+        response.headers['Server-Timing'] = ', '.join([
+            f"db;dur={summary['db_ms']};desc=\"{summary['queries']} queries\"",
+            f"json;dur={summary['json_ms']}",
+            f"app;dur={summary['app_ms']}",
+            f"total;dur={summary['total_ms']}"
+        ])
+
+        is_slow = summary['total_ms'] >= SLOW_REQUEST_MS
+        if REQUEST_LOG == 'off' or not request.path.startswith('/api/') \
+                or (REQUEST_LOG == 'slow' and not is_slow):
+            return response
+
+        record = {
+            'event': 'slow_request' if is_slow else 'request',
+            'method': request.method,
+            'path': request.path,
+            'query': request.query_string.decode('utf-8', 'replace') or None,
+            'status': response.status_code,
+            **summary
+        }
+        if is_slow:
+            slowest = sorted(timer.queries, key=lambda item: item[0], reverse=True)[:SLOW_REQUEST_TOP_QUERIES]
+            record['slowest_queries'] = [
+                {'duration_ms': round(duration * 1000, 2), 'sql': _short_sql(statement)}
+                for duration, statement in slowest
+            ]
+            repeated = Counter(statement for _, statement in timer.queries).most_common(1)
+            if repeated and repeated[0][1] > 1:
+                record['most_repeated_query'] = {'count': repeated[0][1], 'sql': _short_sql(repeated[0][0])}
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
+        return response
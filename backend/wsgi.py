@@ -0,0 +1,16 @@
+"""
+WSGI 入口 - 供 gunicorn 等生产服务器加载
+
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+
+开发调试仍可直接运行 python backend/app.py（Werkzeug 开发服务器）。
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app import create_app
+
+app = create_app()
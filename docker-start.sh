@@ -130,5 +130,6 @@ echo ""
 # 设置数据库路径环境变量并启动Flask
 export SQLALCHEMY_DATABASE_URI="sqlite:///$DATABASE_PATH"
 
-# 启动应用
-exec python3 app.py
+# 启动应用（gunicorn 多进程服务，worker/线程数见 backend/gunicorn.conf.py）
+cd /app
+exec gunicorn -c /app/backend/gunicorn.conf.py backend.wsgi:app
@@ -199,6 +199,11 @@ export const moduleApi = {
   updateModuleProgress(moduleId, data) {
     return api.put(`/modules/${moduleId}/progress`, data)
   },
+
+  // 批量更新模块进度 updates: [{ module_id, progress, notes }]
+  batchUpdateModuleProgress(updates) {
+    return api.put('/modules/progress:batch', { updates })
+  },
   
   // 分配模块给用户
   assignModule(moduleId, userId) {
@@ -333,4 +338,18 @@ export const userApi = {
   }
 }
 
+export const searchApi = {
+  // 全文搜索项目、模块和周工作记录 params: { types, limit }
+  search(q, params = {}) {
+    return api.get('/search', { params: { q, ...params } })
+  }
+}
+
+export const reportApi = {
+  // 项目模块进度一览表下载地址（浏览器直接下载，依赖会话Cookie）
+  getModulesReportUrl() {
+    return `${api.defaults.baseURL}/reports/modules.xlsx`
+  }
+}
+
 export default api